@@ -0,0 +1,141 @@
+"""
+Job Description Routes Module
+
+This module defines the API endpoints for registering job descriptions once
+and reusing their cached analysis by handle in the resume endpoints, and for
+maintaining the JD corpus that resumes are matched against.
+"""
+
+import asyncio
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Form
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.services.cpu_pool import run_cpu_bound
+from app.services.jd_analysis import JobDescriptionAnalysis, UnknownJobDescriptionError, get_jd_cache
+from app.services.job_index import JobPosting, get_job_index, prepare_postings
+from app.services.upload_intake import UploadRejectedError, check_job_description_size
+
+# Largest number of JDs accepted in one corpus request
+MAX_CORPUS_BATCH = int(os.getenv("JOB_INDEX_MAX_BATCH", "10000"))
+
+router = APIRouter()
+
+
+class CorpusJob(BaseModel):
+    """A job description to add to the corpus."""
+
+    job_id: Optional[str] = None
+    title: str = ""
+    description: str
+
+
+def _analysis_response(analysis: JobDescriptionAnalysis) -> JSONResponse:
+    """Build the response describing a job description analysis."""
+    return JSONResponse({
+        "success": True,
+        "jd_handle": analysis.handle,
+        "length": len(analysis.text),
+        "keyword_count": len(analysis.tokens),
+        "skills": analysis.skills
+    })
+
+
+@router.post("")
+async def register_job_description(job_description: str = Form(...)):
+    """
+    Analyze a job description once and return a handle for the resume endpoints.
+
+    The handle is the SHA-256 of the stripped text, so registering the same
+    job description again returns the same handle without re-analyzing it.
+    Texts are limited to MAX_UPLOAD_BYTES characters, like resume uploads.
+
+    Args:
+        job_description: The job description text.
+
+    Returns:
+        JSON response with the JD handle and a summary of its analysis.
+    """
+    try:
+        check_job_description_size(job_description)
+    except UploadRejectedError as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "error": str(e)})
+    if not job_description.strip():
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": "job_description must not be empty"}
+        )
+    return _analysis_response(await get_jd_cache().register_async(job_description))
+
+
+@router.get("/{jd_handle}")
+async def get_job_description(jd_handle: str):
+    """
+    Return the cached analysis summary of a registered job description.
+
+    Args:
+        jd_handle: Handle returned by POST /api/v1/jd.
+
+    Returns:
+        JSON response with a summary of the analysis, or 404 if the handle is unknown.
+    """
+    try:
+        return _analysis_response(await get_jd_cache().get_async(jd_handle))
+    except UnknownJobDescriptionError as e:
+        return JSONResponse(status_code=404, content={"success": False, "error": str(e)})
+
+
+@router.post("/corpus")
+async def add_corpus_jobs(jobs: List[CorpusJob] = Body(...)):
+    """
+    Add or replace job descriptions in the corpus searched by /resume/match-jobs.
+    
+    Args:
+        jobs: JSON list of {"job_id", "title", "description"}; a missing job_id
+            defaults to the JD handle of the title and description.
+        
+    Returns:
+        JSON response with the job ids, in request order.
+    """
+    if not 1 <= len(jobs) <= MAX_CORPUS_BATCH:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": f"Send between 1 and {MAX_CORPUS_BATCH} job descriptions"}
+        )
+    postings = [JobPosting(job.job_id, job.title, job.description) for job in jobs]
+    # Tokenize in the CPU pool; the index update and its SQLite I/O run in a thread
+    prepared = await run_cpu_bound(prepare_postings, postings)
+    job_index = await asyncio.to_thread(get_job_index)
+    job_ids = await asyncio.to_thread(job_index.add, prepared)
+    # Merging and writing the snapshot takes a while on a large corpus
+    await asyncio.to_thread(job_index.save)
+    return JSONResponse({"success": True, "job_ids": job_ids, "corpus_size": job_index.stats()["jobs"]})
+
+
+@router.delete("/corpus/{job_id}")
+async def delete_corpus_job(job_id: str):
+    """
+    Remove a job description from the corpus.
+    
+    Args:
+        job_id: Id of the job description.
+        
+    Returns:
+        JSON response confirming the removal, or 404 if the job is not indexed.
+    """
+    job_index = await asyncio.to_thread(get_job_index)
+    if not await asyncio.to_thread(job_index.delete, [job_id]):
+        return JSONResponse(status_code=404, content={"success": False, "error": f"Unknown job '{job_id}'"})
+    # Merging and writing the snapshot takes a while on a large corpus
+    await asyncio.to_thread(job_index.save)
+    return JSONResponse({"success": True, "job_id": job_id, "corpus_size": job_index.stats()["jobs"]})
+
+
+@router.get("/corpus/stats")
+async def corpus_stats():
+    """Return the size of the JD corpus index."""
+    job_index = await asyncio.to_thread(get_job_index)
+    return JSONResponse({"success": True, **job_index.stats()})
@@ -5,29 +5,188 @@ This module defines the API endpoints for resume-related operations including
 optimization, skill gap analysis, and study materials generation.
 """
 
+import asyncio
 import json
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 
 # Import centralized parser
-from app.services.resume_parser import ResumeParser, get_parser
+from app.services.resume_parser import PageLimitExceeded, ParsedResume
+from app.services.parse_cache import get_parse_cache
+from app.services.resume_store import UnknownResumeError, get_resume_store
+from app.services.jd_analysis import JobDescriptionAnalysis, UnknownJobDescriptionError, get_jd_cache
+from app.services.upload_intake import UploadRejectedError, check_job_description_size, read_upload
+from app.services.cpu_pool import PoolSaturatedError, get_cpu_pool, run_cpu_bound
 
 # Import service modules
 from app.services.resume_optimizer import optimize_resume_logic
 from app.services.skill_gap_analyzer import analyze_skill_gap
+from app.services.ats_checker import generate_ats_feedback
+from app.services.resume_ranker import MAX_PAGE_SIZE, MAX_RESUMES, RankCandidate, rank_resumes
+from app.services.job_index import SORT_KEYS, get_job_index, resume_tokens
 
 # Import Supabase client
 from supabase_client import supabase
 
 router = APIRouter()
 
+# "fast" returns only the deterministic outputs, without waiting on the LLM
+ANALYSIS_MODES = ("full", "fast")
+
+# LLM sections left out (None) of fast /optimize and /skill-gap-analysis responses
+DEFERRED_OPTIMIZE_SECTIONS = [
+    "analysis.gaps",
+    "analysis.alignment_suggestions",
+    "ats_analysis.ai_analysis",
+    "careerAnalysis.ai_recommendations",
+]
+DEFERRED_SKILL_GAP_SECTIONS = ["ai_recommendations"]
+
+# Starlette's form parser rejects requests with more than 1000 files, so /rank
+# takes larger batches only as resume_handles
+MAX_RANK_UPLOADS = min(MAX_RESUMES, 1000)
+
+
+class ResumeInputError(Exception):
+    """Raised when a request has neither or both of a resume file and handle, or of a JD text and handle."""
+
+
+async def load_resume(
+    resume: Optional[UploadFile],
+    resume_handle: Optional[str]
+) -> Tuple[str, ParsedResume, Optional[str]]:
+    """
+    Resolve the resume of a request from an uploaded file or a stored handle.
+    
+    Args:
+        resume: The uploaded resume file, if any.
+        resume_handle: Handle returned by /upload, if any.
+        
+    Returns:
+        A tuple of (resume_text, parsed_sections, filename).
+        
+    Raises:
+        ResumeInputError: If neither or both inputs are given.
+        UnknownResumeError: If the handle is not in the store.
+        UploadRejectedError: If the file exceeds the size limit.
+        PageLimitExceeded: If the PDF exceeds the page limit.
+    """
+    if (resume is None) == (not resume_handle):
+        raise ResumeInputError("Provide exactly one of 'resume' (file) or 'resume_handle'")
+
+    if resume_handle:
+        stored = await get_resume_store().get(resume_handle)
+        return stored.resume_text, stored.sections, stored.filename
+
+    upload = await read_upload(resume)
+    resume_text, sections = await get_parse_cache().get_or_parse_upload(upload)
+    return resume_text, sections, resume.filename
+
+
+async def load_job_description(
+    job_description: Optional[str],
+    jd_handle: Optional[str]
+) -> JobDescriptionAnalysis:
+    """
+    Resolve the job description of a request from its text or a registered handle.
+    
+    A JD not analyzed yet is analyzed in the CPU pool, off the event loop.
+    
+    Args:
+        job_description: The job description text, if any.
+        jd_handle: Handle returned by POST /api/v1/jd, if any.
+        
+    Returns:
+        The job description's cached analysis.
+        
+    Raises:
+        ResumeInputError: If neither or both inputs are given.
+        UnknownJobDescriptionError: If the handle is not registered.
+        UploadRejectedError: If the JD text exceeds the size limit.
+    """
+    if (job_description is None) == (not jd_handle):
+        raise ResumeInputError("Provide exactly one of 'job_description' or 'jd_handle'")
+    
+    if jd_handle:
+        return await get_jd_cache().get_async(jd_handle)
+    check_job_description_size(job_description)
+    return await get_jd_cache().analyze_async(job_description)
+
+
+def analysis_mode_error_response(mode: str) -> Optional[JSONResponse]:
+    """Build the error response for an unknown analysis mode, or return None if it is valid."""
+    if mode in ANALYSIS_MODES:
+        return None
+    return JSONResponse(
+        status_code=400,
+        content={"success": False, "error": f"mode must be one of {', '.join(ANALYSIS_MODES)}"}
+    )
+
+
+def resume_input_error_response(error: Exception) -> JSONResponse:
+    """Build the error response for a missing, ambiguous, unknown or oversized resume or JD."""
+    if isinstance(error, UploadRejectedError):
+        status_code = error.status_code
+    elif isinstance(error, PageLimitExceeded):
+        status_code = 413
+    elif isinstance(error, (UnknownResumeError, UnknownJobDescriptionError)):
+        status_code = 404
+    else:
+        status_code = 400
+    return JSONResponse(status_code=status_code, content={"success": False, "error": str(error)})
+
+
+@router.post("/upload")
+async def upload_resume(resume: UploadFile = File(...)):
+    """
+    Store a resume once and return a handle for the other resume endpoints.
+    
+    The handle is the SHA-256 of the file plus its type (pdf or text), so
+    uploading the same file again returns the same handle without parsing it again.
+    
+    Args:
+        resume: The uploaded resume file (PDF).
+        
+    Returns:
+        JSON response with the resume handle and the parsed section names.
+    """
+    try:
+        upload = await read_upload(resume)
+        stored = await get_resume_store().put(upload)
+        
+        return JSONResponse({
+            "success": True,
+            "resume_handle": stored.handle,
+            "filename": stored.filename,
+            "size": stored.size,
+            "sections": list(stored.sections)
+        })
+        
+    except (UploadRejectedError, PageLimitExceeded) as e:
+        return resume_input_error_response(e)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e),
+                "message": "Failed to store resume"
+            }
+        )
+
 
 @router.post("/optimize")
 async def optimize_resume(
     user_id: str = Form(...),
-    resume: UploadFile = File(...),
-    job_description: str = Form(...)
+    resume: UploadFile = File(None),
+    resume_handle: str = Form(None),
+    job_description: str = Form(None),
+    jd_handle: str = Form(None),
+    mode: str = Form("full")
 ):
     """
     Optimize a resume against a job description.
@@ -40,30 +199,46 @@ async def optimize_resume(
     5. Skill gap analysis
     6. Persistence to Supabase
     
+    In fast mode no LLM is called: the response holds the ATS scores and
+    justifications and the career matches, the LLM sections listed in
+    "deferred" are None, and the result is not stored as a new version.
+    
     Args:
         user_id: The user's unique identifier.
-        resume: The uploaded resume file (PDF).
-        job_description: The target job description.
+        resume: The uploaded resume file (PDF), if no handle is given.
+        resume_handle: Handle returned by /upload, if no file is given.
+        job_description: The target job description, if no handle is given.
+        jd_handle: Handle returned by POST /api/v1/jd, if no text is given.
+        mode: "full" (default) or "fast".
         
     Returns:
         JSON response with optimization results, ATS score, and career analysis.
     """
-    # 1️⃣ Read resume bytes once
-    resume_bytes = await resume.read()
-    
-    # 2️⃣ Use centralized parser to extract text and sections
-    parser = get_parser()
-    resume_text, sections = parser.parse_resume(resume_bytes, filename=resume.filename)
+    mode_error = analysis_mode_error_response(mode)
+    if mode_error is not None:
+        return mode_error
+    include_llm = mode == "full"
     
-    # 3️⃣ Run optimizer logic with pre-parsed text and sections
-    analysis_result = optimize_resume_logic(resume_text, sections, job_description)
+    # 1️⃣ + 2️⃣ Extract text and sections from the upload (cached by content hash)
+    # or load them from the resume store, and the JD analysis from the JD cache
+    try:
+        job_analysis = await load_job_description(job_description, jd_handle)
+        resume_text, sections, filename = await load_resume(resume, resume_handle)
+    except (
+        ResumeInputError, UnknownResumeError, UnknownJobDescriptionError, UploadRejectedError, PageLimitExceeded
+    ) as e:
+        return resume_input_error_response(e)
     
-    # 4️⃣ Run skill gap analysis with pre-parsed text
-    skill_gap_result = analyze_skill_gap(resume_text, filename=resume.filename)
+    # 3️⃣ + 4️⃣ Run optimizer logic and skill gap analysis concurrently,
+    # so the LLM calls they make overlap instead of running back to back
+    analysis_result, skill_gap_result = await asyncio.gather(
+        optimize_resume_logic(resume_text, sections, job_analysis, include_llm=include_llm),
+        analyze_skill_gap(resume_text, filename=filename, include_llm=include_llm)
+    )
 
     # 5️⃣ Build response object
     result = {
-        "sections": sections,
+        "sections": sections.to_dict(),
         "analysis": {
             "gaps": analysis_result.get("gaps", []),
             "alignment_suggestions": analysis_result.get("alignment_suggestions", []),
@@ -80,9 +255,19 @@ async def optimize_resume(
             "analysis_summary": skill_gap_result.get("analysis_summary", {})
         } if "error" not in skill_gap_result else None,
         "summary": "",
-        "filename": resume.filename,
+        "filename": filename,
+        "mode": mode,
+        "deferred": [] if include_llm else DEFERRED_OPTIMIZE_SECTIONS,
     }
 
+    # Fast results are previews; only full analyses become stored versions
+    if not include_llm:
+        return JSONResponse({
+            "optimization": result,
+            "resume_id": None,
+            "version_stored": None
+        })
+
     # 6️⃣ Insert/Update Supabase
     existing_resume = supabase.table("resumes").select("*").eq("user_id", user_id).execute()
 
@@ -123,28 +308,52 @@ async def optimize_resume(
 
 
 @router.post("/skill-gap-analysis")
-async def skill_gap_analysis(resume: UploadFile = File(...)):
+async def skill_gap_analysis(
+    resume: UploadFile = File(None),
+    resume_handle: str = Form(None),
+    top_k: int = Form(None),
+    min_probability: float = Form(0.0),
+    mode: str = Form("full")
+):
     """
     Analyze career matches based on skills clustering.
     
     Returns probability-based career recommendations and skill gaps for each career.
+    In fast mode the AI recommendations are deferred (None) and no LLM is called.
     
     Args:
-        resume: The uploaded resume file (PDF).
+        resume: The uploaded resume file (PDF), if no handle is given.
+        resume_handle: Handle returned by /upload, if no file is given.
+        top_k: Optional maximum number of career matches to return.
+        min_probability: Minimum match probability (0-100) for a career to be returned.
+        mode: "full" (default) or "fast".
         
     Returns:
         JSON response with skill analysis and career recommendations.
     """
+    mode_error = analysis_mode_error_response(mode)
+    if mode_error is not None:
+        return mode_error
+    include_llm = mode == "full"
+    
+    if top_k is not None and top_k < 1:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": "top_k must be a positive integer"}
+        )
+    
     try:
-        # Read resume file
-        resume_bytes = await resume.read()
-        
-        # Use centralized parser to extract text
-        parser = get_parser()
-        resume_text = parser.extract_text(resume_bytes, filename=resume.filename)
+        # Extract text from the upload (cached by content hash) or the resume store
+        resume_text, _, filename = await load_resume(resume, resume_handle)
         
         # Perform career clustering analysis with pre-parsed text
-        analysis_result = analyze_skill_gap(resume_text, filename=resume.filename)
+        analysis_result = await analyze_skill_gap(
+            resume_text,
+            filename=filename,
+            top_k=top_k,
+            min_probability=min_probability,
+            include_llm=include_llm
+        )
         
         # Check for errors
         if "error" in analysis_result:
@@ -158,15 +367,21 @@ async def skill_gap_analysis(resume: UploadFile = File(...)):
         
         return JSONResponse({
             "success": True,
-            "filename": resume.filename,
+            "filename": filename,
             "user_skills": analysis_result["user_skills"],
             "total_skills_found": analysis_result["total_skills_found"],
             "career_matches": analysis_result["career_matches"],
             "top_3_careers": analysis_result["top_3_careers"],
             "ai_recommendations": analysis_result["ai_recommendations"],
-            "analysis_summary": analysis_result["analysis_summary"]
+            "analysis_summary": analysis_result["analysis_summary"],
+            "mode": mode,
+            "deferred": [] if include_llm else DEFERRED_SKILL_GAP_SECTIONS
         })
         
+    except (ResumeInputError, UnknownResumeError, UploadRejectedError, PageLimitExceeded) as e:
+        return resume_input_error_response(e)
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -180,8 +395,10 @@ async def skill_gap_analysis(resume: UploadFile = File(...)):
 
 @router.post("/generate-study-materials")
 async def generate_study_materials(
-    resume: UploadFile = File(...),
-    job_description: str = Form(...),
+    resume: UploadFile = File(None),
+    resume_handle: str = Form(None),
+    job_description: str = Form(None),
+    jd_handle: str = Form(None),
     target_career: str = Form(None),
     missing_skills: str = Form(None)
 ):
@@ -189,8 +406,10 @@ async def generate_study_materials(
     Generate personalized study materials and learning resources based on skill gaps.
     
     Args:
-        resume: The uploaded resume file (PDF).
-        job_description: The target job description.
+        resume: The uploaded resume file (PDF), if no handle is given.
+        resume_handle: Handle returned by /upload, if no file is given.
+        job_description: The target job description, if no handle is given.
+        jd_handle: Handle returned by POST /api/v1/jd, if no text is given.
         target_career: Optional target career path.
         missing_skills: Optional JSON string of missing skills.
         
@@ -198,8 +417,10 @@ async def generate_study_materials(
         JSON response with study materials and learning resources.
     """
     try:
-        # Read resume file
-        resume_bytes = await resume.read()
+        # Extract text from the upload (cached by content hash) or the resume store,
+        # and the JD analysis from the JD cache
+        job_analysis = await load_job_description(job_description, jd_handle)
+        resume_text, _, filename = await load_resume(resume, resume_handle)
         
         # Import the function
         from app.services.study_materials_generator import generate_learning_resources
@@ -208,17 +429,16 @@ async def generate_study_materials(
         skills_list = json.loads(missing_skills) if missing_skills else []
         
         # Generate study materials
-        study_result = generate_learning_resources(
-            resume_bytes,
-            job_description,
-            filename=resume.filename,
+        study_result = await generate_learning_resources(
+            resume_text,
+            job_analysis,
             target_career=target_career,
             missing_skills=skills_list
         )
         
         return JSONResponse({
             "success": True,
-            "filename": resume.filename,
+            "filename": filename,
             "target_career": target_career,
             "learning_resources": study_result.get("learning_resources", []),
             "study_plan": study_result.get("study_plan", ""),
@@ -228,6 +448,12 @@ async def generate_study_materials(
             "timeline": study_result.get("timeline", "")
         })
         
+    except (
+        ResumeInputError, UnknownResumeError, UnknownJobDescriptionError, UploadRejectedError, PageLimitExceeded
+    ) as e:
+        return resume_input_error_response(e)
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -237,3 +463,219 @@ async def generate_study_materials(
                 "message": "Failed to generate study materials"
             }
         )
+
+
+async def load_rank_candidates(
+    resumes: Optional[List[UploadFile]],
+    resume_handles: Optional[List[str]]
+) -> Tuple[List[RankCandidate], List[Dict[str, str]]]:
+    """
+    Resolve the resumes of a ranking batch, collecting per-resume failures.
+    
+    Uploads are put in the resume store, as by /upload, so every candidate
+    has a handle the other endpoints accept. They are parsed with at most one
+    per CPU worker in flight, so a large batch does not saturate the pool by
+    itself. A file that cannot be read or
+    parsed is reported in the errors instead of failing the whole batch.
+    
+    Args:
+        resumes: Uploaded resume files, if any.
+        resume_handles: Handles returned by /upload, if any.
+        
+    Returns:
+        A tuple of (candidates in input order, errors for resumes that could not be loaded).
+    """
+    candidates: List[RankCandidate] = []
+    errors: List[Dict[str, str]] = []
+    
+    store = get_resume_store()
+    for handle in resume_handles or []:
+        try:
+            stored = await store.get(handle)
+            candidates.append(RankCandidate(stored.handle, stored.filename, stored.sections))
+        except UnknownResumeError as e:
+            errors.append({"resume": handle, "error": str(e)})
+    
+    limit = asyncio.Semaphore(max(1, get_cpu_pool().workers))
+    
+    async def parse(upload_file: UploadFile) -> Optional[RankCandidate]:
+        async with limit:
+            try:
+                # Stored like /upload, so the handle in the results works with the other endpoints
+                stored = await store.put(await read_upload(upload_file))
+                return RankCandidate(stored.handle, stored.filename, stored.sections)
+            except PoolSaturatedError:
+                raise
+            except Exception as e:
+                errors.append({"resume": upload_file.filename, "error": str(e)})
+                return None
+    
+    parsed = await asyncio.gather(*(parse(upload_file) for upload_file in resumes or []))
+    candidates.extend(candidate for candidate in parsed if candidate is not None)
+    return candidates, errors
+
+
+@router.post("/rank")
+async def rank_resume_batch(
+    resumes: List[UploadFile] = File(None),
+    resume_handles: str = Form(None),
+    job_description: str = Form(None),
+    jd_handle: str = Form(None),
+    page: int = Form(1),
+    page_size: int = Form(50),
+    include_feedback: bool = Form(False)
+):
+    """
+    Rank many resumes against one job description by ATS score.
+    
+    The whole batch is scored with vectorized operations; ranking the same
+    batch again (e.g. to fetch another page) reuses the cached ranking. LLM
+    feedback is only generated on request, and only for the returned page.
+    
+    A batch holds at most RANK_MAX_RESUMES resumes, of which at most
+    MAX_RANK_UPLOADS (1000, the most files Starlette parses from one form)
+    may be uploaded files; larger batches must /upload first and send
+    resume_handles.
+    
+    Args:
+        resumes: Uploaded resume files (PDF).
+        resume_handles: Optional JSON list of handles returned by /upload.
+        job_description: The target job description, if no handle is given.
+        jd_handle: Handle returned by POST /api/v1/jd, if no text is given.
+        page: 1-based page of the ranking to return.
+        page_size: Results per page.
+        include_feedback: Whether to add AI feedback to each returned resume.
+        
+    Returns:
+        JSON response with the ranked page, the batch size and per-resume errors.
+    """
+    if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": f"page must be positive and page_size between 1 and {MAX_PAGE_SIZE}"}
+        )
+    
+    try:
+        handles = json.loads(resume_handles) if resume_handles else []
+        if not isinstance(handles, list) or not all(isinstance(handle, str) for handle in handles):
+            raise ResumeInputError("resume_handles must be a JSON list of strings")
+        batch_size = len(handles) + len(resumes or [])
+        if not batch_size:
+            raise ResumeInputError("Provide at least one resume file or handle")
+        if batch_size > MAX_RESUMES:
+            raise ResumeInputError(f"At most {MAX_RESUMES} resumes can be ranked at once")
+        if len(resumes or []) > MAX_RANK_UPLOADS:
+            raise ResumeInputError(
+                f"At most {MAX_RANK_UPLOADS} resume files can be uploaded at once; "
+                "send larger batches as resume_handles from /upload"
+            )
+        
+        job_analysis = await load_job_description(job_description, jd_handle)
+        candidates, errors = await load_rank_candidates(resumes, handles)
+        ranking = await rank_resumes(candidates, job_analysis)
+        
+        page_items = ranking[(page - 1) * page_size:page * page_size]
+        feedback = [None] * len(page_items)
+        if include_feedback:
+            # The LLM gateway bounds how many of these run at once
+            feedback = await asyncio.gather(*(
+                generate_ats_feedback(item.candidate.resume_text, item.candidate.sections, job_analysis, item.overall_score)
+                for item in page_items
+            ))
+        
+        results = []
+        for item, ai_analysis in zip(page_items, feedback):
+            result = {
+                "rank": item.rank,
+                "resume_handle": item.candidate.handle,
+                "filename": item.candidate.filename,
+                "overall_score": item.overall_score,
+                "component_scores": item.component_scores
+            }
+            if include_feedback:
+                result["ai_analysis"] = ai_analysis
+            results.append(result)
+        
+        return JSONResponse({
+            "success": True,
+            "jd_handle": job_analysis.handle,
+            "total": len(ranking),
+            "page": page,
+            "page_size": page_size,
+            "results": results,
+            "errors": errors
+        })
+        
+    except json.JSONDecodeError:
+        return resume_input_error_response(ResumeInputError("resume_handles must be a JSON list of strings"))
+    except (ResumeInputError, UnknownJobDescriptionError, UploadRejectedError) as e:
+        return resume_input_error_response(e)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e),
+                "message": "Failed to rank resumes"
+            }
+        )
+
+
+@router.post("/match-jobs")
+async def match_jobs(
+    resume: UploadFile = File(None),
+    resume_handle: str = Form(None),
+    top_k: int = Form(10),
+    sort_by: str = Form("similarity")
+):
+    """
+    Find the best-fitting job descriptions in the indexed JD corpus.
+    
+    Args:
+        resume: The uploaded resume file (PDF), if no handle is given.
+        resume_handle: Handle returned by /upload, if no file is given.
+        top_k: Maximum number of matches to return.
+        sort_by: "similarity" (TF-IDF cosine) or "keyword" (ATS keyword score).
+        
+    Returns:
+        JSON response with the top matching JDs and their keyword scores.
+    """
+    if not 1 <= top_k <= MAX_PAGE_SIZE or sort_by not in SORT_KEYS:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": f"top_k must be between 1 and {MAX_PAGE_SIZE} and sort_by one of {', '.join(SORT_KEYS)}"
+            }
+        )
+    
+    try:
+        # Extract text from the upload (cached by content hash) or the resume store
+        resume_text, _, filename = await load_resume(resume, resume_handle)
+        
+        tokens = await run_cpu_bound(resume_tokens, resume_text)
+        # Loading the index and syncing other processes' changes do blocking I/O
+        job_index = await asyncio.to_thread(get_job_index)
+        matches = await asyncio.to_thread(job_index.search, tokens, top_k, sort_by)
+        
+        return JSONResponse({
+            "success": True,
+            "filename": filename,
+            "matches": [match._asdict() for match in matches]
+        })
+        
+    except (ResumeInputError, UnknownResumeError, UploadRejectedError, PageLimitExceeded) as e:
+        return resume_input_error_response(e)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e),
+                "message": "Failed to match jobs"
+            }
+        )
@@ -1,9 +1,24 @@
-from fastapi import FastAPI
-from app.api.v1 import routes_resume, routes_user
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.api.v1 import routes_jd, routes_resume, routes_user
+from app.services.career_index import get_career_index
+from app.services.cpu_pool import PoolSaturatedError, get_cpu_pool
+from app.services.llm_gateway import close_llm_client
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI(title="CareerLM Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the compiled career index (from its snapshot when available) before serving
+    get_career_index()
+    yield
+    # Release pooled LLM connections and stop CPU workers
+    await close_llm_client()
+    get_cpu_pool().shutdown()
+
+
+app = FastAPI(title="CareerLM Backend", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -14,12 +29,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    # Shed load fast instead of queueing CPU work without limit
+    return JSONResponse(
+        status_code=503,
+        content={"success": False, "error": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Include Resume Optimizer routes
 app.include_router(routes_resume.router, prefix="/api/v1/resume", tags=["Resume"])
 
 # Include User routes
 app.include_router(routes_user.router, prefix="/api/v1/user", tags=["User"])
 
+# Include Job Description routes
+app.include_router(routes_jd.router, prefix="/api/v1/jd", tags=["Job Description"])
+
 @app.get("/")
 async def root():
     return {"message": "CareerLM Backend running with Groq LLaMA-3"}
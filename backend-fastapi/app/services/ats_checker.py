@@ -5,118 +5,36 @@ This module provides functionality to analyze resumes for ATS compatibility,
 calculating scores based on structure, keywords, content quality, and formatting.
 """
 
-import re
-import os
-from groq import Groq
-from dotenv import load_dotenv
+from collections.abc import Mapping
+from typing import Union
+from app.services.cpu_pool import run_cpu_bound
+from app.services.jd_analysis import JobDescriptionInput, as_job_description_analysis
+from app.services.llm_gateway import chat_completion
+from app.services.resume_features import ResumeFeatures, get_resume_features
+from app.services.resume_parser import ParsedResume
 
-# Load API key from .env
-load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Scoring functions accept resume text or its already extracted features
+ResumeInput = Union[str, ResumeFeatures]
 
 
-# Expanded stop words including corporate fluff
-STOP_WORDS = {
-    # Common English stop words
-    'the', 'and', 'for', 'with', 'that', 'this', 'you', 'not', 'are', 'from', 'your',
-    'have', 'has', 'had', 'was', 'were', 'will', 'would', 'should', 'could', 'can',
-    'our', 'their', 'his', 'her', 'its', 'they', 'them', 'these', 'those', 'been',
-    'being', 'did', 'does', 'doing', 'done', 'who', 'what', 'when', 'where', 'why',
-    'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'some', 'such',
-    'than', 'too', 'very', 'just', 'own', 'into', 'over', 'also', 'only',
-    # Corporate/resume fluff words
-    'responsibilities', 'responsibility', 'candidate', 'candidates', 'team', 'teams',
-    'work', 'working', 'duties', 'duty', 'role', 'roles', 'position', 'positions',
-    'company', 'companies', 'organization', 'organizations', 'business', 'businesses',
-    'experience', 'experiences', 'required', 'requirements', 'requirement', 'preferred',
-    'ability', 'abilities', 'opportunity', 'opportunities', 'seeking', 'looking',
-    'environment', 'environments', 'including', 'include', 'includes', 'included',
-    'must', 'need', 'needs', 'needed', 'ensure', 'ensuring', 'provide', 'providing',
-    'support', 'supporting', 'assist', 'assisting', 'help', 'helping', 'maintain',
-    'maintaining', 'knowledge', 'understanding', 'strong', 'excellent', 'good',
-    'great', 'best', 'years', 'year', 'months', 'month', 'day', 'days'
-}
+def _as_features(resume: ResumeInput) -> ResumeFeatures:
+    """Return the features of a resume, extracting them from text if needed."""
+    return resume if isinstance(resume, ResumeFeatures) else get_resume_features(resume)
 
-# Common action verbs for resume content analysis
-ACTION_VERBS = {
-    'achieved', 'accelerated', 'accomplished', 'administered', 'advanced', 'analyzed',
-    'architected', 'assembled', 'assessed', 'attained', 'authored', 'automated',
-    'balanced', 'boosted', 'briefed', 'budgeted', 'built', 'calculated', 'captured',
-    'centralized', 'chaired', 'championed', 'clarified', 'coached', 'collaborated',
-    'communicated', 'compiled', 'completed', 'composed', 'computed', 'conceptualized',
-    'conducted', 'consolidated', 'constructed', 'consulted', 'contacted', 'contributed',
-    'controlled', 'converted', 'coordinated', 'created', 'customized', 'decreased',
-    'defined', 'delegated', 'delivered', 'deployed', 'designed', 'detected', 'determined',
-    'developed', 'devised', 'diagnosed', 'directed', 'discovered', 'dispatched',
-    'distributed', 'documented', 'doubled', 'drafted', 'drove', 'earned', 'edited',
-    'eliminated', 'enabled', 'enhanced', 'ensured', 'established', 'evaluated',
-    'examined', 'executed', 'expanded', 'expedited', 'facilitated', 'fixed', 'formulated',
-    'founded', 'gained', 'generated', 'guided', 'handled', 'headed', 'helped',
-    'identified', 'implemented', 'improved', 'increased', 'influenced', 'informed',
-    'initiated', 'inspected', 'installed', 'instituted', 'instructed', 'integrated',
-    'interpreted', 'interviewed', 'introduced', 'invented', 'investigated', 'launched',
-    'led', 'leveraged', 'maintained', 'managed', 'marketed', 'maximized', 'measured',
-    'mediated', 'modernized', 'modified', 'monitored', 'motivated', 'navigated',
-    'negotiated', 'operated', 'optimized', 'orchestrated', 'organized', 'originated',
-    'overhauled', 'oversaw', 'performed', 'persuaded', 'pioneered', 'planned',
-    'prepared', 'presented', 'processed', 'procured', 'produced', 'programmed',
-    'promoted', 'provided', 'publicized', 'published', 'purchased', 'recommended',
-    'reconciled', 'recorded', 'recruited', 'redesigned', 'reduced', 'reengineered',
-    'referred', 'reformed', 'reinvented', 'released', 'remodeled', 'repaired',
-    'replaced', 'reported', 'represented', 'researched', 'resolved', 'restored',
-    'restructured', 'retrieved', 'revamped', 'reviewed', 'revised', 'revitalized',
-    'saved', 'scheduled', 'screened', 'secured', 'selected', 'separated', 'served',
-    'serviced', 'set', 'settled', 'shaped', 'shared', 'showed', 'simplified',
-    'simulated', 'solved', 'sorted', 'spearheaded', 'specified', 'standardized',
-    'stimulated', 'streamlined', 'strengthened', 'structured', 'studied', 'submitted',
-    'summarized', 'supervised', 'supported', 'surpassed', 'surveyed', 'synthesized',
-    'systematized', 'tabulated', 'targeted', 'taught', 'tested', 'tracked',
-    'trained', 'transformed', 'translated', 'trimmed', 'tripled', 'troubleshot',
-    'tutored', 'unified', 'updated', 'upgraded', 'utilized', 'validated',
-    'valued', 'verified', 'visualized', 'wrote'
-}
 
-# Common adverbs that may precede action verbs
-COMMON_ADVERBS = {
-    'successfully', 'effectively', 'efficiently', 'directly', 'consistently',
-    'proactively', 'independently', 'collaboratively', 'strategically', 'actively',
-    'significantly', 'substantially', 'comprehensively', 'thoroughly', 'rapidly',
-    'quickly', 'personally', 'professionally', 'regularly', 'frequently'
-}
+def _section_length(sections: Mapping, section: str) -> int:
+    """Length of a section's stripped text, without building it for a ParsedResume."""
+    if isinstance(sections, ParsedResume):
+        return sections.section_length(section)
+    return len(sections.get(section, "").strip())
 
 
-def _extract_tokens(text: str) -> set:
-    """
-    Extract clean tokens from text, preserving technical terms like C++, Node.js.
-    
-    Args:
-        text: The input text to tokenize.
-        
-    Returns:
-        A set of lowercase tokens.
-    """
-    # Regex pattern that keeps technical terms like C++, C#, Node.js, .NET
-    token_pattern = r'\b[A-Za-z][A-Za-z0-9+#]*(?:\.[A-Za-z0-9+#]+)*\b'
-    
-    tokens = re.findall(token_pattern, text)
-    
-    # Also capture standalone versions like "C++" or ".NET"
-    special_terms = re.findall(r'\b(?:C\+\+|C#|\.NET|F#)\b', text, re.IGNORECASE)
-    
-    # Combine and lowercase
-    all_tokens = set(token.lower() for token in tokens)
-    all_tokens.update(term.lower() for term in special_terms)
-    
-    # Remove single characters and stop words
-    return {t for t in all_tokens if len(t) > 1 and t not in STOP_WORDS}
-
-
-def calculate_structure_score(sections: dict) -> int:
+def calculate_structure_score(sections: Mapping) -> int:
     """
     Calculate a score based on resume structure and completeness.
     
     Args:
-        sections: Dictionary of parsed resume sections.
+        sections: Parsed resume sections (ParsedResume or dict).
         
     Returns:
         Structure score (0-100).
@@ -128,15 +46,13 @@ def calculate_structure_score(sections: dict) -> int:
     # Check for presence and content in essential sections
     essential_score = 0
     for section in essential_sections:
-        content = sections.get(section, "").strip()
-        if content and len(content) > 20:
+        if _section_length(sections, section) > 20:
             essential_score += 25
     
     # Bonus points for helpful sections
     helpful_score = 0
     for section in helpful_sections:
-        content = sections.get(section, "").strip()
-        if content and len(content) > 20:
+        if _section_length(sections, section) > 20:
             helpful_score += 10
     
     # Normalize scores
@@ -147,7 +63,7 @@ def calculate_structure_score(sections: dict) -> int:
     return round(structure_score)
 
 
-def calculate_keyword_score(resume_text: str, job_description: str) -> int:
+def calculate_keyword_score(resume: ResumeInput, job_description: JobDescriptionInput) -> int:
     """
     Calculate keyword matching score between resume and job description.
     
@@ -155,24 +71,20 @@ def calculate_keyword_score(resume_text: str, job_description: str) -> int:
     token extraction that preserves technical terms.
     
     Args:
-        resume_text: The full resume text.
-        job_description: The target job description.
+        resume: The full resume text or its extracted features.
+        job_description: The target job description or its cached analysis.
         
     Returns:
         Keyword match score (0-100).
     """
-    if not job_description.strip():
-        return 75  # Default score if no job description provided
-    
-    # Extract tokens using improved tokenization
-    job_keywords = _extract_tokens(job_description)
-    resume_keywords = _extract_tokens(resume_text)
+    # Tokens come from the JD analysis, which is tokenized once per JD
+    job_keywords = as_job_description_analysis(job_description).tokens
     
     if not job_keywords:
-        return 75  # Default if no meaningful keywords found
+        return 75  # Default if no job description or no meaningful keywords found
     
     # Use set intersection for matching
-    matched_keywords = job_keywords.intersection(resume_keywords)
+    matched_keywords = job_keywords & _as_features(resume).tokens
     match_percentage = (len(matched_keywords) / len(job_keywords)) * 100
     
     # Scale the score - 0% match = 0, 50% match = 75, 100% match = 100
@@ -184,7 +96,7 @@ def calculate_keyword_score(resume_text: str, job_description: str) -> int:
     return round(min(100, keyword_score))
 
 
-def calculate_content_quality_score(resume_text: str) -> int:
+def calculate_content_quality_score(resume: ResumeInput) -> int:
     """
     Analyze content quality factors like action verbs and quantification.
     
@@ -192,101 +104,45 @@ def calculate_content_quality_score(resume_text: str) -> int:
     the first and second words for action verbs.
     
     Args:
-        resume_text: The full resume text.
+        resume: The full resume text or its extracted features.
         
     Returns:
         Content quality score (0-100).
     """
-    lines = resume_text.splitlines()
-    
-    # Find bullet point lines
-    bullet_pattern = r'^[-•*✓►▪→]\s*'
-    bullet_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped and re.match(bullet_pattern, stripped):
-            bullet_lines.append(stripped)
-    
-    # Count bullet points that start with action verbs
-    action_verb_count = 0
-    for line in bullet_lines:
-        # Remove the bullet and get words
-        cleaned_line = re.sub(bullet_pattern, '', line).strip().lower()
-        words = cleaned_line.split()
-        
-        if not words:
-            continue
-        
-        # Check first word
-        first_word = words[0].rstrip(',.:;')
-        if first_word in ACTION_VERBS:
-            action_verb_count += 1
-            continue
-        
-        # If first word is an adverb, check second word
-        if first_word in COMMON_ADVERBS and len(words) > 1:
-            second_word = words[1].rstrip(',.:;')
-            if second_word in ACTION_VERBS:
-                action_verb_count += 1
+    features = _as_features(resume)
     
     # Calculate action verb percentage
     action_verb_score = 0
-    if bullet_lines:
-        action_verb_percentage = (action_verb_count / len(bullet_lines)) * 100
+    if features.bullet_lines:
+        action_verb_percentage = (features.action_verb_bullets / len(features.bullet_lines)) * 100
         action_verb_score = min(100, action_verb_percentage)
     
-    # Check for metrics and quantifiable achievements
-    metrics_pattern = r'\b\d+%|\$[\d,]+|\d+\s*(percent|dollars|users|clients|people|customers|sales|revenue|growth|increase|decrease|reduction|projects?|teams?|members?)\b'
-    metrics_matches = re.findall(metrics_pattern, resume_text.lower())
-    
     # Score based on number of metrics (diminishing returns)
-    metrics_score = min(100, len(metrics_matches) * 15) if metrics_matches else 0
+    metrics_score = min(100, features.metric_count * 15)
     
     # Overall content quality is weighted between action verbs and metrics
     content_score = (action_verb_score * 0.6) + (metrics_score * 0.4)
     return round(content_score)
 
 
-def calculate_formatting_score(resume_text: str) -> int:
+def calculate_formatting_score(resume: ResumeInput) -> int:
     """
     Check for good formatting practices in resumes.
     
     Args:
-        resume_text: The full resume text.
+        resume: The full resume text or its extracted features.
         
     Returns:
         Formatting score (0-100).
     """
-    lines = resume_text.splitlines()
-    
-    # Check consistent use of bullet points
-    bullet_pattern = r'^[-•*✓►▪→]\s+'
-    has_bullets = any(re.match(bullet_pattern, line.strip()) for line in lines)
-    
-    # Check for appropriate line spacing
-    blank_line_count = sum(1 for line in lines if not line.strip())
-    total_lines = len(lines)
-    blank_ratio = blank_line_count / total_lines if total_lines > 0 else 0
-    
-    # Check for consistent date formatting
-    date_patterns = [
-        r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b',
-        r'\b\d{2}/\d{2}/\d{4}\b',
-        r'\b\d{4}-\d{2}\b',
-        r'\b\d{4}\s*[-–]\s*(Present|Current|Now|\d{4})\b'
-    ]
-    
-    dates = []
-    for pattern in date_patterns:
-        dates.extend(re.findall(pattern, resume_text, re.IGNORECASE))
-    
-    has_consistent_dates = len(dates) >= 2
+    features = _as_features(resume)
+    blank_ratio = features.blank_ratio
     
     # Calculate formatting score
     formatting_score = 0
     
     # Bullet points (30 points)
-    if has_bullets:
+    if features.has_spaced_bullets:
         formatting_score += 30
     
     # Appropriate spacing (40 points)
@@ -296,13 +152,13 @@ def calculate_formatting_score(resume_text: str) -> int:
         formatting_score += 20
     
     # Date consistency (30 points)
-    if has_consistent_dates:
+    if features.date_count >= 2:
         formatting_score += 30
     
     return formatting_score
 
 
-def sanitize_resume_for_ai(resume_text: str, sections: dict) -> str:
+def sanitize_resume_for_ai(resume_text: str, sections: Mapping) -> str:
     """
     Remove sensitive personal information from resume before sending to AI.
     
@@ -315,9 +171,10 @@ def sanitize_resume_for_ai(resume_text: str, sections: dict) -> str:
     """
     # Use sections to exclude Contact and Summary for privacy
     safe_sections = []
-    for section_name, section_content in sections.items():
-        if section_name not in ["contact", "summary", "other"] and section_content.strip():
-            safe_sections.append(f"[{section_name.title()}]\n{section_content}")
+    for section_name in sections:
+        if section_name in ["contact", "summary", "other"] or not _section_length(sections, section_name):
+            continue
+        safe_sections.append(f"[{section_name.title()}]\n{sections[section_name]}")
     
     if safe_sections:
         return "\n\n".join(safe_sections)
@@ -326,14 +183,19 @@ def sanitize_resume_for_ai(resume_text: str, sections: dict) -> str:
     return resume_text[:3000]
 
 
-def generate_ats_feedback(resume_text: str, sections: dict, job_description: str, overall_score: int) -> str:
+async def generate_ats_feedback(
+    resume_text: str,
+    sections: dict,
+    job_description: JobDescriptionInput,
+    overall_score: int
+) -> str:
     """
     Generate detailed AI feedback on the resume's ATS-friendliness.
     
     Args:
         resume_text: The full resume text.
         sections: The parsed sections dictionary.
-        job_description: The target job description.
+        job_description: The target job description or its cached analysis.
         overall_score: The calculated overall ATS score.
         
     Returns:
@@ -351,7 +213,7 @@ def generate_ats_feedback(resume_text: str, sections: dict, job_description: str
     {safe_resume_text[:3000]}
     
     Job Description:
-    {job_description[:1000]}
+    {as_job_description_analysis(job_description).ats_excerpt}
     
     Based on your expertise in ATS systems and resume optimization, provide THREE specific, actionable suggestions to improve this resume's ATS compatibility. Focus on:
     1. Format improvements for better parsing
@@ -362,7 +224,7 @@ def generate_ats_feedback(resume_text: str, sections: dict, job_description: str
     """
     
     try:
-        completion = client.chat.completions.create(
+        return await chat_completion(
             model="llama-3.1-8b-instant",
             messages=[
                 {"role": "system", "content": "You are an expert resume analyst helping job seekers improve their ATS compatibility."},
@@ -370,29 +232,32 @@ def generate_ats_feedback(resume_text: str, sections: dict, job_description: str
             ],
         )
         
-        return completion.choices[0].message.content
-        
     except Exception as e:
         return f"Error generating AI feedback: {str(e)}"
 
 
-def get_ats_score(resume_text: str, resume_sections: dict, job_description: str) -> dict:
+def calculate_ats_scores(resume_text: str, resume_sections: dict, job_description: JobDescriptionInput) -> dict:
     """
-    Main function to get ATS score and analysis.
+    Calculate the deterministic part of the ATS analysis.
+    
+    This is CPU-bound and safe to run in a worker process.
     
     Args:
         resume_text: The extracted resume text.
         resume_sections: The parsed resume sections dictionary.
-        job_description: The target job description.
+        job_description: The target job description or its cached analysis.
         
     Returns:
-        Dictionary containing overall score, component scores, justification, and AI analysis.
+        Dictionary containing overall score, component scores and justification.
     """
+    # Scan the resume text once for every text-based component
+    features = get_resume_features(resume_text)
+    
     # Calculate individual component scores
     structure_score = calculate_structure_score(resume_sections)
-    keyword_score = calculate_keyword_score(resume_text, job_description)
-    content_score = calculate_content_quality_score(resume_text)
-    formatting_score = calculate_formatting_score(resume_text)
+    keyword_score = calculate_keyword_score(features, job_description)
+    content_score = calculate_content_quality_score(features)
+    formatting_score = calculate_formatting_score(features)
     
     # Calculate overall ATS score with weights
     weights = {
@@ -440,9 +305,6 @@ def get_ats_score(resume_text: str, resume_sections: dict, job_description: str)
     else:
         justifications.append("Formatting issues may prevent proper ATS parsing.")
     
-    # Add detailed AI analysis
-    ai_analysis = generate_ats_feedback(resume_text, resume_sections, job_description, overall_score)
-    
     return {
         "overall_score": overall_score,
         "component_scores": {
@@ -451,6 +313,38 @@ def get_ats_score(resume_text: str, resume_sections: dict, job_description: str)
             "content_score": content_score,
             "formatting_score": formatting_score
         },
-        "justification": justifications,
-        "ai_analysis": ai_analysis
+        "justification": justifications
     }
+
+
+async def get_ats_score(
+    resume_text: str,
+    resume_sections: dict,
+    job_description: JobDescriptionInput,
+    include_llm: bool = True
+) -> dict:
+    """
+    Main function to get ATS score and analysis.
+    
+    Args:
+        resume_text: The extracted resume text.
+        resume_sections: The parsed resume sections dictionary.
+        job_description: The target job description or its cached analysis.
+        include_llm: Whether to generate the AI analysis; without it the
+            result is deterministic and "ai_analysis" is None.
+        
+    Returns:
+        Dictionary containing overall score, component scores, justification, and AI analysis.
+    """
+    # Analyze the JD here (cached by content) so the worker receives its tokens ready-made
+    job_description = as_job_description_analysis(job_description)
+    
+    # Score in the CPU pool so the event loop stays free
+    ats_result = await run_cpu_bound(calculate_ats_scores, resume_text, resume_sections, job_description)
+    
+    # Add detailed AI analysis
+    ats_result["ai_analysis"] = await generate_ats_feedback(
+        resume_text, resume_sections, job_description, ats_result["overall_score"]
+    ) if include_llm else None
+    
+    return ats_result
@@ -0,0 +1,253 @@
+"""
+Career Index Module
+
+This module loads the career taxonomy from a data file and compiles it into an
+immutable CareerIndex: the skill automaton, the skill incidence matrix and the
+career TF-IDF model. Each index carries a version hash of the taxonomy file.
+
+A pickled snapshot of the compiled index is kept next to the taxonomy so that
+cold starts load it instead of recompiling. The taxonomy file is polled for
+changes from a background thread and a new index is swapped in atomically, so
+edits take effect without a redeploy or a worker restart, and without stalling
+the requests that arrive while it compiles.
+
+Prebuild the snapshot with:
+    python -m app.services.career_index
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+
+from app.services import lsh_index
+from app.services.career_similarity import CareerSimilarityEngine
+from app.services.hashed_features import DIMENSION
+from app.services.skill_matcher import SkillMatcher
+from app.services.skill_matrix import SkillIncidenceMatrix
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+TAXONOMY_PATH = os.getenv("CAREER_TAXONOMY_PATH", os.path.join(_DATA_DIR, "career_clusters.json"))
+SNAPSHOT_PATH = os.getenv("CAREER_INDEX_SNAPSHOT_PATH", os.path.splitext(TAXONOMY_PATH)[0] + ".index.pkl")
+# Seconds between checks of the taxonomy file for changes (0 disables hot reload)
+RELOAD_INTERVAL = float(os.getenv("CAREER_TAXONOMY_RELOAD_SECONDS", "30"))
+
+# Bump when the layout of the compiled index changes so old snapshots are rebuilt
+SNAPSHOT_FORMAT = 3
+# Settings baked into the compiled index; a snapshot built with other values is rebuilt
+SNAPSHOT_SETTINGS = (DIMENSION, lsh_index.ANN_MODE, lsh_index.TABLES, lsh_index.BITS, lsh_index.MIN_ROWS)
+
+
+class CareerIndex:
+    """
+    Immutable compiled view of one version of the career taxonomy.
+
+    Callers should fetch the index once per request with `get_career_index()`
+    and use that object throughout, so a concurrent reload never mixes two
+    taxonomy versions in one analysis.
+    """
+
+    __slots__ = ("version", "clusters", "careers", "skill_matcher", "skill_matrix", "similarity_engine")
+
+    def __init__(self, career_clusters: Dict[str, dict], version: str):
+        """
+        Compile every lookup structure for a taxonomy.
+
+        Args:
+            career_clusters: Mapping of career name to {"skills": [...], "keywords": [...]}.
+            version: Version hash of the taxonomy the index was built from.
+        """
+        set_attr = super().__setattr__
+        set_attr("version", version)
+        set_attr("clusters", MappingProxyType(career_clusters))
+        set_attr("careers", tuple(career_clusters.keys()))
+        set_attr("skill_matcher", SkillMatcher(
+            skill
+            for cluster_data in career_clusters.values()
+            for skill in cluster_data["skills"]
+        ))
+        set_attr("skill_matrix", SkillIncidenceMatrix(career_clusters))
+        set_attr("similarity_engine", CareerSimilarityEngine(career_clusters))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CareerIndex is immutable")
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["clusters"] = dict(self.clusters)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            super().__setattr__(name, MappingProxyType(value) if name == "clusters" else value)
+
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> Tuple[Dict[str, dict], str]:
+    """
+    Load the career taxonomy from a JSON data file.
+
+    Args:
+        path: Path to the taxonomy file.
+
+    Returns:
+        A tuple of (career_clusters, version) where version is a hash of the
+        file contents.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    career_clusters = json.loads(raw)["careers"]
+
+    for career_name, cluster_data in career_clusters.items():
+        if not isinstance(cluster_data.get("skills"), list) or not isinstance(cluster_data.get("keywords"), list):
+            raise ValueError(f"Career '{career_name}' must define 'skills' and 'keywords' lists")
+
+    return career_clusters, version
+
+
+def _read_snapshot(path: str, version: str) -> Optional[CareerIndex]:
+    """Load a snapshot if it exists and matches the taxonomy version."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        if (
+            snapshot["format"] != SNAPSHOT_FORMAT
+            or snapshot["version"] != version
+            or snapshot["settings"] != SNAPSHOT_SETTINGS
+            or not isinstance(snapshot["index"], CareerIndex)
+        ):
+            return None
+        return snapshot["index"]
+    except Exception:
+        # Any unreadable, foreign or outdated file just means recompiling
+        return None
+
+
+def _write_snapshot(path: str, index: CareerIndex) -> None:
+    """Write a snapshot atomically so readers never see a partial file."""
+    directory = os.path.dirname(path) or "."
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(
+                {"format": SNAPSHOT_FORMAT, "version": index.version, "settings": SNAPSHOT_SETTINGS, "index": index},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, path)
+    except OSError:
+        # A read-only deployment still works, it just recompiles on startup
+        pass
+
+
+def build_career_index(taxonomy_path: str = TAXONOMY_PATH, snapshot_path: Optional[str] = SNAPSHOT_PATH) -> CareerIndex:
+    """
+    Load a CareerIndex, preferring a matching prebuilt snapshot.
+
+    Args:
+        taxonomy_path: Path to the taxonomy data file.
+        snapshot_path: Path of the compiled snapshot, or None to skip it.
+
+    Returns:
+        The compiled CareerIndex.
+    """
+    career_clusters, version = load_taxonomy(taxonomy_path)
+
+    if snapshot_path:
+        index = _read_snapshot(snapshot_path, version)
+        if index is not None:
+            return index
+
+    index = CareerIndex(career_clusters, version)
+    if snapshot_path:
+        _write_snapshot(snapshot_path, index)
+    return index
+
+
+# Active index, swapped atomically on reload
+_index_instance: Optional[CareerIndex] = None
+_index_lock = threading.Lock()
+_taxonomy_stat: Optional[Tuple[float, int]] = None
+_last_check = 0.0
+_reload_thread: Optional[threading.Thread] = None
+_reload_thread_lock = threading.Lock()
+
+
+def _stat_taxonomy() -> Optional[Tuple[float, int]]:
+    try:
+        stat = os.stat(TAXONOMY_PATH)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+def reload_career_index(force: bool = False) -> CareerIndex:
+    """
+    Reload the taxonomy if its file changed and swap in the new index.
+
+    If the new taxonomy fails to load, the current index stays active.
+
+    Args:
+        force: Rebuild even if the file looks unchanged.
+
+    Returns:
+        The active CareerIndex.
+    """
+    global _index_instance, _taxonomy_stat, _last_check
+
+    with _index_lock:
+        _last_check = time.monotonic()
+        stat = _stat_taxonomy()
+        if _index_instance is not None and not force and stat == _taxonomy_stat:
+            return _index_instance
+
+        try:
+            index = build_career_index()
+        except Exception:
+            if _index_instance is None:
+                raise
+            return _index_instance
+
+        _taxonomy_stat = stat
+        _index_instance = index
+        return index
+
+
+def _start_background_reload() -> None:
+    """Check the taxonomy for changes in a background thread, unless a check is already running."""
+    global _reload_thread, _last_check
+    with _reload_thread_lock:
+        if _reload_thread is not None and _reload_thread.is_alive():
+            return
+        # Requests arriving before the thread runs should not start another one
+        _last_check = time.monotonic()
+        _reload_thread = threading.Thread(target=reload_career_index, name="career-index-reload", daemon=True)
+        _reload_thread.start()
+
+
+def get_career_index() -> CareerIndex:
+    """
+    Get the active CareerIndex, loading it on first use and hot-reloading on change.
+
+    Only the first load blocks. Later reloads run in a background thread while
+    callers keep getting the current index until the new one is swapped in.
+    """
+    index = _index_instance
+    if index is None:
+        return reload_career_index()
+    if RELOAD_INTERVAL > 0 and time.monotonic() - _last_check >= RELOAD_INTERVAL:
+        _start_background_reload()
+    return index
+
+
+if __name__ == "__main__":
+    built = build_career_index(snapshot_path=None)
+    _write_snapshot(SNAPSHOT_PATH, built)
+    print(f"Wrote career index snapshot {built.version} ({len(built.careers)} careers) to {SNAPSHOT_PATH}")
@@ -0,0 +1,149 @@
+"""
+Career Similarity Engine Module
+
+This module provides a TF-IDF model fitted once on the career cluster keyword
+documents. At request time the resume is transformed once and every career's
+cosine score comes from a single sparse matrix-vector product.
+
+The keyword documents are also kept as stateless hashed vectors, used instead
+of the TF-IDF model when SIMILARITY_MODE is "hashed" (see hashed_features).
+With ANN_MODE "lsh" and a large enough taxonomy, the hashed vectors are also
+indexed by random-projection LSH (see lsh_index). Career matching adds the
+careers it finds near the resume to the skill index candidates, so a career
+described like the resume is considered even without a shared skill. Scoring
+itself is always exact.
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from app.services.hashed_features import SIMILARITY_MODE, cosine_percentages, hash_vector, hash_vectors
+from app.services.lsh_index import RandomProjectionLSH, lsh_enabled
+
+
+class CareerSimilarityEngine:
+    """
+    Scores a resume against every career cluster in one pass.
+
+    Usage:
+        engine = CareerSimilarityEngine(CAREER_CLUSTERS)
+        scores = engine.score(resume_text)  # {"Software Engineer": 12.5, ...}
+    """
+
+    def __init__(self, career_clusters: Dict[str, dict], approximate: Optional[bool] = None):
+        """
+        Fit the TF-IDF model on the keyword document of each career.
+
+        Args:
+            career_clusters: Mapping of career name to cluster data with a
+                "keywords" list.
+            approximate: Whether to build an LSH index over the hashed vectors;
+                by default it follows ANN_MODE and ANN_MIN_ROWS.
+        """
+        self.careers: List[str] = list(career_clusters.keys())
+        documents = [
+            " ".join(cluster_data["keywords"]).lower()
+            for cluster_data in career_clusters.values()
+        ]
+
+        self._vectorizer = TfidfVectorizer(stop_words='english', norm=None)
+        # Rows are L2-normalised, so a dot product is the cosine similarity
+        self._career_matrix = normalize(self._vectorizer.fit_transform(documents))
+        self._analyzer = self._vectorizer.build_analyzer()
+        self._vocabulary = self._vectorizer.vocabulary_
+        self._idf = self._vectorizer.idf_
+        # Smoothed idf of a term that appears in no career document
+        self._unseen_idf = math.log(len(documents) + 1) + 1
+        self._hashed_matrix = hash_vectors(documents)
+        approximate = lsh_enabled(len(documents)) if approximate is None else approximate
+        self._lsh = RandomProjectionLSH(self._hashed_matrix) if approximate else None
+
+    @property
+    def approximate(self) -> bool:
+        """Whether an LSH index is built, so `near_careers` can find careers."""
+        return self._lsh is not None
+
+    def near_careers(self, resume_vector: csr_matrix, probes: Optional[int] = None) -> np.ndarray:
+        """
+        Find the careers the LSH index places near a resume.
+
+        Args:
+            resume_vector: Hashed vector of the resume.
+            probes: Extra buckets per table (defaults to ANN_PROBES).
+
+        Returns:
+            Sorted career row indices; empty when no LSH index is built.
+        """
+        if self._lsh is None:
+            return np.zeros(0, dtype=np.int64)
+        return self._lsh.candidates(resume_vector, probes)
+
+    def score_vector(
+        self,
+        resume_text: str,
+        career_ids: np.ndarray = None,
+        resume_vector: Optional[csr_matrix] = None
+    ) -> np.ndarray:
+        """
+        Calculate cosine similarity of the resume against every (or selected) career.
+
+        Args:
+            resume_text: The resume text.
+            career_ids: Optional career row indices to restrict scoring to.
+            resume_vector: Optional precomputed hashed vector of the resume,
+                used in hashed mode.
+
+        Returns:
+            Array of similarity percentages aligned with `self.careers`, or
+            with `career_ids` when given.
+        """
+        if SIMILARITY_MODE == "hashed":
+            hashed_matrix = self._hashed_matrix if career_ids is None else self._hashed_matrix[career_ids]
+            return cosine_percentages(hashed_matrix, resume_vector if resume_vector is not None else hash_vector(resume_text))
+
+        career_matrix = self._career_matrix if career_ids is None else self._career_matrix[career_ids]
+        term_counts = Counter(self._analyzer(resume_text.lower()))
+
+        columns, weights = [], []
+        squared_norm = 0.0
+        for term, count in term_counts.items():
+            column = self._vocabulary.get(term)
+            if column is None:
+                squared_norm += (count * self._unseen_idf) ** 2
+            else:
+                weight = count * self._idf[column]
+                columns.append(column)
+                weights.append(weight)
+                squared_norm += weight ** 2
+
+        if squared_norm == 0:
+            return np.zeros(career_matrix.shape[0])
+
+        resume_vector = csr_matrix(
+            (weights, ([0] * len(columns), columns)),
+            shape=(1, len(self._idf)),
+        )
+        # Terms outside the career vocabulary still count towards the resume's
+        # norm. IDF comes from the career documents rather than from a per-pair
+        # fit, so scores differ from the former per-pair TF-IDF similarity
+        similarities = (career_matrix @ resume_vector.T).toarray().ravel() / math.sqrt(squared_norm)
+        return np.round(similarities * 100, 2)
+
+    def score(self, resume_text: str) -> Dict[str, float]:
+        """
+        Calculate cosine similarity of the resume against every career.
+
+        Args:
+            resume_text: The resume text.
+
+        Returns:
+            Dictionary mapping career name to similarity percentage.
+        """
+        return dict(zip(self.careers, self.score_vector(resume_text).tolist()))
+
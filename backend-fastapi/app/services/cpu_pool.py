@@ -0,0 +1,166 @@
+"""
+CPU Pool Module
+
+This module runs CPU-bound stages (PDF parsing, TF-IDF scoring, ATS scoring)
+in a process pool so they never block the event loop. Submissions are bounded:
+once every worker is busy and the queue is full, new work is rejected with
+PoolSaturatedError, which the API turns into a fast 503 with Retry-After.
+
+If a worker process dies (killed, out of memory, a crash in native code), the
+executor is broken for good, so it is dropped and a fresh one is started on
+the next submission. The submissions that were running fail with
+WorkerCrashedError, a PoolSaturatedError, so clients get the same retryable 503.
+
+Configuration (environment variables):
+    CPU_POOL_WORKERS        Worker processes (default: CPU count). 0 runs work
+                            inline on the event loop, for development.
+    CPU_POOL_QUEUE_SIZE     Submissions allowed to wait for a free worker
+                            (default: 2 x workers).
+    CPU_POOL_RETRY_AFTER    Seconds clients are told to wait when saturated (default 2).
+    CPU_POOL_START_METHOD   multiprocessing start method (default "spawn").
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 1)))
+QUEUE_SIZE = int(os.getenv("CPU_POOL_QUEUE_SIZE", str(WORKERS * 2)))
+RETRY_AFTER = int(os.getenv("CPU_POOL_RETRY_AFTER", "2"))
+START_METHOD = os.getenv("CPU_POOL_START_METHOD", "spawn")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the CPU pool has no free worker and its queue is full."""
+
+    def __init__(self, retry_after: int = RETRY_AFTER):
+        super().__init__("Server is busy processing other requests, please retry shortly")
+        self.retry_after = retry_after
+
+
+class WorkerCrashedError(PoolSaturatedError):
+    """Raised when a worker process died while running a submission; the pool restarts and the call can be retried."""
+
+    def __init__(self, retry_after: int = RETRY_AFTER):
+        super().__init__(retry_after)
+        self.args = ("A worker process failed while handling the request, please retry",)
+
+
+def _warm_worker() -> None:
+    """Load shared read-only state once per worker process."""
+    from app.services.career_index import get_career_index
+    from app.services.resume_parser import get_parser
+
+    get_career_index()
+    get_parser()
+
+
+class CpuPool:
+    """
+    A process pool with a bounded number of in-flight submissions.
+
+    Usage:
+        pool = CpuPool(workers=4, queue_size=8)
+        result = await pool.run(parse_resume_file, file_bytes, "resume.pdf")
+    """
+
+    def __init__(self, workers: int = WORKERS, queue_size: int = QUEUE_SIZE, retry_after: int = RETRY_AFTER):
+        """
+        Configure the pool; worker processes start on first use.
+
+        Args:
+            workers: Number of worker processes, or 0 to run work inline.
+            queue_size: Submissions allowed to wait beyond the running ones.
+            retry_after: Seconds reported to clients when the pool is saturated.
+        """
+        self.workers = workers
+        self.max_in_flight = workers + queue_size
+        self.retry_after = retry_after
+        self._in_flight = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of submissions running or waiting for a worker."""
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(START_METHOD),
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next submission starts a new one."""
+        with self._lock:
+            # Concurrent failures of the same executor only replace it once
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a picklable function in a worker process.
+
+        Args:
+            fn: Module-level function to call.
+            *args: Positional arguments for `fn`.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            The function's return value.
+
+        Raises:
+            PoolSaturatedError: If the pool and its queue are full.
+            WorkerCrashedError: If a worker process died; the pool is restarted.
+        """
+        if self.workers <= 0:
+            return fn(*args, **kwargs)
+
+        if self._in_flight >= self.max_in_flight:
+            raise PoolSaturatedError(self.retry_after)
+
+        self._in_flight += 1
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+        except BrokenProcessPool as e:
+            self._discard_executor(executor)
+            raise WorkerCrashedError(self.retry_after) from e
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance for convenience
+_pool_instance: Optional[CpuPool] = None
+
+
+def get_cpu_pool() -> CpuPool:
+    """Get or create the singleton CpuPool."""
+    global _pool_instance
+    if _pool_instance is None:
+        _pool_instance = CpuPool()
+    return _pool_instance
+
+
+async def run_cpu_bound(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a CPU-bound function in the shared pool (see `CpuPool.run`)."""
+    return await get_cpu_pool().run(fn, *args, **kwargs)
@@ -0,0 +1,75 @@
+"""
+Hashed Features Module
+
+This module turns text into stateless vectors for semantic similarity. Terms
+are hashed into a fixed number of columns, with no vocabulary and no fit step,
+so a text gets the same vector in every worker process, memory stays fixed
+however many distinct terms arrive, and vectors can be cached, stored or
+batched freely. Vectors are L2-normalised term counts (English stop words
+removed, as in the career TF-IDF model), so a dot product is the cosine
+similarity.
+
+Resumes (via their shared features), career keyword documents and job
+description analyses all carry vectors in this space.
+
+Configuration (environment variables):
+    SIMILARITY_MODE         "tfidf" to score careers with the fitted TF-IDF
+                            model (default) or "hashed" to use hashed vectors.
+    HASHED_FEATURES_DIM     Number of hashed columns (default 2**18).
+"""
+
+import os
+from typing import Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+
+SIMILARITY_MODES = ("tfidf", "hashed")
+SIMILARITY_MODE = os.getenv("SIMILARITY_MODE", "tfidf")
+DIMENSION = int(os.getenv("HASHED_FEATURES_DIM", str(2 ** 18)))
+
+if SIMILARITY_MODE not in SIMILARITY_MODES:
+    raise ValueError(f"SIMILARITY_MODE must be one of {', '.join(SIMILARITY_MODES)}")
+
+# Stateless: transform needs no fit, and the hash is the same in every process
+_vectorizer = HashingVectorizer(
+    n_features=DIMENSION,
+    stop_words="english",
+    alternate_sign=False,
+    norm="l2",
+    dtype=np.float32,
+)
+
+
+def hash_vectors(texts: Iterable[str]) -> csr_matrix:
+    """
+    Hash texts into L2-normalised term count vectors.
+
+    Args:
+        texts: The texts; they are lowercased before tokenizing.
+
+    Returns:
+        One row per text, with DIMENSION columns.
+    """
+    return _vectorizer.transform(texts)
+
+
+def hash_vector(text: str) -> csr_matrix:
+    """Hash one text into a 1 x DIMENSION row (see `hash_vectors`)."""
+    return hash_vectors([text])
+
+
+def cosine_percentages(matrix: csr_matrix, vector: csr_matrix) -> np.ndarray:
+    """
+    Cosine similarity of each row of `matrix` with one hashed vector.
+
+    Args:
+        matrix: Hashed vectors, one per row.
+        vector: A 1 x DIMENSION hashed vector.
+
+    Returns:
+        Similarity percentages rounded to two decimals, one per row.
+    """
+    similarities = (matrix @ vector.T).toarray().ravel()
+    return np.round(similarities.astype(np.float64) * 100, 2)
@@ -0,0 +1,375 @@
+"""
+Job Description Analysis Module
+
+This module analyzes a job description once and reuses the result across
+requests. An analysis holds everything the scoring and prompt code derives
+from the JD: its keyword token set, the known skills it mentions, and the
+truncated excerpts embedded in LLM prompts. Analyses are
+addressed by a handle (the SHA-256 of the stripped JD text), so clients can
+register a JD once with POST /api/v1/jd and send the handle instead of the
+full text.
+
+Hot analyses live in an in-memory LRU. When JD_DB_PATH is set, JD texts are
+also kept in an SQLite file that every worker process shares, so handles
+survive eviction and restarts; otherwise an evicted handle must be registered
+again. Persisted texts expire JD_DB_MAX_AGE_DAYS after they were last
+registered, and the oldest are dropped beyond JD_DB_MAX_ENTRIES.
+
+Routes use the async methods, which analyze in the CPU pool and read or
+write SQLite in a worker thread, so the event loop only does the LRU lookup.
+
+Configuration (environment variables):
+    JD_CACHE_MAX_ENTRIES    Analyses held in memory (default 1024).
+    JD_DB_PATH              SQLite file for registered JD texts (default: none).
+    JD_DB_MAX_AGE_DAYS      Days a JD text is kept after it was last registered;
+                            0 keeps texts forever (default 90).
+    JD_DB_MAX_ENTRIES       JD texts kept in SQLite; 0 for no limit (default 100000).
+    JD_DB_PRUNE_SECONDS     Minimum seconds between limit checks (default 60).
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Union
+
+from app.services.career_index import CareerIndex, get_career_index
+from app.services.cpu_pool import run_cpu_bound
+from app.services.resume_features import extract_tokens
+from app.services.sqlite_db import connect_shared
+
+MAX_ENTRIES = int(os.getenv("JD_CACHE_MAX_ENTRIES", "1024"))
+DB_PATH = os.getenv("JD_DB_PATH") or None
+DB_MAX_AGE_DAYS = float(os.getenv("JD_DB_MAX_AGE_DAYS", "90"))
+DB_MAX_ENTRIES = int(os.getenv("JD_DB_MAX_ENTRIES", "100000"))
+DB_PRUNE_SECONDS = float(os.getenv("JD_DB_PRUNE_SECONDS", "60"))
+
+# Prompt excerpt lengths used by the ATS feedback and study material prompts
+ATS_EXCERPT_CHARS = 1000
+STUDY_EXCERPT_CHARS = 500
+
+_HANDLE_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+# Longer texts are hashed in a worker thread rather than on the event loop
+_INLINE_HASH_CHARS = 64 * 1024
+
+
+class UnknownJobDescriptionError(KeyError):
+    """Raised when a JD handle is malformed or not registered."""
+
+    def __init__(self, handle: str):
+        super().__init__(handle)
+        self.handle = handle
+
+    def __str__(self) -> str:
+        return f"Unknown job description handle '{self.handle}'"
+
+
+class JobDescriptionAnalysis(NamedTuple):
+    """Everything derived from one job description."""
+
+    handle: str
+    text: str
+    tokens: FrozenSet[str]
+    skills: List[str]
+    ats_excerpt: str
+    study_excerpt: str
+    index_version: str
+
+
+# Functions that use a JD accept its text or its precomputed analysis
+JobDescriptionInput = Union[str, JobDescriptionAnalysis]
+
+
+def job_description_handle(job_description: str) -> str:
+    """Return the handle of a job description: the SHA-256 of its stripped text."""
+    return hashlib.sha256(job_description.strip().encode("utf-8")).hexdigest()
+
+
+def analyze_job_description(job_description: str, index: Optional[CareerIndex] = None) -> JobDescriptionAnalysis:
+    """
+    Analyze a job description without caching.
+
+    Args:
+        job_description: The job description text.
+        index: Optional career index for skill matching; defaults to the active one.
+
+    Returns:
+        The job description's analysis.
+    """
+    index = index or get_career_index()
+    text = job_description.strip()
+    return JobDescriptionAnalysis(
+        handle=job_description_handle(text),
+        text=text,
+        tokens=extract_tokens(text),
+        skills=index.skill_matcher.find_skills(text),
+        ats_excerpt=text[:ATS_EXCERPT_CHARS],
+        study_excerpt=text[:STUDY_EXCERPT_CHARS],
+        index_version=index.version,
+    )
+
+
+class JobDescriptionCache:
+    """
+    Bounded LRU of job description analyses, addressed by handle.
+
+    Usage:
+        cache = JobDescriptionCache(max_entries=256)
+        analysis = cache.register(job_description_text)
+        analysis = cache.get(analysis.handle)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        db_path: Optional[str] = DB_PATH,
+        db_max_age_days: float = DB_MAX_AGE_DAYS,
+        db_max_entries: int = DB_MAX_ENTRIES,
+        db_prune_seconds: float = DB_PRUNE_SECONDS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum analyses held in memory before LRU eviction.
+            db_path: Optional SQLite file persisting registered JD texts.
+            db_max_age_days: Days a persisted text is kept after its last
+                registration, or 0 for no limit.
+            db_max_entries: Persisted texts kept, or 0 for no limit.
+            db_prune_seconds: Minimum seconds between limit checks.
+        """
+        self.max_entries = max_entries
+        self.db_max_age_days = db_max_age_days
+        self.db_max_entries = db_max_entries
+        self.db_prune_seconds = db_prune_seconds
+        self._memory: "OrderedDict[str, JobDescriptionAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._last_prune = 0.0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = connect_shared(
+                db_path,
+                "CREATE TABLE IF NOT EXISTS job_descriptions ("
+                "handle TEXT PRIMARY KEY, text TEXT NOT NULL, created_at REAL NOT NULL)",
+                "CREATE INDEX IF NOT EXISTS job_descriptions_created_at ON job_descriptions (created_at)"
+            )
+
+    def _lookup(self, handle: str, index: CareerIndex) -> Optional[JobDescriptionAnalysis]:
+        """Return a cached analysis if it was built against the active taxonomy."""
+        with self._lock:
+            analysis = self._memory.get(handle)
+            if analysis is not None and analysis.index_version == index.version:
+                self._memory.move_to_end(handle)
+                self._counters["hits"] += 1
+                return analysis
+            self._counters["misses"] += 1
+            return None
+
+    def _remember(self, analysis: JobDescriptionAnalysis) -> None:
+        """Insert into the LRU and evict least recently used analyses."""
+        with self._lock:
+            self._memory[analysis.handle] = analysis
+            self._memory.move_to_end(analysis.handle)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def analyze(self, job_description: str) -> JobDescriptionAnalysis:
+        """
+        Get the analysis of a job description, computing it only on first use.
+
+        Args:
+            job_description: The job description text.
+
+        Returns:
+            The job description's analysis.
+        """
+        index = get_career_index()
+        analysis = self._lookup(job_description_handle(job_description), index)
+        if analysis is None:
+            analysis = analyze_job_description(job_description, index)
+            self._remember(analysis)
+        return analysis
+
+    def register(self, job_description: str) -> JobDescriptionAnalysis:
+        """
+        Analyze a job description and keep its text so its handle stays valid.
+
+        Args:
+            job_description: The job description text.
+
+        Returns:
+            The job description's analysis, including its handle.
+        """
+        analysis = self.analyze(job_description)
+        self._persist(analysis)
+        return analysis
+
+    async def analyze_async(self, job_description: str) -> JobDescriptionAnalysis:
+        """
+        Like `analyze`, but analyzes a new JD in the CPU pool.
+
+        Args:
+            job_description: The job description text.
+
+        Returns:
+            The job description's analysis.
+        """
+        if len(job_description) > _INLINE_HASH_CHARS:
+            handle = await asyncio.to_thread(job_description_handle, job_description)
+        else:
+            handle = job_description_handle(job_description)
+        analysis = self._lookup(handle, get_career_index())
+        if analysis is None:
+            analysis = await run_cpu_bound(analyze_job_description, job_description)
+            self._remember(analysis)
+        return analysis
+
+    async def register_async(self, job_description: str) -> JobDescriptionAnalysis:
+        """
+        Like `register`, but analyzes in the CPU pool and writes SQLite in a worker thread.
+
+        Args:
+            job_description: The job description text.
+
+        Returns:
+            The job description's analysis, including its handle.
+        """
+        analysis = await self.analyze_async(job_description)
+        if self._db is not None:
+            await asyncio.to_thread(self._persist, analysis)
+        return analysis
+
+    def _persist(self, analysis: JobDescriptionAnalysis) -> None:
+        """Store a registered JD text, restarting its retention period, and enforce the limits."""
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO job_descriptions (handle, text, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(handle) DO UPDATE SET created_at = excluded.created_at",
+                (analysis.handle, analysis.text, time.time()),
+            )
+            if time.monotonic() - self._last_prune < self.db_prune_seconds:
+                return
+            self._last_prune = time.monotonic()
+        self.prune()
+
+    def prune(self) -> int:
+        """
+        Drop expired JD texts, then the oldest ones over the entry limit.
+
+        Analyses already in memory stay usable until they are evicted.
+
+        Returns:
+            The number of texts removed.
+        """
+        if self._db is None:
+            return 0
+        removed = 0
+        with self._lock:
+            if self.db_max_age_days > 0:
+                cutoff = time.time() - self.db_max_age_days * 86400
+                removed += self._db.execute("DELETE FROM job_descriptions WHERE created_at < ?", (cutoff,)).rowcount
+            if self.db_max_entries > 0:
+                removed += self._db.execute(
+                    "DELETE FROM job_descriptions WHERE handle IN ("
+                    "SELECT handle FROM job_descriptions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.db_max_entries,),
+                ).rowcount
+        return removed
+
+    def get(self, handle: str) -> JobDescriptionAnalysis:
+        """
+        Look up the analysis of a registered job description.
+
+        Args:
+            handle: Handle returned by `register`.
+
+        Returns:
+            The job description's analysis.
+
+        Raises:
+            UnknownJobDescriptionError: If the handle is malformed, or neither
+                cached nor persisted.
+        """
+        if not _HANDLE_PATTERN.match(handle or ""):
+            raise UnknownJobDescriptionError(handle)
+
+        index = get_career_index()
+        analysis = self._lookup(handle, index)
+        if analysis is not None:
+            return analysis
+
+        analysis = analyze_job_description(self._stored_text(handle), index)
+        self._remember(analysis)
+        return analysis
+
+    async def get_async(self, handle: str) -> JobDescriptionAnalysis:
+        """
+        Like `get`, but reads SQLite in a worker thread and re-analyzes in the CPU pool.
+
+        Args:
+            handle: Handle returned by `register`.
+
+        Returns:
+            The job description's analysis.
+
+        Raises:
+            UnknownJobDescriptionError: If the handle is malformed, or neither
+                cached nor persisted.
+        """
+        if not _HANDLE_PATTERN.match(handle or ""):
+            raise UnknownJobDescriptionError(handle)
+
+        analysis = self._lookup(handle, get_career_index())
+        if analysis is not None:
+            return analysis
+
+        text = await asyncio.to_thread(self._stored_text, handle)
+        analysis = await run_cpu_bound(analyze_job_description, text)
+        self._remember(analysis)
+        return analysis
+
+    def _stored_text(self, handle: str) -> str:
+        """Return the text of a JD missing from the LRU or analyzed against an older taxonomy."""
+        with self._lock:
+            analysis = self._memory.get(handle)
+            row = None
+            if analysis is None and self._db is not None:
+                row = self._db.execute("SELECT text FROM job_descriptions WHERE handle = ?", (handle,)).fetchone()
+        # An analysis from an older taxonomy still has the text to rebuild from
+        text = analysis.text if analysis is not None else row[0] if row is not None else None
+        if text is None:
+            raise UnknownJobDescriptionError(handle)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of cached analyses."""
+        with self._lock:
+            return dict(self._counters, entries=len(self._memory))
+
+
+def as_job_description_analysis(job_description: JobDescriptionInput) -> JobDescriptionAnalysis:
+    """Return the analysis of a JD, analyzing (and caching) it if given as text."""
+    if isinstance(job_description, JobDescriptionAnalysis):
+        return job_description
+    return get_jd_cache().analyze(job_description)
+
+
+# Singleton instance for convenience
+_cache_instance: Optional[JobDescriptionCache] = None
+
+
+def get_jd_cache() -> JobDescriptionCache:
+    """Get or create the singleton JobDescriptionCache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = JobDescriptionCache()
+    return _cache_instance
@@ -0,0 +1,697 @@
+"""
+Job Index Module
+
+This module indexes a large corpus of job descriptions so a resume can be
+matched against all of them at once. Each JD is reduced to its keyword token
+set (the same tokens calculate_keyword_score uses) and stored as a row of a
+sparse binary JD x term matrix. Its column-major copy is the inverted index: a
+query only touches the posting lists of the resume's own tokens, and one
+sparse product gives every JD's TF-IDF cosine similarity and matched keyword
+count, from which keyword scores follow exactly as for a single JD.
+
+Rows live in two segments. The base segment is compacted, with IDF weights
+and row norms computed for it; JDs added since then go to a small delta
+segment scored with the same weights, and deleted JDs are masked out. Deltas
+are merged (and deleted rows dropped) when they grow large and whenever the
+index is saved, which also refreshes the IDF weights.
+
+With ANN_MODE "lsh" and a large enough base segment, its TF-IDF rows are also
+indexed by random-projection LSH (see lsh_index), and a query scores only the
+base rows sharing a probed bucket with the resume, plus every delta row. The
+base rows are then kept in row-major form as well, so the candidates are
+scored without touching whole posting lists.
+
+On disk, an SQLite table holds every JD (id, title, text, tokens) and is the
+source of truth; a snapshot of the compacted matrix lets processes load the
+index without re-reading every JD. Each mutation bumps a generation counter
+and logs the job ids it changed in the same transaction. Another process that
+sees the generation change re-reads only the logged JDs from the table, so it
+never waits for a snapshot of the new generation; a process too far behind for
+the log (entries are kept for a while after the snapshot covering them is
+written) loads the latest snapshot and applies the log from there. Only
+without a usable snapshot is the index rebuilt from the whole table.
+
+The index is guarded by a lock and does blocking SQLite and file I/O, so
+async callers run its methods in a worker thread.
+
+Bulk-ingest a JSON Lines file of {"job_id", "title", "description"} with:
+    python -m app.services.job_index ingest jobs.jsonl
+
+Configuration (environment variables):
+    JOB_INDEX_DIR           Directory for the JD table and snapshot
+                            (default: app/data/job_index).
+    JOB_INDEX_MERGE_ROWS    Delta rows that trigger a merge (default 5000).
+    JOB_INDEX_SYNC_SECONDS  Seconds between checks for changes made by other
+                            processes (default 5).
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix, diags, vstack
+
+from app.services.jd_analysis import job_description_handle
+from app.services.lsh_index import RandomProjectionLSH, lsh_enabled
+from app.services.resume_features import extract_tokens, get_resume_features
+from app.services.resume_ranker import keyword_scores
+from app.services.sqlite_db import connect_shared
+
+INDEX_DIR = os.getenv(
+    "JOB_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "job_index")
+)
+MERGE_ROWS = int(os.getenv("JOB_INDEX_MERGE_ROWS", "5000"))
+SYNC_INTERVAL = float(os.getenv("JOB_INDEX_SYNC_SECONDS", "5"))
+
+# Bump when the snapshot layout changes so old snapshots are rebuilt
+SNAPSHOT_FORMAT = 1
+
+# Seconds change log entries are kept after a snapshot covers them, so processes
+# that sync on schedule apply them instead of reloading the snapshot
+CHANGE_LOG_SECONDS = max(60.0, 10 * SYNC_INTERVAL)
+
+SORT_KEYS = ("similarity", "keyword")
+
+
+class JobPosting(NamedTuple):
+    """A job description submitted for indexing; a missing id defaults to its JD handle."""
+
+    job_id: Optional[str]
+    title: str
+    description: str
+
+
+class PreparedPosting(NamedTuple):
+    """A job posting with its id resolved and its text tokenized."""
+
+    job_id: str
+    title: str
+    text: str
+    tokens: Tuple[str, ...]
+
+
+class JobMatch(NamedTuple):
+    """One indexed JD matched against a resume."""
+
+    job_id: str
+    title: str
+    similarity: float
+    keyword_score: int
+    matched_keywords: int
+
+
+def posting_text(title: str, description: str) -> str:
+    """The text a JD is indexed and keyword-scored by: its title and description."""
+    return f"{title.strip()}\n{description.strip()}" if title.strip() else description.strip()
+
+
+def prepare_postings(postings: Sequence[JobPosting]) -> List[PreparedPosting]:
+    """
+    Tokenize job postings for indexing.
+
+    This is CPU-bound and safe to run in a worker process.
+
+    Args:
+        postings: Postings to prepare.
+
+    Returns:
+        The prepared postings, in the same order.
+    """
+    prepared = []
+    for posting in postings:
+        text = posting_text(posting.title, posting.description)
+        job_id = posting.job_id or job_description_handle(text)
+        prepared.append(PreparedPosting(job_id, posting.title.strip(), text, tuple(sorted(extract_tokens(text)))))
+    return prepared
+
+
+def resume_tokens(resume_text: str) -> FrozenSet[str]:
+    """A resume's keyword tokens (from its shared features), for use in a worker process."""
+    return get_resume_features(resume_text).tokens
+
+
+class _Segment:
+    """A block of JD rows as an inverted index, with the TF-IDF norm of each row and an optional LSH index."""
+
+    __slots__ = ("postings", "norms", "rows", "lsh")
+
+    def __init__(self, rows: csr_matrix, weights: np.ndarray, approximate: bool = False):
+        weights = weights[:rows.shape[1]]
+        self.postings: csc_matrix = rows.tocsc()
+        self.norms = np.sqrt(rows @ (weights ** 2))
+        self.rows: Optional[csr_matrix] = rows if approximate else None
+        self.lsh = RandomProjectionLSH(rows @ diags(weights)) if approximate else None
+
+    @property
+    def row_count(self) -> int:
+        return self.postings.shape[0]
+
+
+def _rows_matrix(rows: Sequence[Sequence[int]], term_count: int) -> csr_matrix:
+    """Binary CSR matrix from per-row term id lists."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    indices = np.fromiter((term for row in rows for term in row), dtype=np.int32, count=int(indptr[-1]))
+    return csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(rows), term_count))
+
+
+class JobIndex:
+    """
+    Incrementally updatable JD corpus index with an on-disk backend.
+
+    Usage:
+        index = JobIndex("/var/lib/careerlm/job_index")
+        index.add(prepare_postings([JobPosting(None, "Data Engineer", text)]))
+        index.save()
+        matches = index.search(resume_tokens(resume_text), top_k=10)
+    """
+
+    def __init__(self, root: str = INDEX_DIR, merge_rows: int = MERGE_ROWS, approximate: Optional[bool] = None):
+        """
+        Open (or create) an index, loading its snapshot or rebuilding it from the JD table.
+
+        Args:
+            root: Directory holding the JD table and the snapshot.
+            merge_rows: Delta rows that trigger a merge into the base segment.
+            approximate: Whether to build an LSH index over the base segment;
+                by default it follows ANN_MODE and ANN_MIN_ROWS.
+        """
+        self.root = root
+        self.merge_rows = merge_rows
+        self.approximate = approximate
+        os.makedirs(root, exist_ok=True)
+        self._snapshot_path = os.path.join(root, "index.npz")
+
+        self._lock = threading.RLock()
+        self._db = connect_shared(
+            os.path.join(root, "jobs.sqlite3"),
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, title TEXT NOT NULL, text TEXT NOT NULL, "
+            "tokens TEXT NOT NULL, created_at REAL NOT NULL)",
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)",
+            "CREATE TABLE IF NOT EXISTS changes ("
+            "generation INTEGER NOT NULL, job_id TEXT NOT NULL, changed_at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS changes_generation ON changes (generation)",
+            # The log is complete for every generation after this one
+            "INSERT OR IGNORE INTO meta (key, value) SELECT 'changes_since', value FROM meta WHERE key = 'generation'",
+        )
+        self._last_sync = time.monotonic()
+        self._reset()
+        self._generation: Optional[int] = None
+        self._refresh()
+
+    # Loading and persistence
+
+    def _reset(self) -> None:
+        self._terms: List[str] = []
+        self._vocabulary: Dict[str, int] = {}
+        self._job_ids: List[str] = []
+        self._titles: List[str] = []
+        self._rows_by_id: Dict[str, int] = {}
+        self._token_counts = array("i")
+        self._active = bytearray()
+        self._base: Optional[_Segment] = None
+        self._delta_rows: List[List[int]] = []
+        self._delta: Optional[_Segment] = None
+        self._weights = np.zeros(0)
+        self._unseen_weight = 1.0
+
+    def _db_meta(self, key: str) -> int:
+        return self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()[0]
+
+    def _db_generation(self) -> int:
+        return self._db_meta("generation")
+
+    def _refresh(self) -> None:
+        """Catch up with the JD table, and write a snapshot if the index had to be rebuilt."""
+        with self._lock:
+            # One read transaction, so the log and the table are seen at the same generation
+            self._db.execute("BEGIN")
+            try:
+                rebuilt = self._catch_up()
+            finally:
+                self._db.execute("COMMIT")
+            if rebuilt:
+                self._write_snapshot(self._generation)
+
+    def _catch_up(self) -> bool:
+        """
+        Bring the index up to the table's generation; runs inside a transaction.
+
+        Applies the change log to the index in memory, or to the latest
+        snapshot when the log no longer reaches back that far, and rebuilds
+        from the JD table only if neither works.
+
+        Returns:
+            True if the index was rebuilt from the JD table.
+        """
+        generation = self._db_generation()
+        if generation == self._generation:
+            return False
+        if self._generation is not None and self._apply_changes(self._generation, generation):
+            self._generation = generation
+            return False
+
+        self._reset()
+        snapshot_generation = self._read_snapshot()
+        if snapshot_generation is not None and self._apply_changes(snapshot_generation, generation):
+            self._generation = generation
+            return False
+
+        self._reset()
+        rows = self._db.execute("SELECT job_id, title, tokens FROM jobs ORDER BY rowid")
+        self._append_rows((job_id, title, tokens.split()) for job_id, title, tokens in rows)
+        self._compact()
+        self._generation = generation
+        return True
+
+    def _apply_changes(self, since: int, until: int) -> bool:
+        """
+        Re-read the JDs changed after generation `since` up to `until`; runs inside a transaction.
+
+        Returns:
+            False, without changing the index, if the log does not cover the range.
+        """
+        if since > until or since < self._db_meta("changes_since"):
+            return False
+        if since == until:
+            return True
+        changed = "SELECT job_id FROM changes WHERE generation > ? AND generation <= ?"
+        for (job_id,) in self._db.execute(f"SELECT DISTINCT job_id FROM ({changed})", (since, until)).fetchall():
+            self._deactivate(job_id)
+        # Deleted JDs are no longer in the table; added and replaced ones are re-read
+        rows = self._db.execute(
+            f"SELECT job_id, title, tokens FROM jobs WHERE job_id IN ({changed}) ORDER BY rowid", (since, until)
+        )
+        self._append_rows((job_id, title, tokens.split()) for job_id, title, tokens in rows)
+        if len(self._delta_rows) >= self.merge_rows:
+            self._compact()
+        return True
+
+    def _snapshot_generation(self) -> Optional[int]:
+        try:
+            with np.load(self._snapshot_path) as snapshot:
+                return int(snapshot["generation"]) if int(snapshot["format"]) == SNAPSHOT_FORMAT else None
+        except Exception:
+            return None
+
+    def _read_snapshot(self) -> Optional[int]:
+        """Load the snapshot into the (reset) index and return its generation, or None if it is unusable."""
+        try:
+            with np.load(self._snapshot_path) as snapshot:
+                if int(snapshot["format"]) != SNAPSHOT_FORMAT:
+                    return None
+                generation = int(snapshot["generation"])
+                terms = snapshot["terms"].tolist()
+                job_ids = snapshot["job_ids"].tolist()
+                titles = snapshot["titles"].tolist()
+                rows = csr_matrix(
+                    (np.ones(len(snapshot["indices"]), dtype=np.float32), snapshot["indices"], snapshot["indptr"]),
+                    shape=(len(job_ids), len(terms)),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+        self._terms = terms
+        self._vocabulary = {term: column for column, term in enumerate(terms)}
+        self._job_ids = job_ids
+        self._titles = titles
+        self._rows_by_id = {job_id: row for row, job_id in enumerate(job_ids)}
+        self._token_counts = array("i", np.diff(rows.indptr).astype(np.int32).tobytes())
+        self._active = bytearray(b"\x01" * len(job_ids))
+        self._set_base(rows)
+        return generation
+
+    def _write_snapshot(self, generation: int) -> None:
+        """
+        Write the (compacted) base segment atomically so readers never see a partial file.
+
+        A snapshot never replaces a newer one, and change log entries it covers
+        are dropped once they are older than CHANGE_LOG_SECONDS.
+        """
+        existing = self._snapshot_generation()
+        if existing is not None and existing > generation:
+            return
+        rows = self._base.postings.tocsr() if self._base is not None else _rows_matrix([], len(self._terms))
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.savez(
+                    tmp_file,
+                    format=SNAPSHOT_FORMAT,
+                    generation=generation,
+                    terms=np.array(self._terms, dtype=str),
+                    job_ids=np.array(self._job_ids, dtype=str),
+                    titles=np.array(self._titles, dtype=str),
+                    indptr=rows.indptr,
+                    indices=rows.indices,
+                )
+            os.replace(tmp_path, self._snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        expired = (generation, time.time() - CHANGE_LOG_SECONDS)
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                "UPDATE meta SET value = MAX(value, COALESCE("
+                "(SELECT MAX(generation) FROM changes WHERE generation <= ? AND changed_at < ?), value)) "
+                "WHERE key = 'changes_since'",
+                expired,
+            )
+            self._db.execute("DELETE FROM changes WHERE generation <= ? AND changed_at < ?", expired)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _publish(self, job_ids: Iterable[str]) -> int:
+        """Bump the generation and log the changed job ids; runs inside the mutation's transaction."""
+        self._db.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        generation = self._db_generation()
+        now = time.time()
+        self._db.executemany(
+            "INSERT INTO changes (generation, job_id, changed_at) VALUES (?, ?, ?)",
+            [(generation, job_id, now) for job_id in job_ids],
+        )
+        return generation
+
+    def save(self) -> None:
+        """Merge pending changes into the base segment and write the snapshot."""
+        with self._lock:
+            self._compact()
+            self._write_snapshot(self._generation)
+
+    def _sync(self) -> None:
+        """Apply changes made by other processes since the last check."""
+        if SYNC_INTERVAL <= 0 or time.monotonic() - self._last_sync < SYNC_INTERVAL:
+            return
+        with self._lock:
+            self._last_sync = time.monotonic()
+            if self._db_generation() != self._generation:
+                self._refresh()
+
+    # Segments
+
+    def _set_base(self, rows: csr_matrix) -> None:
+        """Make `rows` the base segment and refresh the IDF weights from it."""
+        document_count = rows.shape[0]
+        document_frequency = np.bincount(rows.indices, minlength=rows.shape[1])
+        # Smoothed IDF, as TfidfVectorizer computes it
+        self._weights = np.log((1 + document_count) / (1 + document_frequency)) + 1
+        self._unseen_weight = math.log(1 + document_count) + 1
+        approximate = lsh_enabled(document_count) if self.approximate is None else self.approximate
+        self._base = _Segment(rows, self._weights, approximate and document_count > 0)
+        self._delta = None
+
+    def _term_weights(self, term_count: int) -> np.ndarray:
+        """IDF weights for the first `term_count` terms; terms added since the last merge count as unseen."""
+        if term_count <= len(self._weights):
+            return self._weights[:term_count]
+        return np.concatenate([self._weights, np.full(term_count - len(self._weights), self._unseen_weight)])
+
+    def _compact(self) -> None:
+        """Merge the delta into the base segment and drop deleted rows."""
+        base_rows = self._base.postings.tocsr() if self._base is not None else _rows_matrix([], 0)
+        base_rows.resize(base_rows.shape[0], len(self._terms))
+        rows = vstack([base_rows, _rows_matrix(self._delta_rows, len(self._terms))], format="csr")
+
+        active = np.frombuffer(self._active, dtype=np.uint8).astype(bool)
+        if not active.all():
+            rows = rows[active]
+            kept = np.flatnonzero(active).tolist()
+            self._job_ids = [self._job_ids[row] for row in kept]
+            self._titles = [self._titles[row] for row in kept]
+            self._rows_by_id = {job_id: row for row, job_id in enumerate(self._job_ids)}
+            self._token_counts = array("i", np.diff(rows.indptr).astype(np.int32).tobytes())
+            self._active = bytearray(b"\x01" * len(kept))
+
+        self._delta_rows = []
+        self._set_base(rows)
+
+    def _delta_segment(self) -> Optional[_Segment]:
+        """The delta segment, built on first use after a change."""
+        if self._delta is None and self._delta_rows:
+            self._delta = _Segment(
+                _rows_matrix(self._delta_rows, len(self._terms)),
+                self._term_weights(len(self._terms))
+            )
+        return self._delta
+
+    # Mutations
+
+    def _append_rows(self, rows: Iterable[Tuple[str, str, Sequence[str]]]) -> None:
+        """Append JD rows to the delta segment, growing the vocabulary as needed."""
+        vocabulary = self._vocabulary
+        for job_id, title, tokens in rows:
+            columns = []
+            for token in tokens:
+                column = vocabulary.get(token)
+                if column is None:
+                    column = vocabulary[token] = len(self._terms)
+                    self._terms.append(token)
+                columns.append(column)
+            self._rows_by_id[job_id] = len(self._job_ids)
+            self._job_ids.append(job_id)
+            self._titles.append(title)
+            self._token_counts.append(len(columns))
+            self._active.append(1)
+            self._delta_rows.append(sorted(columns))
+        self._delta = None
+
+    def _deactivate(self, job_id: str) -> bool:
+        row = self._rows_by_id.pop(job_id, None)
+        if row is None:
+            return False
+        self._active[row] = 0
+        return True
+
+    def add(self, postings: Sequence[PreparedPosting]) -> List[str]:
+        """
+        Add or replace JDs.
+
+        Args:
+            postings: Postings from `prepare_postings`; an existing job id is replaced.
+
+        Returns:
+            The job ids, in input order.
+        """
+        with self._lock:
+            # Only the last posting of a repeated id in one batch is kept
+            latest = {posting.job_id: posting for posting in postings}
+            now = time.time()
+            # Taking the write lock first means no other change can land between catching up and publishing
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._catch_up()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO jobs (job_id, title, text, tokens, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(p.job_id, p.title, p.text, " ".join(p.tokens), now) for p in latest.values()],
+                )
+                generation = self._publish(latest)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            for job_id in latest:
+                self._deactivate(job_id)
+            self._append_rows((p.job_id, p.title, p.tokens) for p in latest.values())
+            self._generation = generation
+            if len(self._delta_rows) >= self.merge_rows:
+                self._compact()
+        return [posting.job_id for posting in postings]
+
+    def delete(self, job_ids: Iterable[str]) -> int:
+        """
+        Remove JDs from the index.
+
+        Args:
+            job_ids: Ids of the JDs to remove; unknown ids are ignored.
+
+        Returns:
+            The number of JDs removed.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._catch_up()
+                removed = [job_id for job_id in dict.fromkeys(job_ids) if job_id in self._rows_by_id]
+                if removed:
+                    self._db.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in removed])
+                    generation = self._publish(removed)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            if removed:
+                for job_id in removed:
+                    self._deactivate(job_id)
+                self._generation = generation
+        return len(removed)
+
+    # Queries
+
+    def get_text(self, job_id: str) -> Optional[str]:
+        """Return the indexed text of a JD, or None if it is not indexed."""
+        with self._lock:
+            row = self._db.execute("SELECT text FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def search(
+        self,
+        tokens: FrozenSet[str],
+        top_k: int = 10,
+        sort_by: str = "similarity",
+        probes: Optional[int] = None,
+        exact: bool = False
+    ) -> List[JobMatch]:
+        """
+        Find the JDs that best match a resume.
+
+        Args:
+            tokens: The resume's keyword tokens (see `resume_tokens`).
+            top_k: Maximum number of matches to return.
+            sort_by: "similarity" (TF-IDF cosine) or "keyword" (keyword score,
+                then similarity).
+            probes: LSH probes per table (defaults to ANN_PROBES).
+            exact: Score every JD even when the base segment has an LSH index.
+
+        Returns:
+            Matching JDs sharing at least one keyword with the resume, best first.
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        self._sync()
+
+        with self._lock:
+            vocabulary = self._vocabulary
+            columns = np.array(sorted(vocabulary[token] for token in tokens if token in vocabulary), dtype=np.int64)
+            if not len(columns) or not self._job_ids:
+                return []
+
+            weights = self._term_weights(len(self._terms))[columns]
+            unseen_count = len(tokens) - len(columns)
+            query_norm = math.sqrt(float(weights @ weights) + unseen_count * self._unseen_weight ** 2)
+            # One product per segment gives both the TF-IDF dot product and the match count
+            query = np.stack([weights ** 2, np.ones(len(columns))], axis=1)
+
+            dots, matched, norms, row_ids = [], [], [], []
+            sampled = False
+            offset = 0
+            for segment in (self._base, self._delta_segment()):
+                if segment is None:
+                    continue
+                segment_columns = columns[columns < segment.postings.shape[1]]
+                segment_query = query[:len(segment_columns)]
+                if segment.lsh is not None and not exact:
+                    # Only rows sharing a probed LSH bucket with the resume are scored
+                    query_vector = csr_matrix(
+                        (weights[:len(segment_columns)], (np.zeros(len(segment_columns), dtype=np.int64), segment_columns)),
+                        shape=(1, segment.postings.shape[1]),
+                    )
+                    rows = segment.lsh.candidates(query_vector, probes)
+                    products = segment.rows[rows][:, segment_columns] @ segment_query
+                    norms.append(segment.norms[rows])
+                    sampled = True
+                else:
+                    rows = np.arange(segment.row_count)
+                    products = segment.postings[:, segment_columns] @ segment_query
+                    norms.append(segment.norms)
+                dots.append(products[:, 0])
+                matched.append(products[:, 1])
+                row_ids.append(rows + offset)
+                offset += segment.row_count
+            matched = np.concatenate(matched)
+            active = np.frombuffer(self._active, dtype=np.uint8).astype(bool)
+            # Scored rows are every row unless some came from an LSH lookup
+            row_ids = np.concatenate(row_ids) if sampled else None
+            if sampled:
+                active = active[row_ids]
+
+            scored = np.flatnonzero((matched > 0) & active)
+            if not len(scored):
+                return []
+            candidates = row_ids[scored] if sampled else scored
+            norms = np.concatenate(norms)[scored]
+            similarity = np.concatenate(dots)[scored] / (norms * query_norm)
+            matched = matched[scored].astype(np.int64)
+            token_counts = np.frombuffer(self._token_counts, dtype=np.int32)[candidates]
+            keyword = keyword_scores(matched, token_counts)
+
+            # Similarity is at most 1, so halving it only breaks keyword score ties
+            sort_key = similarity if sort_by == "similarity" else keyword + similarity * 0.5
+            if len(candidates) > top_k:
+                best = np.argpartition(-sort_key, top_k - 1)[:top_k]
+            else:
+                best = np.arange(len(candidates))
+            best = best[np.argsort(-sort_key[best], kind="stable")]
+
+            return [
+                JobMatch(
+                    self._job_ids[candidates[i]],
+                    self._titles[candidates[i]],
+                    round(float(similarity[i]) * 100, 2),
+                    int(keyword[i]),
+                    int(matched[i]),
+                )
+                for i in best.tolist()
+            ]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of indexed JDs, terms and rows awaiting a merge."""
+        with self._lock:
+            return {
+                "jobs": len(self._rows_by_id),
+                "terms": len(self._terms),
+                "delta_rows": len(self._delta_rows),
+                "deleted_rows": self._active.count(0),
+            }
+
+
+# Singleton instance for convenience
+_index_instance: Optional[JobIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_job_index() -> JobIndex:
+    """Get or create the singleton JobIndex."""
+    global _index_instance
+    if _index_instance is None:
+        with _index_lock:
+            if _index_instance is None:
+                _index_instance = JobIndex()
+    return _index_instance
+
+
+def _read_postings(path: str) -> Iterable[JobPosting]:
+    with open(path, encoding="utf-8") as postings_file:
+        for line in postings_file:
+            if line.strip():
+                record = json.loads(line)
+                yield JobPosting(record.get("job_id"), record.get("title", ""), record["description"])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "ingest":
+        raise SystemExit("usage: python -m app.services.job_index ingest <jobs.jsonl>")
+    job_index = get_job_index()
+    batch: List[JobPosting] = []
+    for job_posting in _read_postings(sys.argv[2]):
+        batch.append(job_posting)
+        if len(batch) == 10000:
+            job_index.add(prepare_postings(batch))
+            batch = []
+    if batch:
+        job_index.add(prepare_postings(batch))
+    job_index.save()
+    print(f"Indexed {job_index.stats()['jobs']} job descriptions in {job_index.root}")
@@ -0,0 +1,240 @@
+"""
+LLM Response Cache Module
+
+This module provides a content-addressed cache for LLM completions. Entries are
+keyed by a hash of (model, normalized messages, temperature, max_tokens) and
+live in an in-memory LRU tier, optionally backed by an SQLite file that every
+worker process shares. Each entry has its own TTL, and hit/miss counters are
+kept for monitoring. Async callers use `get_async`/`set_async`, which answer
+memory hits inline and run SQLite reads and writes in a thread.
+
+Configuration (environment variables):
+    LLM_CACHE_ENABLED       Set to "0" to disable caching (default "1").
+    LLM_CACHE_MAX_ENTRIES   Entries kept in the memory tier (default 1024).
+    LLM_CACHE_TTL           Default entry lifetime in seconds (default 86400).
+    LLM_CACHE_DB_PATH       SQLite file for the shared tier (default: none).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.services.sqlite_db import connect_shared
+
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+DEFAULT_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+DB_PATH = os.getenv("LLM_CACHE_DB_PATH") or None
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Build a content-addressed key for a completion request.
+
+    Message content is normalized (whitespace runs collapsed, ends stripped)
+    so cosmetic differences in prompt formatting share one entry.
+
+    Args:
+        model: The model name.
+        messages: Chat messages in OpenAI format.
+        temperature: Optional sampling temperature.
+        max_tokens: Optional completion token limit.
+
+    Returns:
+        SHA-256 hex digest identifying the request.
+    """
+    normalized_messages = [
+        {
+            "role": message.get("role", ""),
+            "content": _WHITESPACE_PATTERN.sub(" ", message.get("content") or "").strip(),
+        }
+        for message in messages
+    ]
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": normalized_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier TTL cache for LLM responses.
+
+    Usage:
+        cache = LLMResponseCache(max_entries=512, db_path="llm_cache.db")
+        key = make_cache_key(model, messages)
+        text = cache.get(key)
+        if text is None:
+            text = ...  # call the LLM
+            cache.set(key, text)
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, default_ttl: float = DEFAULT_TTL, db_path: Optional[str] = DB_PATH):
+        """
+        Initialize the cache tiers.
+
+        Args:
+            max_entries: Maximum entries held in memory before LRU eviction.
+            default_ttl: Lifetime in seconds for entries stored without a TTL.
+            db_path: Optional SQLite file for the persistent shared tier.
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = connect_shared(
+                db_path,
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from `make_cache_key`.
+
+        Returns:
+            The cached response text, or None on a miss or expired entry.
+        """
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            value = self._get_disk(key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """Like `get`, but the SQLite lookup runs in a thread off the event loop."""
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            value = await asyncio.to_thread(self._get_disk, key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        """Look up the memory tier, dropping an expired entry."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self._counters["hits"] += 1
+            self._counters["memory_hits"] += 1
+            return value
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        """Look up the SQLite tier, promoting a live entry to memory and deleting an expired one."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= time.time():
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._remember(key, value, expires_at)
+            self._counters["hits"] += 1
+            self._counters["disk_hits"] += 1
+            return value
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self._counters["misses"] += 1
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key from `make_cache_key`.
+            value: The response text.
+            ttl: Optional lifetime in seconds; defaults to `default_ttl`.
+        """
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+        if self._db is not None:
+            self._set_disk(key, value, expires_at)
+
+    async def set_async(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Like `set`, but the SQLite write runs in a thread off the event loop."""
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._set_disk, key, value, expires_at)
+
+    def _set_disk(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        """Insert into the memory tier and evict least recently used entries."""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current memory tier size."""
+        with self._lock:
+            return dict(self._counters, memory_entries=len(self._memory))
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+
+
+# Singleton instance for convenience
+_cache_instance: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get or create the singleton LLMResponseCache, or None when caching is disabled."""
+    global _cache_instance
+    if not CACHE_ENABLED:
+        return None
+    if _cache_instance is None:
+        _cache_instance = LLMResponseCache()
+    return _cache_instance
@@ -0,0 +1,140 @@
+"""
+LLM Gateway Module
+
+This module holds the single async Groq client shared by every service. It
+owns the outbound HTTP connection pool (keep-alive, connect/read timeouts) and
+a concurrency cap on in-flight LLM requests, so outbound behaviour is tuned in
+one place. Completions are served from the LLM response cache when possible
+(see app.services.llm_cache), and identical requests that are already in
+flight are coalesced into one upstream call (see app.services.single_flight).
+
+Configuration (environment variables):
+    GROQ_API_KEY                Groq API key.
+    LLM_MAX_CONNECTIONS         Maximum pooled HTTP connections (default 20).
+    LLM_MAX_KEEPALIVE           Idle keep-alive connections to retain (default 10).
+    LLM_KEEPALIVE_EXPIRY        Seconds an idle connection is kept (default 30).
+    LLM_CONNECT_TIMEOUT         Connect timeout in seconds (default 5).
+    LLM_READ_TIMEOUT            Read timeout in seconds (default 60).
+    LLM_MAX_CONCURRENCY         Maximum concurrent LLM requests (default 16).
+    LLM_MAX_RETRIES             Retries on transient upstream errors (default 2).
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+from groq import AsyncGroq
+
+from app.services.llm_cache import get_llm_cache, make_cache_key
+from app.services.single_flight import SingleFlight
+
+# Load API key from .env
+load_dotenv()
+
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+# Shared client and concurrency cap, created on first use
+_client: Optional[AsyncGroq] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+_single_flight = SingleFlight()
+
+
+def get_llm_client() -> AsyncGroq:
+    """Get or create the shared AsyncGroq client with a tuned connection pool."""
+    global _client
+    if _client is None:
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=timeout,
+        )
+        _client = AsyncGroq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            http_client=http_client,
+            timeout=timeout,
+            max_retries=MAX_RETRIES,
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def chat_completion(
+    messages: List[Dict[str, str]],
+    model: str = DEFAULT_MODEL,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    cache_ttl: Optional[float] = None
+) -> str:
+    """
+    Send a chat completion request through the shared client.
+
+    Identical requests are answered from the response cache until their
+    entry expires, and concurrent identical requests share one upstream call
+    (an upstream error is raised to all of them). Failed requests are never
+    cached.
+
+    Args:
+        messages: Chat messages in OpenAI format.
+        model: The Groq model name.
+        temperature: Optional sampling temperature.
+        max_tokens: Optional completion token limit.
+        cache_ttl: Optional cache lifetime in seconds for this response.
+
+    Returns:
+        The content of the first completion choice.
+    """
+    cache = get_llm_cache()
+    cache_key = make_cache_key(model, messages, temperature, max_tokens)
+    if cache is not None:
+        cached = await cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
+    async def request_upstream() -> str:
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if max_tokens is not None:
+            options["max_tokens"] = max_tokens
+
+        async with _get_semaphore():
+            completion = await get_llm_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                **options
+            )
+
+        content = completion.choices[0].message.content
+        if cache is not None and content is not None:
+            await cache.set_async(cache_key, content, ttl=cache_ttl)
+        return content
+
+    return await _single_flight.do(cache_key, request_upstream)
+
+
+async def close_llm_client() -> None:
+    """Close the shared client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,177 @@
+"""
+LSH Index Module
+
+This module provides approximate nearest-neighbour search by cosine
+similarity with random-projection locality-sensitive hashing (SimHash),
+built on NumPy alone. Each row of a sparse matrix is projected onto random
+hyperplanes; the signs of `bits` projections form a bucket code, and each of
+`tables` independent codes is kept in a sorted table. Rows with a small angle
+between them usually share a bucket in at least one table, so a query only
+visits its own buckets instead of every row, and the caller scores the
+returned candidates exactly.
+
+The hyperplanes are +1/-1 entries derived by hashing (column, plane), so no
+projection matrix is stored and any column space works: the hashed feature
+space, or a corpus vocabulary whose column ids are stable.
+
+Recall and latency trade off through three knobs. More bits make buckets
+smaller (faster, lower recall); more tables give each row more chances to
+collide (higher recall, more memory and candidates); and probes, the one knob
+that can change per query, also visits the buckets one bit flip away from the
+query's own, least certain bits first (multi-probe LSH).
+
+Configuration (environment variables):
+    ANN_MODE                "exact" to score every career/JD (default) or
+                            "lsh" to score only the LSH candidates.
+    ANN_TABLES              Hash tables (default 8).
+    ANN_BITS                Bits per bucket code, at most 32 (default 12).
+    ANN_PROBES              Extra buckets probed per table, at most ANN_BITS
+                            (default 4).
+    ANN_MIN_ROWS            Smallest collection worth an LSH index; smaller
+                            ones are always scored exactly (default 10000).
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+ANN_MODES = ("exact", "lsh")
+ANN_MODE = os.getenv("ANN_MODE", "exact")
+TABLES = int(os.getenv("ANN_TABLES", "8"))
+BITS = int(os.getenv("ANN_BITS", "12"))
+PROBES = int(os.getenv("ANN_PROBES", "4"))
+MIN_ROWS = int(os.getenv("ANN_MIN_ROWS", "10000"))
+
+if ANN_MODE not in ANN_MODES:
+    raise ValueError(f"ANN_MODE must be one of {', '.join(ANN_MODES)}")
+
+# Rows projected at once while building, which bounds the size of the sign block
+_PROJECT_CHUNK_ROWS = 16384
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: a well-mixed 64-bit hash of each value (wraps on overflow)."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def plane_signs(columns: np.ndarray, planes: int, seed: int = 0) -> np.ndarray:
+    """
+    Hyperplane entries of the given columns.
+
+    Args:
+        columns: Column ids.
+        planes: Number of hyperplanes.
+        seed: Selects an independent family of hyperplanes.
+
+    Returns:
+        A len(columns) x planes float32 array of +1/-1 entries.
+    """
+    keys = (
+        columns.astype(np.uint64)[:, None] * np.uint64(planes)
+        + np.arange(planes, dtype=np.uint64)[None, :]
+        + (np.uint64(seed) << np.uint64(48))
+    )
+    return np.where(_mix64(keys) >> np.uint64(63), np.float32(1), np.float32(-1))
+
+
+class RandomProjectionLSH:
+    """
+    SimHash index over the rows of a sparse matrix.
+
+    Usage:
+        lsh = RandomProjectionLSH(hashed_rows, tables=8, bits=12)
+        rows = lsh.candidates(query_vector, probes=4)
+        scores = (hashed_rows[rows] @ query_vector.T).toarray().ravel()
+    """
+
+    __slots__ = ("tables", "bits", "seed", "row_count", "_powers", "_keys", "_order")
+
+    def __init__(self, matrix: csr_matrix, tables: int = TABLES, bits: int = BITS, seed: int = 0):
+        """
+        Hash every row into each table.
+
+        Args:
+            matrix: Rows to index; only their direction matters.
+            tables: Number of hash tables.
+            bits: Bits per bucket code, between 1 and 32.
+            seed: Selects the hyperplanes; queries must use the same index.
+        """
+        if not 1 <= bits <= 32:
+            raise ValueError("bits must be between 1 and 32")
+        if tables < 1:
+            raise ValueError("tables must be at least 1")
+        self.tables = tables
+        self.bits = bits
+        self.seed = seed
+        self.row_count = matrix.shape[0]
+        self._powers = np.left_shift(np.uint32(1), np.arange(bits, dtype=np.uint32))
+
+        codes = self._codes(self._project(matrix))
+        # One sorted key array per table; rows of a bucket are a contiguous run
+        self._order = np.argsort(codes, axis=0, kind="stable").T.astype(np.int32)
+        self._keys = np.take_along_axis(codes.T, self._order, axis=1)
+
+    def _project(self, matrix: csr_matrix) -> np.ndarray:
+        """Project rows onto every hyperplane, one (rows x tables*bits) block per chunk."""
+        matrix = csr_matrix(matrix)
+        planes = self.tables * self.bits
+        projections = np.empty((matrix.shape[0], planes), dtype=np.float32)
+        for start in range(0, matrix.shape[0], _PROJECT_CHUNK_ROWS):
+            block = matrix[start:start + _PROJECT_CHUNK_ROWS]
+            # Sign rows are only generated for the columns the block uses
+            columns, local = np.unique(block.indices, return_inverse=True)
+            compact = csr_matrix((block.data, local.ravel(), block.indptr), shape=(block.shape[0], len(columns)))
+            projections[start:start + block.shape[0]] = compact @ plane_signs(columns, planes, self.seed)
+        return projections
+
+    def _codes(self, projections: np.ndarray) -> np.ndarray:
+        """Pack projection signs into one uint32 bucket code per table (rows x tables)."""
+        signs = (projections.reshape(len(projections), self.tables, self.bits) > 0).astype(np.uint32)
+        return (signs * self._powers).sum(axis=2, dtype=np.uint32)
+
+    def candidates(self, vector: csr_matrix, probes: Optional[int] = None) -> np.ndarray:
+        """
+        Find the rows sharing a probed bucket with a query.
+
+        Args:
+            vector: A 1 x columns query in the indexed column space.
+            probes: Extra buckets per table, each one bit flip from the query's
+                own (defaults to ANN_PROBES, capped at `bits`).
+
+        Returns:
+            Sorted, unique row ids; empty for an all-zero query.
+        """
+        if vector.nnz == 0 or self.row_count == 0:
+            return np.zeros(0, dtype=np.int64)
+        probes = min(PROBES if probes is None else probes, self.bits)
+
+        projection = self._project(vector).reshape(self.tables, self.bits)
+        codes = self._codes(projection[None])[0]
+        # Flip the bits whose projections are closest to their hyperplane first
+        flipped = np.argsort(np.abs(projection), axis=1, kind="stable")[:, :probes]
+        probe_codes = np.concatenate([codes[:, None], codes[:, None] ^ self._powers[flipped]], axis=1)
+
+        runs = []
+        for table in range(self.tables):
+            keys = self._keys[table]
+            starts = np.searchsorted(keys, probe_codes[table], side="left")
+            ends = np.searchsorted(keys, probe_codes[table], side="right")
+            runs.extend(self._order[table, start:end] for start, end in zip(starts.tolist(), ends.tolist()) if end > start)
+        if not runs:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(runs)).astype(np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the bucket tables."""
+        return self._keys.nbytes + self._order.nbytes
+
+
+def lsh_enabled(row_count: int) -> bool:
+    """Whether a collection of `row_count` rows should get an LSH index under the current settings."""
+    return ANN_MODE == "lsh" and row_count >= MIN_ROWS
@@ -0,0 +1,182 @@
+"""
+Parse Cache Module
+
+This module caches resume parse results (ParsedResume objects) keyed by the
+SHA-256 of the uploaded bytes plus the parser version. The user journey sends
+the same file to /optimize, /skill-gap-analysis and /generate-study-materials,
+so only the first of those parses it. Memory is bounded by an approximate
+byte budget with LRU eviction. Streamed uploads (see app.services.upload_intake)
+are looked up by the hash computed while reading them, so a hit never loads
+the file.
+
+Configuration (environment variables):
+    PARSE_CACHE_MAX_BYTES   Approximate memory budget (default 64 MiB).
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.services.cpu_pool import get_cpu_pool, run_cpu_bound
+from app.services.resume_parser import ParsedResume, get_parser, parse_resume_file
+from app.services.single_flight import SingleFlight
+from app.services.upload_intake import ResumeUpload
+
+MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 2 ** 20)))
+
+
+def _estimate_size(parsed: ParsedResume) -> int:
+    """Approximate memory held by a parse result: the text plus its section spans."""
+    return sys.getsizeof(parsed) + sys.getsizeof(parsed.text)
+
+
+class ParseCache:
+    """
+    LRU cache of parse results with a memory budget.
+
+    Usage:
+        cache = ParseCache(max_bytes=32 * 2 ** 20)
+        resume_text, sections = await cache.get_or_parse(file_bytes, "resume.pdf")
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached results.
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[ParsedResume, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_hash(file_bytes: bytes) -> str:
+        """Return the SHA-256 hex digest of an upload."""
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    @staticmethod
+    def file_kind(filename: Optional[str] = None) -> str:
+        """Return how an upload is parsed: "pdf" for .pdf files, otherwise "text"."""
+        return "pdf" if filename and filename.lower().endswith(".pdf") else "text"
+
+    @staticmethod
+    def make_key(content_hash: str, filename: Optional[str] = None) -> str:
+        """
+        Build the cache key for an upload.
+
+        The file type matters because non-PDF uploads are decoded as text.
+
+        Args:
+            content_hash: SHA-256 hex digest of the resume file.
+            filename: Optional filename used to determine the file type.
+
+        Returns:
+            Key combining the content hash, file type and parser version.
+        """
+        return f"{content_hash}:{ParseCache.file_kind(filename)}:{get_parser().version}"
+
+    def get(self, key: str) -> Optional[Tuple[str, ParsedResume]]:
+        """Return a cached (resume_text, sections) pair, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            parsed, _ = entry
+            return parsed.text, parsed
+
+    def put(self, key: str, parsed: ParsedResume) -> None:
+        """Store a parse result and evict least recently used entries over budget."""
+        size = _estimate_size(parsed)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (parsed, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    async def get_or_parse(self, file_bytes: bytes, filename: Optional[str] = None) -> Tuple[str, ParsedResume]:
+        """
+        Return the parse result for an upload, parsing it in the CPU pool on a miss.
+
+        Concurrent misses for the same upload share one parse.
+
+        Args:
+            file_bytes: The raw bytes of the resume file.
+            filename: Optional filename used to determine the file type.
+
+        Returns:
+            A tuple of (resume_text, parsed_sections).
+        """
+        key = self.make_key(self.content_hash(file_bytes), filename)
+        return await self._get_or_parse(key, lambda: run_cpu_bound(parse_resume_file, file_bytes, filename))
+
+    async def get_or_parse_upload(self, upload: ResumeUpload) -> Tuple[str, ParsedResume]:
+        """
+        Return the parse result for a streamed upload, using its precomputed hash.
+
+        When CPU work runs inline the parser reads the spooled file directly;
+        worker processes need the bytes, so the file is read once for them.
+
+        Args:
+            upload: Upload accepted by `read_upload`.
+
+        Returns:
+            A tuple of (resume_text, parsed_sections).
+        """
+        def parse() -> Awaitable[Tuple[str, ParsedResume]]:
+            if get_cpu_pool().workers <= 0:
+                return run_cpu_bound(parse_resume_file, upload.open(), upload.filename)
+            return run_cpu_bound(parse_resume_file, upload.read_bytes(), upload.filename)
+
+        return await self._get_or_parse(self.make_key(upload.sha256, upload.filename), parse)
+
+    async def _get_or_parse(
+        self,
+        key: str,
+        run_parse: Callable[[], Awaitable[Tuple[str, ParsedResume]]]
+    ) -> Tuple[str, ParsedResume]:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        async def parse() -> Tuple[str, ParsedResume]:
+            resume_text, sections = await run_parse()
+            self.put(key, sections)
+            return resume_text, sections
+
+        # ParsedResume is read-only, so every caller can share the same object
+        return await self._single_flight.do(key, parse)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current usage."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
+
+
+# Singleton instance for convenience
+_cache_instance: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get or create the singleton ParseCache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ParseCache()
+    return _cache_instance
@@ -0,0 +1,217 @@
+"""
+PDF Extraction Engines Module
+
+This module defines the pluggable text extraction backends used by
+ResumeParser:
+
+    pdfium      Reads the PDF text layer with pypdfium2. Fast, no layout analysis.
+    pdfplumber  Full layout analysis with pdfplumber. Slower, more robust.
+    auto        Tries pdfium first and falls back to pdfplumber when the fast
+                output looks empty or garbled (default).
+
+Every engine extracts a page range and reports per-page timings, so any of
+them can be used for serial or page-parallel extraction. The auto engine
+judges the whole document at once: in page-parallel mode every range is
+extracted with pdfium and, if the joined result looks garbled, every range is
+extracted again with pdfplumber, so one document never mixes engines. Engines read either
+bytes or a seekable binary file object, so an uploaded file can be parsed
+without copying it into memory first.
+"""
+
+import io
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Type, Union
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+DEFAULT_ENGINE = os.getenv("PDF_ENGINE", "auto")
+
+# Heuristic thresholds for rejecting fast-engine output
+MIN_CHARS_PER_PAGE = 20
+MAX_SUSPICIOUS_RATIO = 0.05
+MIN_ALPHANUMERIC_RATIO = 0.5
+
+PageResults = List[Tuple[str, float]]
+PdfSource = Union[bytes, BinaryIO]
+
+
+def _open_source(source: PdfSource) -> BinaryIO:
+    """Return a file object over the PDF, rewound to its start."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+class PdfEngine(ABC):
+    """Base class for PDF text extraction backends."""
+
+    name = "base"
+
+    @abstractmethod
+    def page_count(self, source: PdfSource) -> int:
+        """Return the number of pages in the document."""
+
+    @abstractmethod
+    def extract_pages(self, source: PdfSource, start: int = 0, end: Optional[int] = None) -> PageResults:
+        """
+        Extract the text of pages [start, end).
+
+        Args:
+            source: The PDF as bytes or a seekable binary file.
+            start: First page index.
+            end: Page index to stop before, or None for the last page.
+
+        Returns:
+            List of (page_text, seconds) tuples in page order.
+        """
+
+    def extract_document(self, extract: Callable[["PdfEngine"], PageResults]) -> PageResults:
+        """
+        Run a whole-document extraction that is split up by the caller.
+
+        Page-parallel extraction calls this with a function that extracts
+        every page range with the given engine and joins the results, so an
+        engine that picks its backend per document (AutoEngine) decides once
+        for the whole document rather than once per range.
+
+        Args:
+            extract: Extracts the whole document with the engine passed to it.
+
+        Returns:
+            List of (page_text, seconds) tuples in page order.
+        """
+        return extract(self)
+
+
+class PdfplumberEngine(PdfEngine):
+    """Layout-aware extraction with pdfplumber."""
+
+    name = "pdfplumber"
+
+    def page_count(self, source: PdfSource) -> int:
+        with pdfplumber.open(_open_source(source)) as pdf:
+            return len(pdf.pages)
+
+    def extract_pages(self, source: PdfSource, start: int = 0, end: Optional[int] = None) -> PageResults:
+        results = []
+        with pdfplumber.open(_open_source(source)) as pdf:
+            for page in pdf.pages[start:end]:
+                started = time.perf_counter()
+                page_text = page.extract_text() or ""
+                results.append((page_text, time.perf_counter() - started))
+                # Drop cached layout objects before moving on
+                page.close()
+        return results
+
+
+class PdfiumEngine(PdfEngine):
+    """Fast text-layer extraction with pypdfium2."""
+
+    name = "pdfium"
+
+    def page_count(self, source: PdfSource) -> int:
+        pdf = pdfium.PdfDocument(_open_source(source))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, source: PdfSource, start: int = 0, end: Optional[int] = None) -> PageResults:
+        results = []
+        pdf = pdfium.PdfDocument(_open_source(source))
+        try:
+            for index in range(start, len(pdf) if end is None else min(end, len(pdf))):
+                started = time.perf_counter()
+                page = pdf[index]
+                text_page = page.get_textpage()
+                page_text = text_page.get_text_bounded().replace("\r\n", "\n").strip("\n")
+                text_page.close()
+                page.close()
+                results.append((page_text, time.perf_counter() - started))
+        finally:
+            pdf.close()
+        return results
+
+
+def looks_garbled(page_texts: List[str]) -> bool:
+    """
+    Check whether extracted text is empty or unreadable.
+
+    Text counts as garbled when it has too few characters per page, too many
+    replacement, control or private-use characters, or too few letters and
+    digits among its visible characters (typical of broken font encodings).
+
+    Args:
+        page_texts: Extracted text of each page.
+
+    Returns:
+        True if the text should not be trusted.
+    """
+    visible = [char for text in page_texts for char in text if not char.isspace()]
+    if len(visible) < MIN_CHARS_PER_PAGE * max(1, len(page_texts)):
+        return True
+
+    suspicious = sum(
+        1 for char in visible
+        if char == "�" or ord(char) < 32 or 0xE000 <= ord(char) <= 0xF8FF
+    )
+    if suspicious / len(visible) > MAX_SUSPICIOUS_RATIO:
+        return True
+
+    alphanumeric = sum(1 for char in visible if char.isalnum())
+    return alphanumeric / len(visible) < MIN_ALPHANUMERIC_RATIO
+
+
+class AutoEngine(PdfEngine):
+    """Fast engine first, layout engine as a fallback for empty or garbled output."""
+
+    name = "auto"
+
+    def __init__(self, fast: Optional[PdfEngine] = None, fallback: Optional[PdfEngine] = None):
+        self.fast = fast or PdfiumEngine()
+        self.fallback = fallback or PdfplumberEngine()
+
+    def page_count(self, source: PdfSource) -> int:
+        try:
+            return self.fast.page_count(source)
+        except Exception:
+            return self.fallback.page_count(source)
+
+    def extract_pages(self, source: PdfSource, start: int = 0, end: Optional[int] = None) -> PageResults:
+        return self.extract_document(lambda engine: engine.extract_pages(source, start, end))
+
+    def extract_document(self, extract: Callable[[PdfEngine], PageResults]) -> PageResults:
+        try:
+            results = extract(self.fast)
+            if not looks_garbled([page_text for page_text, _ in results]):
+                return results
+        except Exception:
+            pass
+        return extract(self.fallback)
+
+
+ENGINES: Dict[str, Type[PdfEngine]] = {
+    PdfiumEngine.name: PdfiumEngine,
+    PdfplumberEngine.name: PdfplumberEngine,
+    AutoEngine.name: AutoEngine,
+}
+
+
+def get_engine(name: str = DEFAULT_ENGINE) -> PdfEngine:
+    """
+    Create an extraction engine by name.
+
+    Args:
+        name: One of "auto", "pdfium" or "pdfplumber".
+
+    Returns:
+        The engine instance.
+    """
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown PDF engine '{name}', expected one of {sorted(ENGINES)}")
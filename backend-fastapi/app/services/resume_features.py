@@ -0,0 +1,384 @@
+"""
+Resume Features Module
+
+This module extracts every text feature the scoring code needs in a fixed,
+small number of passes over the resume: keyword tokens, bullet lines,
+action-verb bullets, metric and date mentions, blank-line ratio, skills and
+years of experience. ATS
+scoring, skill gap analysis and study material generation all read the same
+ResumeFeatures object instead of each re-scanning the text, and the result is
+memoized per resume so endpoints analyzing the same resume extract it once.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from scipy.sparse import csr_matrix
+
+from app.services.career_index import CareerIndex, get_career_index
+from app.services.hashed_features import hash_vector
+from app.services.skill_matcher import SkillMatcher
+
+# Expanded stop words including corporate fluff
+STOP_WORDS = {
+    # Common English stop words
+    'the', 'and', 'for', 'with', 'that', 'this', 'you', 'not', 'are', 'from', 'your',
+    'have', 'has', 'had', 'was', 'were', 'will', 'would', 'should', 'could', 'can',
+    'our', 'their', 'his', 'her', 'its', 'they', 'them', 'these', 'those', 'been',
+    'being', 'did', 'does', 'doing', 'done', 'who', 'what', 'when', 'where', 'why',
+    'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'some', 'such',
+    'than', 'too', 'very', 'just', 'own', 'into', 'over', 'also', 'only',
+    # Corporate/resume fluff words
+    'responsibilities', 'responsibility', 'candidate', 'candidates', 'team', 'teams',
+    'work', 'working', 'duties', 'duty', 'role', 'roles', 'position', 'positions',
+    'company', 'companies', 'organization', 'organizations', 'business', 'businesses',
+    'experience', 'experiences', 'required', 'requirements', 'requirement', 'preferred',
+    'ability', 'abilities', 'opportunity', 'opportunities', 'seeking', 'looking',
+    'environment', 'environments', 'including', 'include', 'includes', 'included',
+    'must', 'need', 'needs', 'needed', 'ensure', 'ensuring', 'provide', 'providing',
+    'support', 'supporting', 'assist', 'assisting', 'help', 'helping', 'maintain',
+    'maintaining', 'knowledge', 'understanding', 'strong', 'excellent', 'good',
+    'great', 'best', 'years', 'year', 'months', 'month', 'day', 'days'
+}
+
+# Common action verbs for resume content analysis
+ACTION_VERBS = {
+    'achieved', 'accelerated', 'accomplished', 'administered', 'advanced', 'analyzed',
+    'architected', 'assembled', 'assessed', 'attained', 'authored', 'automated',
+    'balanced', 'boosted', 'briefed', 'budgeted', 'built', 'calculated', 'captured',
+    'centralized', 'chaired', 'championed', 'clarified', 'coached', 'collaborated',
+    'communicated', 'compiled', 'completed', 'composed', 'computed', 'conceptualized',
+    'conducted', 'consolidated', 'constructed', 'consulted', 'contacted', 'contributed',
+    'controlled', 'converted', 'coordinated', 'created', 'customized', 'decreased',
+    'defined', 'delegated', 'delivered', 'deployed', 'designed', 'detected', 'determined',
+    'developed', 'devised', 'diagnosed', 'directed', 'discovered', 'dispatched',
+    'distributed', 'documented', 'doubled', 'drafted', 'drove', 'earned', 'edited',
+    'eliminated', 'enabled', 'enhanced', 'ensured', 'established', 'evaluated',
+    'examined', 'executed', 'expanded', 'expedited', 'facilitated', 'fixed', 'formulated',
+    'founded', 'gained', 'generated', 'guided', 'handled', 'headed', 'helped',
+    'identified', 'implemented', 'improved', 'increased', 'influenced', 'informed',
+    'initiated', 'inspected', 'installed', 'instituted', 'instructed', 'integrated',
+    'interpreted', 'interviewed', 'introduced', 'invented', 'investigated', 'launched',
+    'led', 'leveraged', 'maintained', 'managed', 'marketed', 'maximized', 'measured',
+    'mediated', 'modernized', 'modified', 'monitored', 'motivated', 'navigated',
+    'negotiated', 'operated', 'optimized', 'orchestrated', 'organized', 'originated',
+    'overhauled', 'oversaw', 'performed', 'persuaded', 'pioneered', 'planned',
+    'prepared', 'presented', 'processed', 'procured', 'produced', 'programmed',
+    'promoted', 'provided', 'publicized', 'published', 'purchased', 'recommended',
+    'reconciled', 'recorded', 'recruited', 'redesigned', 'reduced', 'reengineered',
+    'referred', 'reformed', 'reinvented', 'released', 'remodeled', 'repaired',
+    'replaced', 'reported', 'represented', 'researched', 'resolved', 'restored',
+    'restructured', 'retrieved', 'revamped', 'reviewed', 'revised', 'revitalized',
+    'saved', 'scheduled', 'screened', 'secured', 'selected', 'separated', 'served',
+    'serviced', 'set', 'settled', 'shaped', 'shared', 'showed', 'simplified',
+    'simulated', 'solved', 'sorted', 'spearheaded', 'specified', 'standardized',
+    'stimulated', 'streamlined', 'strengthened', 'structured', 'studied', 'submitted',
+    'summarized', 'supervised', 'supported', 'surpassed', 'surveyed', 'synthesized',
+    'systematized', 'tabulated', 'targeted', 'taught', 'tested', 'tracked',
+    'trained', 'transformed', 'translated', 'trimmed', 'tripled', 'troubleshot',
+    'tutored', 'unified', 'updated', 'upgraded', 'utilized', 'validated',
+    'valued', 'verified', 'visualized', 'wrote'
+}
+
+# Common adverbs that may precede action verbs
+COMMON_ADVERBS = {
+    'successfully', 'effectively', 'efficiently', 'directly', 'consistently',
+    'proactively', 'independently', 'collaboratively', 'strategically', 'actively',
+    'significantly', 'substantially', 'comprehensively', 'thoroughly', 'rapidly',
+    'quickly', 'personally', 'professionally', 'regularly', 'frequently'
+}
+
+
+# Tokens, keeping technical terms like C++, C#, Node.js, .NET
+TOKEN_PATTERN = re.compile(r'\b[A-Za-z][A-Za-z0-9+#]*(?:\.[A-Za-z0-9+#]+)*\b')
+SPECIAL_TERM_PATTERN = re.compile(r'\b(?:C\+\+|C#|\.NET|F#)\b', re.IGNORECASE)
+
+# Characters that start a bullet line
+BULLET_CHARS = frozenset('-•*✓►▪→')
+
+# Numeric mentions, all matched against the lowercased text. Each pattern is
+# counted like its own finditer() (non-overlapping with itself), but they may
+# overlap each other; e.g. "Jan 2020 - 2021" is a month date and a year range.
+NUMERIC_PATTERNS = {
+    # Quantified achievements
+    "metric": r'\b\d+%|\$[\d,]+|\d+\s*(?:percent|dollars|users|clients|people|customers|sales|revenue|growth|increase|decrease|reduction|projects?|teams?|members?)\b',
+    # Years of experience; the number is captured in "years_value"
+    "years": r'(?P<years_value>\d+)\+?\s*(?:years?|yrs?)',
+    # Numeric date styles
+    "slash_date": r'\b\d{2}/\d{2}/\d{4}\b',
+    "month_number_date": r'\b\d{4}-\d{2}\b',
+    "year_range": r'\b\d{4}\s*[-–]\s*(?:present|current|now|\d{4})\b',
+}
+DATE_PATTERN_NAMES = ("slash_date", "month_number_date", "year_range")
+
+# One scan for every numeric pattern, trying each in a capturing lookahead.
+# It stops only at "$" and at the first digit of a digit run: every pattern
+# that can start inside a run either fails there or was already matched from
+# the run's first digit.
+NUMERIC_SCANNER = re.compile(
+    r'(?:(?=\$)|(?<!\d)(?=\d))'
+    + "".join(f'(?=(?P<{name}>{pattern})|)' for name, pattern in NUMERIC_PATTERNS.items())
+)
+
+# Month-name dates ("Jan 2020") start with letters, so they get their own scan
+MONTH_DATE_PATTERN = re.compile(r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{4}\b')
+
+# Years of experience alone, for callers that need only the experience level
+YEARS_PATTERN = re.compile(NUMERIC_PATTERNS["years"])
+
+SENIOR_KEYWORDS = ('senior', 'lead', 'principal', 'architect')
+JUNIOR_KEYWORDS = ('junior', 'entry', 'intern', 'graduate')
+
+# Resumes whose features are memoized per process
+FEATURE_CACHE_SIZE = 64
+
+
+def extract_tokens(text: str) -> FrozenSet[str]:
+    """
+    Extract clean tokens from text, preserving technical terms like C++, Node.js.
+    
+    Args:
+        text: The input text to tokenize.
+        
+    Returns:
+        A set of lowercase tokens, without single characters and stop words.
+    """
+    all_tokens = {token.lower() for token in TOKEN_PATTERN.findall(text)}
+    # Standalone versions like "C++" or ".NET"; a substring check skips the scan
+    text_lower = text.lower()
+    if 'c++' in text_lower or 'c#' in text_lower or 'f#' in text_lower or '.net' in text_lower:
+        all_tokens.update(term.lower() for term in SPECIAL_TERM_PATTERN.findall(text))
+    return frozenset(t for t in all_tokens if len(t) > 1 and t not in STOP_WORDS)
+
+
+def _scan_numeric(text_lower: str) -> Dict[str, Any]:
+    """
+    Count every numeric pattern in one pass, as separate finditer() calls would.
+    
+    Returns:
+        Match count per pattern name, plus "max_years" (largest years-of-experience
+        number, or None).
+    """
+    counts: Dict[str, Any] = dict.fromkeys(NUMERIC_PATTERNS, 0)
+    # End of the last counted match per pattern; its next match must start there or later
+    next_start = dict.fromkeys(NUMERIC_PATTERNS, 0)
+    max_years = None
+    
+    for match in NUMERIC_SCANNER.finditer(text_lower):
+        position = match.start()
+        for name in NUMERIC_PATTERNS:
+            end = match.end(name)
+            if end == -1 or position < next_start[name]:
+                continue
+            counts[name] += 1
+            next_start[name] = end
+            if name == "years":
+                years = int(match.group("years_value"))
+                max_years = years if max_years is None else max(max_years, years)
+    
+    counts["max_years"] = max_years
+    return counts
+
+
+def _starts_with_action_verb(bullet_line: str) -> bool:
+    """Check whether a bullet starts with an action verb, allowing one leading adverb."""
+    words = bullet_line[1:].lower().split(None, 2)
+    if not words:
+        return False
+    
+    first_word = words[0].rstrip(',.:;')
+    if first_word in ACTION_VERBS:
+        return True
+    
+    # If first word is an adverb, check second word
+    return first_word in COMMON_ADVERBS and len(words) > 1 and words[1].rstrip(',.:;') in ACTION_VERBS
+
+
+class ResumeFeatures:
+    """
+    Text features of one resume, shared by every scoring function.
+    
+    Skills are matched, and the hashed vector built, on first access, so
+    scoring that never reads them does not pay for them.
+    """
+    
+    __slots__ = (
+        "tokens", "bullet_lines", "action_verb_bullets", "has_spaced_bullets",
+        "metric_count", "date_count", "line_count", "blank_line_count",
+        "years_of_experience", "experience_level", "_text", "_skill_matcher", "_skills", "_vector"
+    )
+    
+    def __init__(
+        self,
+        text: str,
+        skill_matcher: SkillMatcher,
+        tokens: FrozenSet[str],
+        bullet_lines: Tuple[str, ...],
+        action_verb_bullets: int,
+        has_spaced_bullets: bool,
+        metric_count: int,
+        date_count: int,
+        line_count: int,
+        blank_line_count: int,
+        years_of_experience: Optional[int],
+        experience_level: str
+    ):
+        self.tokens = tokens
+        self.bullet_lines = bullet_lines
+        self.action_verb_bullets = action_verb_bullets
+        self.has_spaced_bullets = has_spaced_bullets
+        self.metric_count = metric_count
+        self.date_count = date_count
+        self.line_count = line_count
+        self.blank_line_count = blank_line_count
+        self.years_of_experience = years_of_experience
+        self.experience_level = experience_level
+        self._text = text
+        self._skill_matcher = skill_matcher
+        self._skills: Optional[List[str]] = None
+        self._vector: Optional[csr_matrix] = None
+    
+    @property
+    def skills(self) -> List[str]:
+        """Known skills found in the resume, in order of first appearance."""
+        if self._skills is None:
+            self._skills = self._skill_matcher.find_skills(self._text)
+        return self._skills
+    
+    @property
+    def vector(self) -> csr_matrix:
+        """Stateless hashed vector of the resume text (see hashed_features)."""
+        if self._vector is None:
+            self._vector = hash_vector(self._text)
+        return self._vector
+    
+    @property
+    def blank_ratio(self) -> float:
+        """Share of blank lines among all lines."""
+        return self.blank_line_count / self.line_count if self.line_count > 0 else 0
+
+
+def extract_resume_features(resume_text: str, index: Optional[CareerIndex] = None) -> ResumeFeatures:
+    """
+    Extract all scoring features from resume text.
+    
+    Lines are walked once for bullets, action verbs and blank lines. Metrics,
+    numeric dates and years share one regex scan; tokens, month-name dates and
+    skills (via the career index's matcher, on first access) take one pass each.
+    
+    Args:
+        resume_text: The extracted resume text.
+        index: Optional career index for skill matching; defaults to the active one.
+        
+    Returns:
+        The resume's features.
+    """
+    index = index or get_career_index()
+    
+    bullet_lines = []
+    action_verb_bullets = 0
+    has_spaced_bullets = False
+    blank_line_count = 0
+    lines = resume_text.splitlines()
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            blank_line_count += 1
+            continue
+        if stripped[0] not in BULLET_CHARS:
+            continue
+        bullet_lines.append(stripped)
+        if len(stripped) > 1 and stripped[1].isspace():
+            has_spaced_bullets = True
+        if _starts_with_action_verb(stripped):
+            action_verb_bullets += 1
+    
+    text_lower = resume_text.lower()
+    counts = _scan_numeric(text_lower)
+    metric_count = counts["metric"]
+    date_count = sum(counts[name] for name in DATE_PATTERN_NAMES)
+    date_count += sum(1 for _ in MONTH_DATE_PATTERN.finditer(text_lower))
+    years_of_experience = counts["max_years"]
+    experience_level = _classify_experience(years_of_experience, text_lower)
+    
+    return ResumeFeatures(
+        text=resume_text,
+        skill_matcher=index.skill_matcher,
+        tokens=extract_tokens(resume_text),
+        bullet_lines=tuple(bullet_lines),
+        action_verb_bullets=action_verb_bullets,
+        has_spaced_bullets=has_spaced_bullets,
+        metric_count=metric_count,
+        date_count=date_count,
+        line_count=len(lines),
+        blank_line_count=blank_line_count,
+        years_of_experience=years_of_experience,
+        experience_level=experience_level
+    )
+
+
+# Per-process memo of recently extracted resumes, keyed by (taxonomy version, text)
+_feature_cache: "OrderedDict[Tuple[str, str], ResumeFeatures]" = OrderedDict()
+_feature_cache_lock = threading.Lock()
+
+
+def _classify_experience(years_of_experience: Optional[int], text_lower: str) -> str:
+    """Map the largest years-of-experience figure, or seniority keywords, to a level."""
+    if years_of_experience is not None:
+        if years_of_experience >= 5:
+            return "Senior"
+        if years_of_experience >= 2:
+            return "Mid-Level"
+        return "Junior"
+    if any(word in text_lower for word in SENIOR_KEYWORDS):
+        return "Senior"
+    if any(word in text_lower for word in JUNIOR_KEYWORDS):
+        return "Junior"
+    return "Mid-Level"
+
+
+def estimate_experience_level(resume_text: str) -> str:
+    """
+    Determine the experience level without extracting the other features.
+    
+    One regex scan plus keyword checks, cheap enough to run on the event
+    loop; the result equals ResumeFeatures.experience_level.
+    
+    Args:
+        resume_text: The resume text.
+        
+    Returns:
+        "Junior", "Mid-Level" or "Senior".
+    """
+    text_lower = resume_text.lower()
+    years = [int(match.group("years_value")) for match in YEARS_PATTERN.finditer(text_lower)]
+    return _classify_experience(max(years, default=None), text_lower)
+
+
+def get_resume_features(resume_text: str, index: Optional[CareerIndex] = None) -> ResumeFeatures:
+    """
+    Get the features of a resume, extracting them only on first use.
+    
+    Args:
+        resume_text: The extracted resume text.
+        index: Optional career index for skill matching; defaults to the active one.
+        
+    Returns:
+        The resume's features.
+    """
+    index = index or get_career_index()
+    key = (index.version, resume_text)
+    with _feature_cache_lock:
+        features = _feature_cache.get(key)
+        if features is not None:
+            _feature_cache.move_to_end(key)
+            return features
+    
+    features = extract_resume_features(resume_text, index)
+    with _feature_cache_lock:
+        _feature_cache[key] = features
+        while len(_feature_cache) > FEATURE_CACHE_SIZE:
+            _feature_cache.popitem(last=False)
+    return features
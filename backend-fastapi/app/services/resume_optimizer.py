@@ -5,23 +5,19 @@ This module provides functionality to analyze resumes against job descriptions,
 identifying gaps and providing alignment suggestions using LLM.
 """
 
-import os
-from groq import Groq
-from dotenv import load_dotenv
+import asyncio
 from app.services.ats_checker import get_ats_score
+from app.services.jd_analysis import JobDescriptionInput, as_job_description_analysis
+from app.services.llm_gateway import chat_completion
 
-# Load API key from .env
-load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-
-def create_prompt(sections: dict, job_description: str) -> str:
+def create_prompt(sections: dict, job_description: JobDescriptionInput) -> str:
     """
     Create a prompt for the LLM to analyze resume gaps.
     
     Args:
         sections: Dictionary of parsed resume sections.
-        job_description: The target job description.
+        job_description: The target job description or its cached analysis.
         
     Returns:
         Formatted prompt string.
@@ -34,7 +30,7 @@ def create_prompt(sections: dict, job_description: str) -> str:
         f"Experience:\n{experience}\n\n"
         f"Skills:\n{skills}\n\n"
         f"Projects:\n{projects}\n\n"
-        f"Job description:\n{job_description.strip()}\n\n"
+        f"Job description:\n{as_job_description_analysis(job_description).text}\n\n"
         "Return the following:\n"
         "1. What gaps are there in the resume compared to the job description? \n"
         "Don't overthink and just return the gaps you find.\n"
@@ -42,7 +38,7 @@ def create_prompt(sections: dict, job_description: str) -> str:
     )
 
 
-def groq_response(prompt: str) -> dict:
+async def groq_response(prompt: str) -> dict:
     """
     Get optimization suggestions from Groq LLM.
     
@@ -53,7 +49,7 @@ def groq_response(prompt: str) -> dict:
         Dictionary containing gaps, suggestions, and the original prompt.
     """
     try:
-        completion = client.chat.completions.create(
+        text = await chat_completion(
             model="llama-3.1-8b-instant",
             messages=[
                 {"role": "system", "content": "You are a helpful career assistant."},
@@ -61,8 +57,6 @@ def groq_response(prompt: str) -> dict:
             ],
         )
 
-        text = completion.choices[0].message.content
-
         # Extract structured info
         gaps, suggestions = [], []
         for line in text.splitlines():
@@ -81,29 +75,45 @@ def groq_response(prompt: str) -> dict:
         return {"error": str(e), "prompt": prompt}
 
 
-def optimize_resume_logic(resume_text: str, resume_sections: dict, job_description: str) -> dict:
+async def optimize_resume_logic(
+    resume_text: str,
+    resume_sections: dict,
+    job_description: JobDescriptionInput,
+    include_llm: bool = True
+) -> dict:
     """
     Main function to optimize a resume against a job description.
     
     This function analyzes the resume content, identifies gaps compared to
-    the job description, and provides ATS scoring.
+    the job description, and provides ATS scoring. The optimization and ATS
+    feedback LLM calls are issued concurrently.
     
     Args:
         resume_text: The extracted resume text.
         resume_sections: The parsed resume sections dictionary.
-        job_description: The target job description.
+        job_description: The target job description or its cached analysis.
+        include_llm: Whether to make the LLM calls; without them only the
+            deterministic ATS scores are computed, and the gaps, alignment
+            suggestions and AI analysis are None.
         
     Returns:
         Dictionary containing gaps, suggestions, ATS score, and analysis.
     """
+    # Analyze the JD once (cached by content) for the prompt and ATS scoring
+    job_description = as_job_description_analysis(job_description)
+    
     # Create prompt for LLM
     prompt = create_prompt(resume_sections, job_description)
     
-    # Get optimization suggestions from LLM
-    result = groq_response(prompt)
-    
-    # Get ATS score and analysis
-    ats_analysis = get_ats_score(resume_text, resume_sections, job_description)
+    if include_llm:
+        # Get optimization suggestions from LLM and ATS score and analysis concurrently
+        result, ats_analysis = await asyncio.gather(
+            groq_response(prompt),
+            get_ats_score(resume_text, resume_sections, job_description)
+        )
+    else:
+        result = {"gaps": None, "alignment_suggestions": None, "prompt": prompt}
+        ats_analysis = await get_ats_score(resume_text, resume_sections, job_description, include_llm=False)
     
     # Add ATS score to result
     result["ats_score"] = ats_analysis["overall_score"]
@@ -4,12 +4,172 @@ Centralized Resume Parser Module
 This module provides a unified interface for extracting text from resumes
 and parsing them into structured sections. It handles PDF text extraction
 and section segmentation with improved detection logic.
+
+Text is extracted by a pluggable engine (see app.services.pdf_engines). Long
+PDFs (PDF_PARALLEL_MIN_PAGES pages or more, default 10) are split into page
+ranges that are extracted by PDF_PAGE_WORKERS processes (default 1, i.e.
+serial) and joined back in page order. Files may be passed as bytes or as a
+seekable binary file (e.g. an upload's spooled file), which the engine reads
+directly. PDFs over the page limit are rejected with PageLimitExceeded before
+any text is extracted; the API maps it to 413.
+
+Parsed sections are returned as a ParsedResume, which keeps the resume text
+once plus the (start, end) span of every section line, and joins a section's
+text only when it is read.
+
+Configuration (environment variables):
+    PDF_PAGE_WORKERS        Processes for page-parallel extraction (default 1).
+    PDF_PARALLEL_MIN_PAGES  Smallest page count extracted in parallel (default 10).
+    MAX_PDF_PAGES           Largest accepted PDF page count (default 50).
 """
 
 import re
-import pdfplumber
-import io
-from typing import Dict, List, Optional
+import os
+import multiprocessing
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from app.services.pdf_engines import PdfEngine, PdfSource, get_engine
+
+# Bump whenever extraction or section parsing output changes, so cached parse
+# results from older code are not reused
+PARSER_VERSION = "3"
+
+PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", "1"))
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "10"))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+
+# Opening parenthesis of a capturing group
+_CAPTURING_GROUP = re.compile(r"\((?!\?)")
+# Key marking the end of a keyword in the header keyword trie
+_TRIE_END = ""
+# Delimiters between skills, and a bullet at the start of one
+_SKILL_DELIMITERS = re.compile(r'[,\n;•|·]+')
+_SKILL_BULLET = re.compile(r'^[-*✓►▪→]\s*')
+
+SECTION_NAMES = (
+    "contact", "summary", "experience", "education", "skills", "projects",
+    "certifications", "publications", "awards", "other"
+)
+_SECTION_INDEX = {section: index for index, section in enumerate(SECTION_NAMES)}
+
+
+class PageLimitExceeded(ValueError):
+    """Raised when a PDF has more pages than the parser accepts."""
+
+
+class PdfPages(NamedTuple):
+    """Text of each PDF page in order, with per-page extraction time in seconds."""
+    pages: List[str]
+    page_seconds: List[float]
+
+    @property
+    def text(self) -> str:
+        """All non-empty pages joined in order, one trailing newline per page."""
+        return "".join(f"{page}\n" for page in self.pages if page)
+
+
+class ParsedResume(Mapping):
+    """
+    Resume sections stored as spans over the resume text.
+    
+    Behaves like a read-only dict of section name to section text, so code
+    written for the dict returned by earlier versions keeps working. The text
+    is held once; each section line is a (section, start, end) triple in a
+    compact integer array, and section text is joined on access.
+    
+    Usage:
+        parsed = parser.parse_sections(text)
+        skills = parsed["skills"]
+        sections_dict = parsed.to_dict()
+    """
+    
+    __slots__ = ("text", "_spans")
+    
+    def __init__(self, text: str, spans: Iterable[int] = ()):
+        """
+        Args:
+            text: The full resume text.
+            spans: Flat sequence of (section_index, start, end) triples in
+                document order, where section_index is a position in SECTION_NAMES.
+        """
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "_spans", spans if isinstance(spans, array) else array("I", spans))
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Parse results are shared between requests through the caches
+        raise AttributeError("ParsedResume is read-only")
+    
+    def __reduce__(self):
+        return ParsedResume, (self.text, self._spans)
+    
+    def __sizeof__(self) -> int:
+        # Include the span array, which only this object references
+        return object.__sizeof__(self) + self._spans.__sizeof__()
+    
+    def __getitem__(self, section: str) -> str:
+        index = _SECTION_INDEX[section]
+        text = self.text
+        spans = self._spans
+        return "\n".join(
+            text[spans[i + 1]:spans[i + 2]] for i in range(0, len(spans), 3) if spans[i] == index
+        )
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(SECTION_NAMES)
+    
+    def __len__(self) -> int:
+        return len(SECTION_NAMES)
+    
+    def __repr__(self) -> str:
+        return f"ParsedResume({self.to_dict()!r})"
+    
+    @property
+    def spans(self) -> List[int]:
+        """The flat (section_index, start, end) triples, e.g. for serialization."""
+        return self._spans.tolist()
+    
+    def section_spans(self, section: str) -> List[Tuple[int, int]]:
+        """Return the (start, end) span of each line of a section."""
+        index = _SECTION_INDEX[section]
+        spans = self._spans
+        return [(spans[i + 1], spans[i + 2]) for i in range(0, len(spans), 3) if spans[i] == index]
+    
+    def section_length(self, section: str) -> int:
+        """Return the length of a section's text without building it."""
+        line_lengths = [end - start for start, end in self.section_spans(section)]
+        return sum(line_lengths) + max(0, len(line_lengths) - 1)
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Materialize every section in one pass over the spans."""
+        section_lines: List[List[str]] = [[] for _ in SECTION_NAMES]
+        text = self.text
+        spans = self._spans
+        for i in range(0, len(spans), 3):
+            section_lines[spans[i]].append(text[spans[i + 1]:spans[i + 2]])
+        return {section: "\n".join(lines) for section, lines in zip(SECTION_NAMES, section_lines)}
+
+
+def _extract_page_range(engine: PdfEngine, file_bytes: bytes, start: int, end: int) -> List[Tuple[str, float]]:
+    """Extract pages [start, end) of a PDF; runs in a page worker process."""
+    return engine.extract_pages(file_bytes, start, end)
+
+
+# Page worker pool, shared by all parsers in this process and created on first use
+_page_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_page_executor(workers: int) -> ProcessPoolExecutor:
+    global _page_executor
+    if _page_executor is None:
+        from app.services.cpu_pool import START_METHOD
+        _page_executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(START_METHOD),
+        )
+    return _page_executor
 
 
 class ResumeParser:
@@ -20,6 +180,8 @@ class ResumeParser:
         parser = ResumeParser()
         text = parser.extract_text_from_pdf(file_bytes)
         sections = parser.parse_sections(text)
+        # or pick the extraction engine explicitly:
+        parser = ResumeParser(engine="pdfplumber")
         # or use the convenience method:
         text, sections = parser.parse_resume(file_bytes, filename="resume.pdf")
     """
@@ -83,43 +245,156 @@ class ResumeParser:
         ]
     }
     
-    def __init__(self):
-        """Initialize the parser with compiled regex patterns."""
-        self._compiled_patterns = {}
-        for section, patterns in self.SECTION_PATTERNS.items():
-            combined_pattern = "|".join(f"({p})" for p in patterns)
-            self._compiled_patterns[section] = re.compile(
-                f"^\\s*({combined_pattern})\\s*:?\\s*$",
-                re.IGNORECASE
-            )
+    # Fallback header keywords, matched as line prefixes in this order
+    HEADER_KEYWORDS = {
+        "experience": ["experience", "work history", "employment", "professional background"],
+        "education": ["education", "academic", "degree", "university", "college"],
+        "skills": ["skills", "technical skills", "core skills", "competencies", "technologies"],
+        "projects": ["projects", "portfolio", "notable work"],
+        "certifications": ["certifications", "licenses", "credentials"],
+        "summary": ["summary", "objective", "profile", "about me", "overview"],
+        "contact": ["contact", "personal info"],
+        "publications": ["publications", "papers", "research"],
+        "awards": ["awards", "honors", "achievements"]
+    }
+    
+    SECTION_NAMES = SECTION_NAMES
     
-    def extract_text_from_pdf(self, file_bytes: bytes) -> str:
+    def __init__(
+        self,
+        engine: Union[str, PdfEngine, None] = None,
+        page_workers: int = PAGE_WORKERS,
+        parallel_min_pages: int = PARALLEL_MIN_PAGES,
+        max_pages: Optional[int] = MAX_PDF_PAGES
+    ):
         """
-        Extract text content from a PDF file.
+        Initialize the parser with compiled regex patterns.
+        
+        Args:
+            engine: PDF extraction engine or its name ("auto", "pdfium",
+                "pdfplumber"); defaults to the PDF_ENGINE setting.
+            page_workers: Processes used to extract long PDFs page-parallel;
+                1 extracts serially.
+            parallel_min_pages: Minimum page count for parallel extraction.
+            max_pages: Largest accepted page count, or None for no limit.
+        """
+        if engine is None:
+            engine = get_engine()
+        elif isinstance(engine, str):
+            engine = get_engine(engine)
+        self.engine = engine
+        self.version = f"{PARSER_VERSION}:{engine.name}"
+        self.page_workers = page_workers
+        self.parallel_min_pages = parallel_min_pages
+        self.max_pages = max_pages
+        self._header_pattern = self._compile_header_pattern()
+        self._keyword_trie = self._build_keyword_trie()
+    
+    @classmethod
+    def _compile_header_pattern(cls) -> "re.Pattern":
+        """
+        Combine every section pattern into one regex with a named group per section.
+        
+        Alternatives are tried in SECTION_PATTERNS order, so the first section
+        whose patterns match the whole line wins, as with one regex per section.
+        """
+        alternatives = []
+        for section, patterns in cls.SECTION_PATTERNS.items():
+            # Inner groups become non-capturing so the section group is the last one closed
+            combined_pattern = "|".join(_CAPTURING_GROUP.sub("(?:", p) for p in patterns)
+            alternatives.append(f"(?P<{section}>{combined_pattern})")
+        return re.compile(f"^\\s*(?:{'|'.join(alternatives)})\\s*:?\\s*$", re.IGNORECASE)
+    
+    @classmethod
+    def _build_keyword_trie(cls) -> Dict[str, Any]:
+        """
+        Build a character trie of the fallback keywords.
+        
+        Terminal nodes store (priority, section) under the _TRIE_END key, where
+        priority is the section's position in HEADER_KEYWORDS.
+        """
+        trie: Dict[str, Any] = {}
+        for priority, (section, keywords) in enumerate(cls.HEADER_KEYWORDS.items()):
+            for keyword in keywords:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                if _TRIE_END not in node or node[_TRIE_END][0] > priority:
+                    node[_TRIE_END] = (priority, section)
+        return trie
+    
+    def extract_pages_from_pdf(self, source: PdfSource) -> PdfPages:
+        """
+        Extract the text of each page of a PDF file, with per-page timing.
+        
+        Documents with at least `parallel_min_pages` pages are split into
+        contiguous page ranges extracted by `page_workers` processes.
         
         Args:
-            file_bytes: The raw bytes of the PDF file.
+            source: The PDF as bytes or a seekable binary file.
             
         Returns:
-            The extracted text as a string.
+            PdfPages with page texts in document order.
+            
+        Raises:
+            PageLimitExceeded: If the PDF has more than `max_pages` pages.
         """
-        text = ""
         try:
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            page_count = None
+            if self.max_pages is not None or self.page_workers > 1:
+                page_count = self.engine.page_count(source)
+                if self.max_pages is not None and page_count > self.max_pages:
+                    raise PageLimitExceeded(
+                        f"Resume has {page_count} pages, more than the {self.max_pages} page limit"
+                    )
+            
+            if self.page_workers <= 1 or page_count < self.parallel_min_pages:
+                results = self.engine.extract_pages(source)
+                return PdfPages([r[0] for r in results], [r[1] for r in results])
+            
+            # Page workers need the bytes themselves, so read a file source once
+            if not isinstance(source, bytes):
+                source.seek(0)
+                source = source.read()
+            
+            # Split into one contiguous range per worker and keep page order
+            chunk_count = min(self.page_workers, page_count)
+            bounds = [page_count * i // chunk_count for i in range(chunk_count + 1)]
+            executor = _get_page_executor(self.page_workers)
+            
+            def extract_ranges(engine: PdfEngine) -> List[Tuple[str, float]]:
+                futures = [
+                    executor.submit(_extract_page_range, engine, source, bounds[i], bounds[i + 1])
+                    for i in range(chunk_count)
+                ]
+                return [result for future in futures for result in future.result()]
+            
+            # The engine sees the joined pages, so it chooses a backend once per document
+            results = self.engine.extract_document(extract_ranges)
+            return PdfPages([r[0] for r in results], [r[1] for r in results])
+        except PageLimitExceeded:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
-        return text
     
-    def extract_text(self, file_bytes: bytes, filename: Optional[str] = None) -> str:
+    def extract_text_from_pdf(self, source: PdfSource) -> str:
+        """
+        Extract text content from a PDF file.
+        
+        Args:
+            source: The PDF as bytes or a seekable binary file.
+            
+        Returns:
+            The extracted text as a string.
+        """
+        return self.extract_pages_from_pdf(source).text
+    
+    def extract_text(self, source: PdfSource, filename: Optional[str] = None) -> str:
         """
-        Extract text from file bytes, auto-detecting format based on filename.
+        Extract text from a file, auto-detecting format based on filename.
         
         Args:
-            file_bytes: The raw bytes of the file.
+            source: The file as bytes or a seekable binary file.
             filename: Optional filename to determine file type.
             
         Returns:
@@ -127,7 +402,13 @@ class ResumeParser:
         """
         # Check if it's a PDF
         if filename and filename.lower().endswith('.pdf'):
-            return self.extract_text_from_pdf(file_bytes)
+            return self.extract_text_from_pdf(source)
+        
+        if isinstance(source, bytes):
+            file_bytes = source
+        else:
+            source.seek(0)
+            file_bytes = source.read()
         
         # Try to decode as text
         try:
@@ -148,40 +429,32 @@ class ResumeParser:
         Returns:
             The section name if identified, None otherwise.
         """
-        cleaned_line = line.strip()
-        
+        return self._classify_stripped_line(line.strip())
+    
+    def _classify_stripped_line(self, cleaned_line: str) -> Optional[str]:
+        """Classify an already stripped line with one regex match and one trie walk."""
         # Skip empty lines or very long lines (not headers)
         if not cleaned_line or len(cleaned_line) > 50:
             return None
         
-        # Check against compiled patterns
-        for section, pattern in self._compiled_patterns.items():
-            if pattern.match(cleaned_line):
-                return section
-        
-        # Fallback: check for common header keywords using startswith
-        line_lower = cleaned_line.lower()
+        match = self._header_pattern.match(cleaned_line)
+        if match:
+            return match.lastgroup
         
-        header_keywords = {
-            "experience": ["experience", "work history", "employment", "professional background"],
-            "education": ["education", "academic", "degree", "university", "college"],
-            "skills": ["skills", "technical skills", "core skills", "competencies", "technologies"],
-            "projects": ["projects", "portfolio", "notable work"],
-            "certifications": ["certifications", "licenses", "credentials"],
-            "summary": ["summary", "objective", "profile", "about me", "overview"],
-            "contact": ["contact", "personal info"],
-            "publications": ["publications", "papers", "research"],
-            "awards": ["awards", "honors", "achievements"]
-        }
+        # Fallback: the highest-priority header keyword that prefixes the line
+        best = None
+        node = self._keyword_trie
+        for char in cleaned_line.lower():
+            node = node.get(char)
+            if node is None:
+                break
+            terminal = node.get(_TRIE_END)
+            if terminal is not None and (best is None or terminal < best):
+                best = terminal
         
-        for section, keywords in header_keywords.items():
-            for keyword in keywords:
-                if line_lower.startswith(keyword):
-                    return section
-        
-        return None
+        return best[1] if best else None
     
-    def parse_sections(self, resume_text: str) -> Dict[str, str]:
+    def parse_sections(self, resume_text: str) -> ParsedResume:
         """
         Parse resume text into structured sections.
         
@@ -189,42 +462,33 @@ class ResumeParser:
             resume_text: The full resume text.
             
         Returns:
-            A dictionary mapping section names to their content.
+            A ParsedResume mapping section names to their content.
         """
-        sections = {
-            "contact": "",
-            "summary": "",
-            "experience": "",
-            "education": "",
-            "skills": "",
-            "projects": "",
-            "certifications": "",
-            "publications": "",
-            "awards": "",
-            "other": ""
-        }
-        
-        current_section = "other"
-        lines = resume_text.splitlines()
+        # Record the span of each stripped content line instead of copying it
+        spans = array("I")
+        current_index = _SECTION_INDEX["other"]
+        classify = self._classify_stripped_line
         
-        for line in lines:
+        position = 0
+        for line in resume_text.splitlines(keepends=True):
+            line_start = position
+            position += len(line)
+            cleaned_line = line.strip()
+            if not cleaned_line:
+                continue
+            
             # Try to identify if this line is a section header
-            identified_section = self._identify_section(line)
+            identified_section = classify(cleaned_line)
             
             if identified_section:
-                current_section = identified_section
+                current_index = _SECTION_INDEX[identified_section]
                 # Don't add the header line itself to content
                 continue
             
-            # Add non-empty lines to the current section
-            if line.strip():
-                sections[current_section] += line.strip() + "\n"
-        
-        # Clean up sections - strip trailing whitespace
-        for section in sections:
-            sections[section] = sections[section].strip()
+            start = line_start + line.index(cleaned_line[0])
+            spans.extend((current_index, start, start + len(cleaned_line)))
         
-        return sections
+        return ParsedResume(resume_text, spans)
     
     def parse_skills_list(self, skills_text: str) -> List[str]:
         """
@@ -240,31 +504,31 @@ class ResumeParser:
             return []
         
         # Split on common delimiters
-        skills_list = re.split(r'[,\n;•|·]+', skills_text)
+        skills_list = _SKILL_DELIMITERS.split(skills_text)
         
         # Clean up each skill
         cleaned_skills = []
         for skill in skills_list:
             skill = skill.strip()
             # Remove bullet points, dashes at start
-            skill = re.sub(r'^[-*✓►▪→]\s*', '', skill).strip()
+            skill = _SKILL_BULLET.sub('', skill).strip()
             if skill and len(skill) > 1:
                 cleaned_skills.append(skill)
         
         return cleaned_skills
     
-    def parse_resume(self, file_bytes: bytes, filename: Optional[str] = None) -> tuple:
+    def parse_resume(self, source: PdfSource, filename: Optional[str] = None) -> Tuple[str, ParsedResume]:
         """
         Convenience method to extract text and parse sections in one call.
         
         Args:
-            file_bytes: The raw bytes of the resume file.
+            source: The resume file as bytes or a seekable binary file.
             filename: Optional filename to determine file type.
             
         Returns:
-            A tuple of (resume_text, sections_dict).
+            A tuple of (resume_text, parsed_sections).
         """
-        resume_text = self.extract_text(file_bytes, filename)
+        resume_text = self.extract_text(source, filename)
         sections = self.parse_sections(resume_text)
         return resume_text, sections
 
@@ -279,3 +543,14 @@ def get_parser() -> ResumeParser:
     if _parser_instance is None:
         _parser_instance = ResumeParser()
     return _parser_instance
+
+
+def parse_resume_file(source: PdfSource, filename: Optional[str] = None) -> Tuple[str, ParsedResume]:
+    """
+    Extract text and sections with the singleton parser.
+    
+    Module-level so it can be submitted to the CPU pool (with bytes, as file
+    objects cannot be sent to worker processes).
+    """
+    return get_parser().parse_resume(source, filename)
+
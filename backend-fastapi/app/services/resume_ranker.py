@@ -0,0 +1,292 @@
+"""
+Resume Ranker Module
+
+This module scores a batch of resumes against one job description for
+recruiter mode. Per-resume text features are extracted in chunks in the CPU
+pool; the ATS components are then computed for the whole batch at once.
+Keyword matches come from a sparse resume x token incidence matrix over the
+JD's tokens, and structure, content and formatting scores are vectorized NumPy
+expressions over per-resume feature columns. Each resume gets exactly the
+scores calculate_ats_scores would give it.
+
+Rankings are memoized by JD and resume content, so paging through the
+results of one batch ranks it once.
+
+Configuration (environment variables):
+    RANK_MAX_RESUMES    Largest accepted batch (default 5000). /rank accepts
+                        at most 1000 of them as uploaded files; the rest
+                        must be sent as resume handles.
+    RANK_CHUNK_SIZE     Resumes per CPU pool task (default 250).
+    RANK_CACHE_SIZE     Rankings kept for pagination (default 32).
+    RANK_MAX_PAGE_SIZE  Largest page of results (default 500).
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from app.services.cpu_pool import get_cpu_pool, run_cpu_bound
+from app.services.jd_analysis import JobDescriptionInput, as_job_description_analysis
+from app.services.resume_features import extract_resume_features
+from app.services.resume_parser import ParsedResume, get_parser
+
+MAX_RESUMES = int(os.getenv("RANK_MAX_RESUMES", "5000"))
+CHUNK_SIZE = int(os.getenv("RANK_CHUNK_SIZE", "250"))
+RANK_CACHE_SIZE = int(os.getenv("RANK_CACHE_SIZE", "32"))
+MAX_PAGE_SIZE = int(os.getenv("RANK_MAX_PAGE_SIZE", "500"))
+
+# Sections scored by calculate_structure_score, and the points each one is worth
+ESSENTIAL_SECTIONS = ("contact", "experience", "education", "skills")
+HELPFUL_SECTIONS = ("summary", "projects", "certifications", "publications", "awards")
+_SECTION_POINTS = np.array([25] * len(ESSENTIAL_SECTIONS) + [10] * len(HELPFUL_SECTIONS))
+_ESSENTIAL_MASK = np.arange(len(_SECTION_POINTS)) < len(ESSENTIAL_SECTIONS)
+
+COMPONENTS = ("structure_score", "keyword_score", "content_score", "formatting_score")
+
+
+class RankCandidate(NamedTuple):
+    """One resume in a ranking batch, identified by its resume store handle."""
+
+    handle: str
+    filename: Optional[str]
+    sections: ParsedResume
+
+    @property
+    def resume_text(self) -> str:
+        return self.sections.text
+
+
+class RankedResume(NamedTuple):
+    """A candidate's place in a ranking and its ATS scores."""
+
+    rank: int
+    candidate: RankCandidate
+    overall_score: int
+    component_scores: Dict[str, int]
+
+
+class FeatureColumns(NamedTuple):
+    """Scoring features of a batch, one row per resume."""
+
+    keyword_matrix: csr_matrix
+    section_lengths: np.ndarray
+    bullet_lines: np.ndarray
+    action_verb_bullets: np.ndarray
+    has_spaced_bullets: np.ndarray
+    metric_count: np.ndarray
+    date_count: np.ndarray
+    line_count: np.ndarray
+    blank_line_count: np.ndarray
+
+
+def extract_feature_columns(resumes: Sequence[ParsedResume], job_tokens: Sequence[str]) -> FeatureColumns:
+    """
+    Extract the scoring features of a chunk of resumes.
+
+    The incidence matrix only has columns for the JD's tokens, since no
+    other token affects the keyword score. This is CPU-bound and safe to run
+    in a worker process.
+
+    Args:
+        resumes: Parsed resumes.
+        job_tokens: The job description's keyword tokens, in column order.
+
+    Returns:
+        The chunk's feature columns.
+    """
+    token_columns = {token: column for column, token in enumerate(job_tokens)}
+    indptr = [0]
+    indices: List[int] = []
+    section_lengths = []
+    counts = []
+    for parsed in resumes:
+        # Uncached: a batch would only flush the per-request feature memo
+        features = extract_resume_features(parsed.text)
+        indices.extend(token_columns[token] for token in features.tokens if token in token_columns)
+        indptr.append(len(indices))
+        section_lengths.append([parsed.section_length(section) for section in ESSENTIAL_SECTIONS + HELPFUL_SECTIONS])
+        counts.append((
+            len(features.bullet_lines),
+            features.action_verb_bullets,
+            features.has_spaced_bullets,
+            features.metric_count,
+            features.date_count,
+            features.line_count,
+            features.blank_line_count,
+        ))
+
+    keyword_matrix = csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(resumes), len(job_tokens)),
+    )
+    count_columns = np.asarray(counts, dtype=np.int64).reshape(len(resumes), 7).T
+    return FeatureColumns(
+        keyword_matrix,
+        np.asarray(section_lengths, dtype=np.int64).reshape(len(resumes), len(_SECTION_POINTS)),
+        count_columns[0],
+        count_columns[1],
+        count_columns[2].astype(bool),
+        count_columns[3],
+        count_columns[4],
+        count_columns[5],
+        count_columns[6],
+    )
+
+
+def stack_feature_columns(chunks: Sequence[FeatureColumns]) -> FeatureColumns:
+    """Concatenate the feature columns of consecutive chunks."""
+    return FeatureColumns(
+        vstack([chunk.keyword_matrix for chunk in chunks], format="csr"),
+        *(np.concatenate([chunk[field] for chunk in chunks]) for field in range(1, len(FeatureColumns._fields)))
+    )
+
+
+def keyword_scores(matched: np.ndarray, job_token_counts: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_keyword_score from match counts.
+
+    Args:
+        matched: Number of JD tokens found in the resume, per pair.
+        job_token_counts: Number of tokens in the JD, per pair (or one for all).
+
+    Returns:
+        Integer keyword scores (0-100); 75 where the JD has no tokens.
+    """
+    job_token_counts = np.broadcast_to(job_token_counts, matched.shape)
+    match_percentage = np.divide(
+        matched, job_token_counts,
+        out=np.zeros(matched.shape), where=job_token_counts > 0
+    ) * 100
+    scores = np.where(match_percentage <= 50, match_percentage * 1.5, 75 + ((match_percentage - 50) * 0.5))
+    scores = np.round(np.minimum(100, scores))
+    return np.where(job_token_counts > 0, scores, 75).astype(np.int64)
+
+
+def score_feature_columns(columns: FeatureColumns) -> Dict[str, np.ndarray]:
+    """
+    Compute every ATS component for a whole batch.
+
+    Each expression mirrors its per-resume counterpart in ats_checker
+    operation for operation, so the rounded scores are identical.
+
+    Args:
+        columns: The batch's feature columns.
+
+    Returns:
+        Mapping of component name (and "overall_score") to an integer array.
+    """
+    # Structure: points for each section with more than 20 characters
+    present_points = (columns.section_lengths > 20) * _SECTION_POINTS
+    essential = np.minimum(100, present_points[:, _ESSENTIAL_MASK].sum(axis=1))
+    helpful = np.minimum(50, present_points[:, ~_ESSENTIAL_MASK].sum(axis=1))
+    structure = np.round((essential * 0.7) + (helpful * 0.3))
+
+    # Keywords: JD tokens present in each resume, from the incidence matrix
+    matched = np.asarray(columns.keyword_matrix.sum(axis=1)).ravel()
+    keyword = keyword_scores(matched, columns.keyword_matrix.shape[1])
+
+    # Content: action-verb share of bullets and metric mentions
+    bullet_lines = columns.bullet_lines
+    action_verb_percentage = np.divide(
+        columns.action_verb_bullets, bullet_lines,
+        out=np.zeros(bullet_lines.shape), where=bullet_lines > 0
+    ) * 100
+    action_verb_score = np.where(bullet_lines > 0, np.minimum(100, action_verb_percentage), 0)
+    metrics_score = np.minimum(100, columns.metric_count * 15)
+    content = np.round((action_verb_score * 0.6) + (metrics_score * 0.4))
+
+    # Formatting: bullets, spacing and dates
+    blank_ratio = np.divide(
+        columns.blank_line_count, columns.line_count,
+        out=np.zeros(columns.line_count.shape), where=columns.line_count > 0
+    )
+    spacing = np.where(
+        (blank_ratio >= 0.05) & (blank_ratio <= 0.3), 40,
+        np.where((blank_ratio > 0) & (blank_ratio < 0.5), 20, 0)
+    )
+    formatting = columns.has_spaced_bullets * 30 + spacing + (columns.date_count >= 2) * 30
+
+    overall = np.round(
+        structure * 0.25 +
+        keyword * 0.35 +
+        content * 0.25 +
+        formatting * 0.15
+    )
+    scores = (structure, keyword, content, formatting, overall)
+    return dict(zip(COMPONENTS + ("overall_score",), (score.astype(np.int64) for score in scores)))
+
+
+# Per-process memo of recent rankings: (order, score matrix) by JD and resume content
+_ranking_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_ranking_cache_lock = threading.Lock()
+
+
+def _ranking_key(job_handle: str, candidates: Sequence[RankCandidate]) -> str:
+    digest = hashlib.sha256(f"{job_handle}:{get_parser().version}".encode("ascii"))
+    for candidate in candidates:
+        digest.update(candidate.handle.encode("ascii"))
+    return digest.hexdigest()
+
+
+async def _score_batch(candidates: Sequence[RankCandidate], job_tokens: Sequence[str], chunk_size: int) -> Dict[str, np.ndarray]:
+    """Extract features chunk by chunk in the CPU pool, then score the batch at once."""
+    # Keep at most one chunk per worker in flight so a batch never saturates the pool by itself
+    limit = asyncio.Semaphore(max(1, get_cpu_pool().workers))
+
+    async def extract(start: int) -> FeatureColumns:
+        async with limit:
+            chunk = [candidate.sections for candidate in candidates[start:start + chunk_size]]
+            return await run_cpu_bound(extract_feature_columns, chunk, job_tokens)
+
+    chunks = await asyncio.gather(*(extract(start) for start in range(0, len(candidates), chunk_size)))
+    return score_feature_columns(stack_feature_columns(chunks))
+
+
+async def rank_resumes(
+    candidates: Sequence[RankCandidate],
+    job_description: JobDescriptionInput,
+    chunk_size: int = CHUNK_SIZE
+) -> List[RankedResume]:
+    """
+    Rank resumes by overall ATS score against one job description.
+
+    Args:
+        candidates: The resumes to rank.
+        job_description: The target job description or its cached analysis.
+        chunk_size: Resumes per CPU pool task.
+
+    Returns:
+        Every candidate, best first; ties keep their input order.
+    """
+    if not candidates:
+        return []
+
+    job_analysis = as_job_description_analysis(job_description)
+    key = _ranking_key(job_analysis.handle, candidates)
+    with _ranking_cache_lock:
+        cached = _ranking_cache.get(key)
+        if cached is not None:
+            _ranking_cache.move_to_end(key)
+
+    if cached is None:
+        scores = await _score_batch(candidates, sorted(job_analysis.tokens), chunk_size)
+        order = np.argsort(-scores["overall_score"], kind="stable")
+        score_matrix = np.stack([scores[name] for name in COMPONENTS + ("overall_score",)], axis=1)
+        cached = (order, score_matrix)
+        with _ranking_cache_lock:
+            _ranking_cache[key] = cached
+            while len(_ranking_cache) > RANK_CACHE_SIZE:
+                _ranking_cache.popitem(last=False)
+
+    order, score_matrix = cached
+    ranking = []
+    for rank, row in enumerate(order.tolist(), start=1):
+        *components, overall = score_matrix[row].tolist()
+        ranking.append(RankedResume(rank, candidates[row], overall, dict(zip(COMPONENTS, components))))
+    return ranking
@@ -0,0 +1,347 @@
+"""
+Resume Store Module
+
+This module keeps uploaded resumes so clients can upload a file once and refer
+to it afterwards by handle. Resumes are content-addressed: the handle is the
+SHA-256 of the file bytes plus how the file is parsed ("<sha256>-pdf" or
+"<sha256>-text", as in the parse cache key), so uploading the same file twice
+yields the same handle and is stored once, while the same bytes uploaded as a
+PDF and as a text file get separate artifacts.
+
+The local backend writes the raw bytes to the filesystem and the parsed
+artifacts (resume text and section spans) to an SQLite index, so it works without
+Supabase storage. Artifacts are tagged with the parser version and rebuilt
+from the stored bytes when the parser changes. Index reads and writes run in
+a worker thread so they never block the event loop.
+
+Resumes expire RESUME_STORE_MAX_AGE_DAYS after they were last uploaded, and
+the oldest are evicted first once the stored files exceed
+RESUME_STORE_MAX_BYTES. Limits are enforced after uploads, at most once per
+RESUME_STORE_PRUNE_SECONDS.
+
+Configuration (environment variables):
+    RESUME_STORE_DIR            Directory for stored files and the index
+                                (default: app/data/resume_store).
+    RESUME_STORE_MAX_AGE_DAYS   Days a resume is kept after its last upload;
+                                0 keeps resumes forever (default 30).
+    RESUME_STORE_MAX_BYTES      Total size of stored files; 0 for no limit
+                                (default 1 GiB).
+    RESUME_STORE_PRUNE_SECONDS  Minimum seconds between limit checks (default 60).
+"""
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from app.services.parse_cache import ParseCache, get_parse_cache
+from app.services.resume_parser import ParsedResume, get_parser
+from app.services.sqlite_db import connect_shared
+from app.services.upload_intake import ResumeUpload
+
+STORE_DIR = os.getenv(
+    "RESUME_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "resume_store")
+)
+MAX_AGE_DAYS = float(os.getenv("RESUME_STORE_MAX_AGE_DAYS", "30"))
+MAX_BYTES = int(os.getenv("RESUME_STORE_MAX_BYTES", str(2 ** 30)))
+PRUNE_SECONDS = float(os.getenv("RESUME_STORE_PRUNE_SECONDS", "60"))
+
+_HANDLE_PATTERN = re.compile(r"^[0-9a-f]{64}-(pdf|text)$")
+
+
+class UnknownResumeError(KeyError):
+    """Raised when a resume handle is malformed or not in the store."""
+
+    def __init__(self, handle: str):
+        super().__init__(handle)
+        self.handle = handle
+
+    def __str__(self) -> str:
+        return f"Unknown resume handle '{self.handle}'"
+
+
+class StoredResume(NamedTuple):
+    """A stored resume and its parsed artifacts."""
+
+    handle: str
+    filename: Optional[str]
+    size: int
+    resume_text: str
+    sections: ParsedResume
+
+
+def make_handle(content_hash: str, filename: Optional[str] = None) -> str:
+    """
+    Build the handle of an upload.
+
+    Args:
+        content_hash: SHA-256 hex digest of the resume file.
+        filename: Optional filename used to determine the file type.
+
+    Returns:
+        The content hash and file type, e.g. "<sha256>-pdf".
+    """
+    return f"{content_hash}-{ParseCache.file_kind(filename)}"
+
+
+class ResumeStore:
+    """
+    Content-addressed resume store with a filesystem/SQLite backend.
+
+    Usage:
+        store = ResumeStore("/var/lib/careerlm/resumes")
+        stored = await store.put(await read_upload(upload_file))
+        stored = await store.get(stored.handle)
+    """
+
+    def __init__(
+        self,
+        root: str = STORE_DIR,
+        parse_cache: Optional[ParseCache] = None,
+        max_age_days: float = MAX_AGE_DAYS,
+        max_bytes: int = MAX_BYTES,
+        prune_seconds: float = PRUNE_SECONDS
+    ):
+        """
+        Open (or create) a store.
+
+        Args:
+            root: Directory holding the file blobs and the SQLite index.
+            parse_cache: Parse cache used to build artifacts; defaults to the shared one.
+            max_age_days: Days a resume is kept after its last upload, or 0 for no limit.
+            max_bytes: Total size of stored files, or 0 for no limit.
+            prune_seconds: Minimum seconds between limit checks.
+        """
+        self.root = root
+        self.parse_cache = parse_cache or get_parse_cache()
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.prune_seconds = prune_seconds
+        self._blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self._blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self._db = connect_shared(
+            os.path.join(root, "index.sqlite3"),
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "handle TEXT PRIMARY KEY, filename TEXT, size INTEGER NOT NULL, "
+            "parser_version TEXT NOT NULL, resume_text TEXT NOT NULL, sections TEXT NOT NULL, "
+            "created_at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS resumes_created_at ON resumes (created_at)"
+        )
+
+    def _blob_path(self, handle: str) -> str:
+        """Path of the raw file, named by its content hash and sharded by the first two hex digits."""
+        content_hash = handle[:64]
+        return os.path.join(self._blob_dir, content_hash[:2], content_hash)
+
+    def _write_blob(self, handle: str, upload: ResumeUpload) -> None:
+        """Copy the uploaded file atomically, skipping it if already present."""
+        path = self._blob_path(handle)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                shutil.copyfileobj(upload.open(), tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _save_artifacts(self, stored: StoredResume) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO resumes (handle, filename, size, parser_version, resume_text, sections, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(handle) DO UPDATE SET parser_version = excluded.parser_version, "
+                "resume_text = excluded.resume_text, sections = excluded.sections",
+                (
+                    stored.handle,
+                    stored.filename,
+                    stored.size,
+                    get_parser().version,
+                    stored.resume_text,
+                    # Only the spans are stored; the text is in its own column
+                    json.dumps(stored.sections.spans),
+                    time.time(),
+                ),
+            )
+
+    def _touch(self, handle: str) -> None:
+        """Restart the retention period of a re-uploaded resume."""
+        with self._lock:
+            self._db.execute("UPDATE resumes SET created_at = ? WHERE handle = ?", (time.time(), handle))
+
+    async def put(self, upload: ResumeUpload) -> StoredResume:
+        """
+        Store an uploaded resume and its parsed artifacts.
+
+        Args:
+            upload: Upload accepted by `read_upload`; the file is copied
+                to the store without being read into memory whole.
+
+        Returns:
+            The stored resume, including its handle.
+        """
+        handle = make_handle(upload.sha256, upload.filename)
+        existing = await self._load(handle)
+        if existing is not None:
+            await asyncio.to_thread(self._touch, handle)
+            return existing
+
+        resume_text, sections = await self.parse_cache.get_or_parse_upload(upload)
+        stored = StoredResume(handle, upload.filename, upload.size, resume_text, sections)
+        await asyncio.to_thread(self._store, stored, upload)
+        return stored
+
+    def _store(self, stored: StoredResume, upload: ResumeUpload) -> None:
+        self._write_blob(stored.handle, upload)
+        self._save_artifacts(stored)
+        if time.monotonic() - self._last_prune >= self.prune_seconds:
+            self._last_prune = time.monotonic()
+            self.prune()
+
+    async def get(self, handle: str) -> StoredResume:
+        """
+        Look up a stored resume by handle.
+
+        Args:
+            handle: Handle returned by `put`.
+
+        Returns:
+            The stored resume.
+
+        Raises:
+            UnknownResumeError: If the handle is malformed or unknown.
+        """
+        stored = await self._load(handle) if _HANDLE_PATTERN.match(handle or "") else None
+        if stored is None:
+            raise UnknownResumeError(handle)
+        return stored
+
+    def _read_row(self, handle: str) -> Optional[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT filename, size, parser_version, resume_text, sections FROM resumes WHERE handle = ?",
+                (handle,),
+            ).fetchone()
+
+    async def _load(self, handle: str) -> Optional[StoredResume]:
+        """Read a resume from the index, re-parsing it if the parser has changed."""
+        row = await asyncio.to_thread(self._read_row, handle)
+        if row is None:
+            return None
+
+        filename, size, parser_version, resume_text, sections_json = row
+        if parser_version == get_parser().version:
+            sections = ParsedResume(resume_text, json.loads(sections_json))
+            return StoredResume(handle, filename, size, resume_text, sections)
+
+        file_bytes = await asyncio.to_thread(self.read_bytes, handle)
+        resume_text, sections = await self.parse_cache.get_or_parse(file_bytes, filename)
+        stored = StoredResume(handle, filename, size, resume_text, sections)
+        await asyncio.to_thread(self._save_artifacts, stored)
+        return stored
+
+    def read_bytes(self, handle: str) -> bytes:
+        """
+        Return the raw file of a stored resume.
+
+        Raises:
+            UnknownResumeError: If the handle is malformed or its file is missing.
+        """
+        if not _HANDLE_PATTERN.match(handle or ""):
+            raise UnknownResumeError(handle)
+        try:
+            with open(self._blob_path(handle), "rb") as blob:
+                return blob.read()
+        except FileNotFoundError:
+            raise UnknownResumeError(handle)
+
+    def _delete_rows(self, handles: List[str]) -> int:
+        """Delete index rows, then every blob no remaining row refers to."""
+        with self._lock:
+            deleted = 0
+            for handle in handles:
+                deleted += self._db.execute("DELETE FROM resumes WHERE handle = ?", (handle,)).rowcount
+            content_hashes = {handle[:64] for handle in handles}
+            # The same bytes may still be stored under the other file type
+            orphans = [
+                content_hash for content_hash in content_hashes
+                if self._db.execute(
+                    "SELECT 1 FROM resumes WHERE handle IN (?, ?)", (f"{content_hash}-pdf", f"{content_hash}-text")
+                ).fetchone() is None
+            ]
+        for content_hash in orphans:
+            try:
+                os.unlink(self._blob_path(content_hash))
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    def delete(self, handle: str) -> bool:
+        """
+        Remove a resume and its artifacts.
+
+        Returns:
+            True if the resume was stored.
+        """
+        if not _HANDLE_PATTERN.match(handle or ""):
+            return False
+        return bool(self._delete_rows([handle]))
+
+    def prune(self) -> int:
+        """
+        Remove expired resumes, then the oldest ones while over the size limit.
+
+        Returns:
+            The number of resumes removed.
+        """
+        removed = 0
+        if self.max_age_days > 0:
+            cutoff = time.time() - self.max_age_days * 86400
+            with self._lock:
+                expired = [row[0] for row in self._db.execute(
+                    "SELECT handle FROM resumes WHERE created_at < ?", (cutoff,)
+                )]
+            removed += self._delete_rows(expired)
+
+        if self.max_bytes > 0:
+            with self._lock:
+                excess = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0] - self.max_bytes
+                oldest = []
+                if excess > 0:
+                    for handle, size in self._db.execute("SELECT handle, size FROM resumes ORDER BY created_at"):
+                        oldest.append(handle)
+                        excess -= size
+                        if excess <= 0:
+                            break
+            removed += self._delete_rows(oldest)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of stored resumes and their total size."""
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resumes").fetchone()
+        return {"resumes": count, "bytes": total}
+
+
+# Singleton instance for convenience
+_store_instance: Optional[ResumeStore] = None
+
+
+def get_resume_store() -> ResumeStore:
+    """Get or create the singleton ResumeStore."""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = ResumeStore()
+    return _store_instance
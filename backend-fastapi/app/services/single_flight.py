@@ -0,0 +1,58 @@
+"""
+Single-Flight Module
+
+This module coalesces identical in-flight async calls. Concurrent callers that
+use the same key await one shared upstream call and receive its result, or its
+exception, instead of each issuing a duplicate request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    Usage:
+        flight = SingleFlight()
+        result = await flight.do(key, lambda: fetch(...))
+    """
+
+    def __init__(self):
+        """Initialize the table of in-flight calls."""
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `call` once for all concurrent callers with the same key.
+
+        The upstream call runs in its own task, so a caller that is cancelled
+        (e.g. a disconnected client) does not cancel it for the others.
+
+        Args:
+            key: Identifies equivalent calls.
+            call: Zero-argument factory returning the awaitable to run.
+
+        Returns:
+            The shared result of the call. Its exception is raised to every
+            waiting caller.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished call so later callers start a fresh one."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
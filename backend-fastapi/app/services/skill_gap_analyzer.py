@@ -2,268 +2,118 @@
 Skill Gap Analyzer Module
 
 This module provides functionality to analyze resumes and identify skill gaps
-based on career cluster matching using TF-IDF and cosine similarity.
+based on career cluster matching using TF-IDF and cosine similarity. The career
+clusters are loaded from app/data/career_clusters.json via the career index.
 """
 
-import os
-from groq import Groq
-from dotenv import load_dotenv
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import heapq
+import numpy as np
+from app.services.career_index import CareerIndex, get_career_index
+from app.services.cpu_pool import PoolSaturatedError, run_cpu_bound
+from app.services.hashed_features import SIMILARITY_MODE
+from app.services.llm_gateway import chat_completion
+from app.services.resume_features import get_resume_features
 
-# Load API key from .env
-load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-# Predefined career clusters with required skills
-CAREER_CLUSTERS = {
-    "Software Engineer": {
-        "skills": [
-            "Python", "Java", "JavaScript", "C++", "TypeScript", "React", "Node.js",
-            "Django", "Flask", "FastAPI", "REST API", "GraphQL", "SQL", "MongoDB",
-            "PostgreSQL", "Git", "Docker", "Kubernetes", "AWS", "Azure", "GCP",
-            "CI/CD", "Agile", "Scrum", "Testing", "Debugging", "Problem Solving",
-            "Data Structures", "Algorithms", "System Design", "OOP"
-        ],
-        "keywords": ["software", "developer", "programming", "coding", "engineering"]
-    },
-    "Data Scientist": {
-        "skills": [
-            "Python", "R", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch",
-            "Scikit-learn", "Pandas", "NumPy", "SQL", "Statistics", "Mathematics",
-            "Data Visualization", "Tableau", "Power BI", "A/B Testing", "NLP",
-            "Computer Vision", "Feature Engineering", "Model Deployment", "MLOps",
-            "Jupyter", "Data Mining", "Big Data", "Spark", "Hadoop"
-        ],
-        "keywords": ["data", "analytics", "machine learning", "AI", "statistics"]
-    },
-    "Data Analyst": {
-        "skills": [
-            "SQL", "Excel", "Python", "R", "Tableau", "Power BI", "Statistics",
-            "Data Visualization", "Business Intelligence", "ETL", "Data Cleaning",
-            "Data Mining", "Dashboard Creation", "Reporting", "Forecasting",
-            "A/B Testing", "Google Analytics", "Looker", "Pandas", "NumPy"
-        ],
-        "keywords": ["analyst", "analytics", "reporting", "business intelligence", "insights"]
-    },
-    "DevOps Engineer": {
-        "skills": [
-            "Docker", "Kubernetes", "Jenkins", "CI/CD", "AWS", "Azure", "GCP",
-            "Terraform", "Ansible", "Git", "Linux", "Shell Scripting", "Python",
-            "Monitoring", "Grafana", "Prometheus", "ELK Stack", "Nginx", "Load Balancing",
-            "Security", "Networking", "Infrastructure as Code", "Microservices"
-        ],
-        "keywords": ["devops", "infrastructure", "deployment", "automation", "cloud"]
-    },
-    "Full Stack Developer": {
-        "skills": [
-            "JavaScript", "TypeScript", "React", "Angular", "Vue.js", "Node.js",
-            "Express.js", "HTML", "CSS", "REST API", "GraphQL", "MongoDB", "PostgreSQL",
-            "MySQL", "Git", "Docker", "AWS", "Authentication", "Testing", "Redux",
-            "Next.js", "Tailwind CSS", "Bootstrap", "Responsive Design"
-        ],
-        "keywords": ["full stack", "frontend", "backend", "web development"]
-    },
-    "Machine Learning Engineer": {
-        "skills": [
-            "Python", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch",
-            "Scikit-learn", "MLOps", "Model Deployment", "Docker", "Kubernetes",
-            "AWS", "Feature Engineering", "Data Preprocessing", "Model Optimization",
-            "APIs", "Git", "CI/CD", "Monitoring", "Mathematics", "Statistics",
-            "Computer Vision", "NLP", "Neural Networks"
-        ],
-        "keywords": ["machine learning", "ML engineer", "AI", "model deployment"]
-    },
-    "Product Manager": {
-        "skills": [
-            "Product Strategy", "Roadmapping", "User Research", "Wireframing",
-            "A/B Testing", "Analytics", "SQL", "Agile", "Scrum", "JIRA",
-            "Communication", "Stakeholder Management", "Market Research",
-            "Competitive Analysis", "User Stories", "Product Development",
-            "Prioritization", "Data Analysis", "UX/UI", "Leadership"
-        ],
-        "keywords": ["product", "management", "strategy", "roadmap", "user experience"]
-    },
-    "UI/UX Designer": {
-        "skills": [
-            "Figma", "Adobe XD", "Sketch", "Wireframing", "Prototyping",
-            "User Research", "Usability Testing", "Design Systems", "Typography",
-            "Color Theory", "Responsive Design", "Mobile Design", "Web Design",
-            "HTML", "CSS", "User Flows", "Information Architecture",
-            "Accessibility", "Visual Design", "Adobe Creative Suite"
-        ],
-        "keywords": ["design", "UX", "UI", "user experience", "interface"]
-    },
-    "Cloud Architect": {
-        "skills": [
-            "AWS", "Azure", "GCP", "Cloud Architecture", "Microservices",
-            "Kubernetes", "Docker", "Serverless", "Lambda", "EC2", "S3",
-            "Security", "Networking", "Load Balancing", "High Availability",
-            "Disaster Recovery", "Cost Optimization", "Infrastructure as Code",
-            "Terraform", "CloudFormation", "Monitoring"
-        ],
-        "keywords": ["cloud", "architect", "infrastructure", "scalability"]
-    },
-    "Cybersecurity Analyst": {
-        "skills": [
-            "Security", "Network Security", "Penetration Testing", "Vulnerability Assessment",
-            "SIEM", "Firewall", "Intrusion Detection", "Encryption", "Risk Assessment",
-            "Compliance", "ISO 27001", "NIST", "Ethical Hacking", "Malware Analysis",
-            "Security Auditing", "Python", "Linux", "Windows Security", "Cloud Security"
-        ],
-        "keywords": ["security", "cybersecurity", "penetration", "threat", "protection"]
-    },
-    "Business Analyst": {
-        "skills": [
-            "Requirements Gathering", "Business Process Modeling", "SQL", "Excel",
-            "Data Analysis", "Documentation", "Stakeholder Management", "JIRA",
-            "Agile", "Scrum", "Wireframing", "Use Cases", "User Stories",
-            "Business Intelligence", "Power BI", "Tableau", "Communication",
-            "Problem Solving", "Process Improvement"
-        ],
-        "keywords": ["business", "analyst", "requirements", "process", "stakeholder"]
-    },
-    "Mobile Developer": {
-        "skills": [
-            "React Native", "Flutter", "Swift", "Kotlin", "Java", "iOS", "Android",
-            "Mobile UI/UX", "REST API", "Firebase", "Push Notifications",
-            "App Store", "Google Play", "Git", "Testing", "Debugging",
-            "Performance Optimization", "Mobile Security", "Responsive Design"
-        ],
-        "keywords": ["mobile", "iOS", "android", "app development"]
-    }
-}
-
-
-def extract_skills_from_resume(resume_text: str) -> list:
+def extract_skills_from_resume(resume_text: str, index: CareerIndex = None) -> list:
     """
-    Extract skills from resume text using pattern matching.
+    Extract skills from resume text using a compiled multi-pattern matcher.
+    
+    Every cluster skill is found in one pass over the text, and only whole-word
+    matches count (e.g. "Java" is not found inside "JavaScript"). Skills are
+    part of the resume's shared features, so they are extracted once per resume.
     
     Args:
         resume_text: The extracted resume text.
+        index: Optional career index to use; defaults to the active one.
         
     Returns:
         List of found skills.
     """
-    resume_lower = resume_text.lower()
-    found_skills = set()
-    
-    # Collect all possible skills from career clusters
-    all_skills = set()
-    for cluster_data in CAREER_CLUSTERS.values():
-        all_skills.update(cluster_data["skills"])
-    
-    # Find skills in resume
-    for skill in all_skills:
-        if skill.lower() in resume_lower:
-            found_skills.add(skill)
-    
-    return list(found_skills)
+    return list(get_resume_features(resume_text, index).skills)
 
 
-def calculate_skill_match_percentage(user_skills: list, career_skills: list) -> float:
-    """
-    Calculate percentage match between user skills and career requirements.
-    
-    Args:
-        user_skills: List of user's skills.
-        career_skills: List of required career skills.
-        
-    Returns:
-        Match percentage as a float.
+def calculate_career_probabilities(
+    resume_text: str,
+    user_skills: list,
+    index: CareerIndex = None,
+    top_k: int = None,
+    min_probability: float = 0.0
+) -> list:
     """
-    user_skills_set = set(skill.lower() for skill in user_skills)
-    career_skills_set = set(skill.lower() for skill in career_skills)
+    Calculate probability scores for careers based on skills and semantic matching.
     
-    if not career_skills_set:
-        return 0.0
-    
-    matched_skills = user_skills_set.intersection(career_skills_set)
-    match_percentage = (len(matched_skills) / len(career_skills_set)) * 100
-    
-    return round(match_percentage, 2)
-
-
-def calculate_semantic_similarity(user_text: str, career_keywords: list) -> float:
-    """
-    Calculate semantic similarity using TF-IDF and cosine similarity.
-    
-    Args:
-        user_text: The resume text.
-        career_keywords: List of career keywords.
-        
-    Returns:
-        Similarity score as a percentage.
-    """
-    try:
-        # Combine career keywords into a single text
-        career_text = " ".join(career_keywords)
-        
-        # Create TF-IDF vectors
-        vectorizer = TfidfVectorizer(stop_words='english')
-        vectors = vectorizer.fit_transform([user_text.lower(), career_text.lower()])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-        return round(similarity * 100, 2)
-    except:
-        return 0.0
-
-
-def calculate_career_probabilities(resume_text: str, user_skills: list) -> list:
-    """
-    Calculate probability scores for each career based on skills and semantic matching.
+    Only careers sharing at least one skill with the user are scored, found via
+    the inverted skill index, so the cost depends on the matched skills rather
+    than on the size of the taxonomy. When the similarity engine has an LSH
+    index, the careers it finds near the resume are scored as well.
     
     Args:
         resume_text: The extracted resume text.
         user_skills: List of user's skills.
+        index: Optional career index to use; defaults to the active one.
+        top_k: Optional maximum number of careers to return.
+        min_probability: Minimum combined probability for a career to be returned.
         
     Returns:
         List of career match dictionaries sorted by probability.
     """
-    career_matches = []
+    index = index or get_career_index()
+    skill_matrix = index.skill_matrix
+    user_vector = skill_matrix.skill_vector(user_skills)
+    
+    # Candidate careers from the inverted skill index
+    career_ids = skill_matrix.candidate_careers(user_vector)
+    
+    # With an LSH index, careers described like the resume are candidates too,
+    # even without a shared skill. Skill candidates are kept whether or not the
+    # LSH lookup reaches them
+    engine = index.similarity_engine
+    use_vector = SIMILARITY_MODE == "hashed" or engine.approximate
+    resume_vector = get_resume_features(resume_text, index).vector if use_vector else None
+    if engine.approximate:
+        career_ids = np.union1d(career_ids, engine.near_careers(resume_vector))
+    if not len(career_ids):
+        return []
+    
+    # Skill-based match for the candidates from the precomputed incidence matrix
+    skill_matches = skill_matrix.match_percentages(user_vector, career_ids)
+    
+    # Semantic similarity for every candidate, scored exactly, from one
+    # pre-fitted TF-IDF model (or, in hashed mode, from the resume's memoized
+    # hashed vector)
+    semantic_matches = engine.score_vector(resume_text, career_ids, resume_vector)
+    
+    # Combined probability (weighted average: 70% skills, 30% semantic)
+    combined_probabilities = np.round((skill_matches * 0.7) + (semantic_matches * 0.3), 2)
+    
+    # Select the best careers with a bounded heap (ties keep taxonomy order)
+    eligible = np.flatnonzero(combined_probabilities >= min_probability).tolist()
+    limit = len(eligible) if top_k is None else min(top_k, len(eligible))
+    selected = heapq.nlargest(limit, eligible, key=combined_probabilities.__getitem__)
     
-    for career_name, cluster_data in CAREER_CLUSTERS.items():
-        # Calculate skill-based match
-        skill_match = calculate_skill_match_percentage(user_skills, cluster_data["skills"])
-        
-        # Calculate semantic similarity
-        semantic_match = calculate_semantic_similarity(resume_text, cluster_data["keywords"])
-        
-        # Combined probability (weighted average: 70% skills, 30% semantic)
-        combined_probability = (skill_match * 0.7) + (semantic_match * 0.3)
+    career_matches = []
+    for position in selected:
+        career_id = int(career_ids[position])
         
         # Find matched and missing skills
-        user_skills_lower = set(skill.lower() for skill in user_skills)
-        
-        matched_skills = [
-            skill for skill in cluster_data["skills"] 
-            if skill.lower() in user_skills_lower
-        ]
-        
-        missing_skills = [
-            skill for skill in cluster_data["skills"] 
-            if skill.lower() not in user_skills_lower
-        ][:10]  # Limit to top 10 missing skills
+        matched_skills, missing_skills = skill_matrix.skill_lists(user_vector, career_id)
         
         career_matches.append({
-            "career": career_name,
-            "probability": round(combined_probability, 2),
-            "skill_match_percentage": skill_match,
-            "semantic_match_percentage": semantic_match,
+            "career": skill_matrix.careers[career_id],
+            "probability": float(combined_probabilities[position]),
+            "skill_match_percentage": float(skill_matches[position]),
+            "semantic_match_percentage": float(semantic_matches[position]),
             "matched_skills": matched_skills,
-            "missing_skills": missing_skills,
-            "total_required_skills": len(cluster_data["skills"]),
+            "missing_skills": missing_skills[:10],  # Limit to top 10 missing skills
+            "total_required_skills": int(skill_matrix.required_counts[career_id]),
             "matched_skills_count": len(matched_skills)
         })
     
-    # Sort by probability (descending)
-    career_matches.sort(key=lambda x: x["probability"], reverse=True)
-    
     return career_matches
 
 
-def get_ai_career_recommendations(resume_text: str, user_skills: list, top_careers: list) -> str:
+async def get_ai_career_recommendations(resume_text: str, user_skills: list, top_careers: list) -> str:
     """
     Get AI-powered career recommendations and learning paths.
     
@@ -297,7 +147,7 @@ Provide:
 
 Keep the response structured and practical."""
 
-        completion = client.chat.completions.create(
+        return await chat_completion(
             model="llama-3.1-8b-instant",
             messages=[
                 {"role": "system", "content": "You are an expert career counselor and skill development advisor."},
@@ -305,37 +155,80 @@ Keep the response structured and practical."""
             ],
         )
 
-        return completion.choices[0].message.content
-
     except Exception as e:
         return f"AI recommendations unavailable: {str(e)}"
 
 
-def analyze_skill_gap(resume_text: str, filename: str = None) -> dict:
+def match_careers(resume_text: str, top_k: int = None, min_probability: float = 0.0) -> dict:
+    """
+    Extract skills and score careers, the deterministic part of the analysis.
+    
+    This is CPU-bound and safe to run in a worker process.
+    
+    Args:
+        resume_text: The extracted resume text.
+        top_k: Optional maximum number of career matches to return.
+        min_probability: Minimum probability for a career match to be returned.
+        
+    Returns:
+        Dictionary with "user_skills" and "career_matches".
+    """
+    # Use one taxonomy version for the whole analysis
+    index = get_career_index()
+    
+    # Extract user skills from the text
+    user_skills = extract_skills_from_resume(resume_text, index)
+    if not user_skills:
+        return {"user_skills": [], "career_matches": []}
+    
+    # Calculate career probabilities
+    career_matches = calculate_career_probabilities(
+        resume_text,
+        user_skills,
+        index,
+        top_k=top_k,
+        min_probability=min_probability
+    )
+    
+    return {"user_skills": user_skills, "career_matches": career_matches}
+
+
+async def analyze_skill_gap(
+    resume_text: str,
+    filename: str = None,
+    top_k: int = None,
+    min_probability: float = 0.0,
+    include_llm: bool = True
+) -> dict:
     """
     Main function to analyze skill gaps and recommend careers based on clustering.
     
     Args:
         resume_text: The extracted resume text (already parsed).
         filename: Optional filename for logging purposes.
+        top_k: Optional maximum number of career matches to return.
+        min_probability: Minimum probability for a career match to be returned.
+        include_llm: Whether to get AI recommendations; without them the
+            result is deterministic and "ai_recommendations" is None.
         
     Returns:
         Dictionary containing skill analysis, career matches, and recommendations.
     """
     try:
-        # Extract user skills from the text
-        user_skills = extract_skills_from_resume(resume_text)
+        # Extract skills and score careers in the CPU pool
+        match_result = await run_cpu_bound(match_careers, resume_text, top_k, min_probability)
+        user_skills = match_result["user_skills"]
+        career_matches = match_result["career_matches"]
         
         if not user_skills:
             return {
                 "error": "No recognizable skills found in resume. Please ensure your resume includes technical skills."
             }
         
-        # Calculate career probabilities
-        career_matches = calculate_career_probabilities(resume_text, user_skills)
-        
         # Get AI recommendations
-        ai_recommendations = get_ai_career_recommendations(resume_text, user_skills, career_matches)
+        ai_recommendations = await get_ai_career_recommendations(
+            resume_text, user_skills, career_matches
+        ) if include_llm else None
         
         return {
             "user_skills": user_skills,
@@ -350,6 +243,8 @@ def analyze_skill_gap(resume_text: str, filename: str = None) -> dict:
             }
         }
     
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         return {
             "error": f"Analysis failed: {str(e)}"
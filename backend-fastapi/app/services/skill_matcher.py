@@ -0,0 +1,135 @@
+"""
+Skill Matcher Module
+
+This module provides an Aho-Corasick automaton compiled once from the career
+cluster skills. It finds every known skill in a single linear pass over the
+resume text and only accepts matches that sit on word boundaries, so "Java"
+is not found inside "JavaScript".
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character continues a word (letters, digits, underscore)."""
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """
+    A compiled multi-pattern matcher for skill names.
+
+    Usage:
+        matcher = SkillMatcher(["Python", "Java", "JavaScript"])
+        matcher.find_skills("Built services in JavaScript and Python")
+        # ["JavaScript", "Python"]
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        """
+        Build the automaton from a list of skill names.
+
+        Args:
+            skills: Skill names; matching is case-insensitive and the first
+                spelling seen for a skill is the one reported.
+        """
+        # Trie stored as parallel lists indexed by state id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Skill ids ending at each state, including those reached via fail links
+        self._output: List[List[int]] = [[]]
+        self._skills: List[str] = []
+        self._lengths: List[int] = []
+
+        seen = set()
+        for skill in skills:
+            pattern = skill.lower()
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add_pattern(pattern, skill)
+
+        self._build_fail_links()
+
+    @property
+    def skills(self) -> List[str]:
+        """The canonical skill names known to the matcher."""
+        return list(self._skills)
+
+    def _add_pattern(self, pattern: str, skill: str) -> None:
+        """Insert a lowercase pattern into the trie."""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+
+        self._output[state].append(len(self._skills))
+        self._skills.append(skill)
+        self._lengths.append(len(pattern))
+
+    def _build_fail_links(self) -> None:
+        """Compute failure links breadth-first and merge output sets."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = (
+                        self._output[next_state] + self._output[self._fail[next_state]]
+                    )
+
+    def find_skills(self, text: str) -> List[str]:
+        """
+        Find all known skills in the text.
+
+        Args:
+            text: The text to scan.
+
+        Returns:
+            List of matched skills in order of first appearance.
+        """
+        text_lower = text.lower()
+        text_length = len(text_lower)
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+
+        found: List[int] = []
+        found_ids = set()
+        state = 0
+
+        for position, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for skill_id in output[state]:
+                if skill_id in found_ids:
+                    continue
+
+                start = position - lengths[skill_id] + 1
+                # Reject matches that start or end inside a larger word
+                if start > 0 and _is_word_char(text_lower[start - 1]) and _is_word_char(text_lower[start]):
+                    continue
+                end = position + 1
+                if end < text_length and _is_word_char(text_lower[end]) and _is_word_char(text_lower[position]):
+                    continue
+
+                found_ids.add(skill_id)
+                found.append(skill_id)
+
+        return [self._skills[skill_id] for skill_id in found]
+
@@ -0,0 +1,151 @@
+"""
+Skill Incidence Matrix Module
+
+This module compiles the career clusters once into a sparse career x skill
+incidence matrix with a skill-to-column index. A resume's skill vector then
+gives every career's match percentage, matched skills and missing skills from
+a few vectorized operations instead of a per-career Python loop.
+
+The column-major copy of the matrix doubles as an inverted index from skill to
+careers, so only careers sharing at least one skill with a resume are scored.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class SkillIncidenceMatrix:
+    """
+    Career x skill incidence matrix compiled from career clusters.
+
+    Usage:
+        matrix = SkillIncidenceMatrix(CAREER_CLUSTERS)
+        user_vector = matrix.skill_vector(["Python", "SQL"])
+        percentages = matrix.match_percentages(user_vector)
+        matched, missing = matrix.skill_lists(user_vector, career_id=0)
+    """
+
+    def __init__(self, career_clusters: Dict[str, dict]):
+        """
+        Compile the incidence matrix.
+
+        Args:
+            career_clusters: Mapping of career name to cluster data with a
+                "skills" list. Skills are matched case-insensitively.
+        """
+        self.careers: List[str] = list(career_clusters.keys())
+        self.skills: List[str] = []
+        self.skill_index: Dict[str, int] = {}
+
+        # CSR layout; each row keeps the cluster's own skill order so that
+        # matched/missing lists come out in the same order as the taxonomy
+        indptr = [0]
+        indices: List[int] = []
+        entry_names: List[str] = []
+
+        for cluster_data in career_clusters.values():
+            row_columns = set()
+            for skill in cluster_data["skills"]:
+                key = skill.lower()
+                column = self.skill_index.get(key)
+                if column is None:
+                    column = len(self.skills)
+                    self.skill_index[key] = column
+                    self.skills.append(skill)
+                if column in row_columns:
+                    continue
+                row_columns.add(column)
+                indices.append(column)
+                entry_names.append(skill)
+            indptr.append(len(indices))
+
+        self._indptr = np.asarray(indptr, dtype=np.int64)
+        self._indices = np.asarray(indices, dtype=np.int64)
+        self._entry_names = np.asarray(entry_names, dtype=object)
+        self.required_counts = np.diff(self._indptr)
+        self.matrix = csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), self._indices, self._indptr),
+            shape=(len(self.careers), len(self.skills)),
+        )
+        # Inverted index: the rows listed in column j are the careers requiring skill j
+        self._postings = self.matrix.tocsc()
+
+    def skill_vector(self, user_skills: Iterable[str]) -> np.ndarray:
+        """
+        Build a boolean vector of the user's skills over the matrix columns.
+
+        Args:
+            user_skills: List of user's skills. Unknown skills are ignored.
+
+        Returns:
+            Boolean array with one entry per known skill.
+        """
+        vector = np.zeros(len(self.skills), dtype=bool)
+        columns = [self.skill_index[key] for key in (s.lower() for s in user_skills) if key in self.skill_index]
+        vector[columns] = True
+        return vector
+
+    def candidate_careers(self, user_vector: np.ndarray) -> np.ndarray:
+        """
+        Find careers that share at least one skill with the user.
+
+        Cost depends on the number of matched skills and their posting list
+        lengths, not on the size of the taxonomy.
+
+        Args:
+            user_vector: Boolean skill vector from `skill_vector`.
+
+        Returns:
+            Sorted array of career row indices.
+        """
+        columns = np.flatnonzero(user_vector)
+        if not len(columns):
+            return np.empty(0, dtype=np.int64)
+
+        indptr, indices = self._postings.indptr, self._postings.indices
+        postings = [indices[indptr[column]:indptr[column + 1]] for column in columns]
+        return np.unique(np.concatenate(postings)).astype(np.int64)
+
+    def match_percentages(self, user_vector: np.ndarray, career_ids: np.ndarray = None) -> np.ndarray:
+        """
+        Calculate the skill match percentage of every (or selected) career.
+
+        Args:
+            user_vector: Boolean skill vector from `skill_vector`.
+            career_ids: Optional career row indices to restrict scoring to.
+
+        Returns:
+            Array of match percentages aligned with `self.careers`, or with
+            `career_ids` when given.
+        """
+        matrix, required_counts = self.matrix, self.required_counts
+        if career_ids is not None:
+            matrix, required_counts = matrix[career_ids], required_counts[career_ids]
+
+        matched_counts = matrix @ user_vector.astype(np.float32)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percentages = np.where(
+                required_counts > 0,
+                matched_counts / required_counts * 100,
+                0.0,
+            )
+        return np.round(percentages, 2)
+
+    def skill_lists(self, user_vector: np.ndarray, career_id: int) -> Tuple[List[str], List[str]]:
+        """
+        Split one career's required skills into matched and missing.
+
+        Args:
+            user_vector: Boolean skill vector from `skill_vector`.
+            career_id: Row index of the career in `self.careers`.
+
+        Returns:
+            A tuple of (matched_skills, missing_skills) in taxonomy order.
+        """
+        start, end = self._indptr[career_id], self._indptr[career_id + 1]
+        hits = user_vector[self._indices[start:end]]
+        names = self._entry_names[start:end]
+        return names[hits].tolist(), names[~hits].tolist()
+
@@ -0,0 +1,37 @@
+"""
+SQLite Connection Module
+
+This module opens the SQLite files that several worker processes share (the
+LLM cache, resume store, JD table and job index). Connections use WAL
+journaling, so readers in other processes are not blocked while one process
+writes, and wait on a busy database instead of failing at once. They are in
+autocommit mode and may be used from any thread; callers serialize access
+with their own lock.
+
+Configuration (environment variables):
+    SQLITE_BUSY_TIMEOUT_MS  Milliseconds to wait for a locked database (default 5000).
+"""
+
+import os
+import sqlite3
+
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def connect_shared(path: str, *schema: str) -> sqlite3.Connection:
+    """
+    Open a shared SQLite file and create its tables.
+
+    Args:
+        path: Path of the database file.
+        schema: Statements run once after connecting, e.g. CREATE TABLE IF NOT EXISTS.
+
+    Returns:
+        The open connection.
+    """
+    connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    for statement in schema:
+        connection.execute(statement)
+    return connection
@@ -1,62 +1,20 @@
 import re
-import pdfplumber
-import io
-import os
-from groq import Groq
-from dotenv import load_dotenv
+from app.services.jd_analysis import as_job_description_analysis
+from app.services.llm_gateway import chat_completion
+from app.services.resume_features import estimate_experience_level
 
-# Load API key from .env
-load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
-
-def extract_text_from_pdf(file_bytes):
-    """Extract text content from PDF file."""
-    text = ""
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
+# Bullet or list number at the start of a line
+LIST_MARKER_PATTERN = re.compile(r'^[\d\.\-\*\•]+\s*')
 
 
 def extract_current_experience_level(resume_text):
-    """Determine experience level from resume."""
-    resume_lower = resume_text.lower()
-    
-    # Count years of experience mentions
-    years_pattern = r'(\d+)\+?\s*(?:years?|yrs?)'
-    years_matches = re.findall(years_pattern, resume_lower)
-    
-    if years_matches:
-        max_years = max([int(y) for y in years_matches])
-        if max_years >= 5:
-            return "Senior"
-        elif max_years >= 2:
-            return "Mid-Level"
-        else:
-            return "Junior"
-    
-    # Check for keywords
-    if any(word in resume_lower for word in ['senior', 'lead', 'principal', 'architect']):
-        return "Senior"
-    elif any(word in resume_lower for word in ['junior', 'entry', 'intern', 'graduate']):
-        return "Junior"
-    else:
-        return "Mid-Level"
+    """Determine experience level from resume (one precompiled regex scan, no full feature extraction)."""
+    return estimate_experience_level(resume_text)
 
 
-def generate_learning_resources(resume_content, job_description, filename=None, target_career=None, missing_skills=None):
-    """Generate personalized study materials and learning paths."""
+async def generate_learning_resources(resume_text, job_description, target_career=None, missing_skills=None):
+    """Generate personalized study materials and learning paths from parsed resume text and a JD (text or analysis)."""
     try:
-        # Extract text from resume
-        if filename and filename.lower().endswith('.pdf'):
-            resume_text = extract_text_from_pdf(resume_content)
-        else:
-            try:
-                resume_text = resume_content.decode("utf-8")
-            except Exception:
-                resume_text = str(resume_content)
-        
         # Determine experience level
         experience_level = extract_current_experience_level(resume_text)
         
@@ -70,7 +28,7 @@ Current Situation:
 - Experience Level: {experience_level}
 - Target Career: {target_career or "Career Transition"}
 - Key Skills to Learn: {skills_text}
-- Job Requirements: {job_description[:500]}...
+- Job Requirements: {as_job_description_analysis(job_description).study_excerpt}...
 
 Generate a comprehensive, actionable learning plan with:
 
@@ -103,7 +61,7 @@ Generate a comprehensive, actionable learning plan with:
 Format each section clearly with headers. Be specific, practical, and prioritize based on job market demand."""
 
         # Use a different model for variety (mixtral for detailed planning)
-        completion = client.chat.completions.create(
+        response_text = await chat_completion(
             model="mixtral-8x7b-32768",  # Different model for detailed planning
             messages=[
                 {"role": "system", "content": "You are an expert career development advisor specializing in creating personalized learning paths."},
@@ -112,8 +70,6 @@ Format each section clearly with headers. Be specific, practical, and prioritize
             temperature=0.7,
             max_tokens=2000
         )
-
-        response_text = completion.choices[0].message.content
         
         # Parse the response into structured format
         parsed_result = parse_study_materials(response_text)
@@ -177,7 +133,7 @@ def parse_study_materials(response_text):
         # Extract content
         if current_section and line:
             # Remove bullets, numbers
-            cleaned_line = re.sub(r'^[\d\.\-\*\•]+\s*', '', line).strip()
+            cleaned_line = LIST_MARKER_PATTERN.sub('', line).strip()
             
             if cleaned_line and not cleaned_line.startswith('#'):
                 if current_section == 'timeline':
@@ -190,7 +146,7 @@ def parse_study_materials(response_text):
     return result
 
 
-def generate_quick_recommendations(missing_skills, target_career):
+async def generate_quick_recommendations(missing_skills, target_career):
     """Generate quick study recommendations without full resume analysis."""
     try:
         skills_text = ", ".join(missing_skills[:5]) if missing_skills else "required skills"
@@ -205,7 +161,7 @@ Format:
 
 Be concise and specific."""
 
-        completion = client.chat.completions.create(
+        return await chat_completion(
             model="llama-3.1-8b-instant",
             messages=[
                 {"role": "system", "content": "You are a career advisor providing quick learning recommendations."},
@@ -214,7 +170,5 @@ Be concise and specific."""
             temperature=0.7,
         )
 
-        return completion.choices[0].message.content
-
     except Exception as e:
         return f"Error generating recommendations: {str(e)}"
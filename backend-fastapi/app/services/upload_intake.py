@@ -0,0 +1,105 @@
+"""
+Upload Intake Module
+
+This module reads resume uploads without buffering them whole. Starlette
+spools each uploaded file (in memory up to 1 MiB, then on disk); intake reads
+that spooled file in fixed-size chunks, hashing as it goes, and rejects it as
+soon as it exceeds the size limit. The result carries the file object and its
+SHA-256, so callers can look up caches by hash and hand the file object
+straight to the parser.
+
+Job description text sent in a form field is held to the same limit, counted
+in characters.
+
+Configuration (environment variables):
+    MAX_UPLOAD_BYTES    Largest accepted upload in bytes, and largest job
+                        description in characters (default 10 MiB).
+    UPLOAD_CHUNK_BYTES  Read size while hashing (default 64 KiB).
+"""
+
+import hashlib
+import os
+from typing import BinaryIO, NamedTuple, Optional
+
+from fastapi import UploadFile
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 2 ** 20)))
+CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 2 ** 10)))
+
+
+class UploadRejectedError(ValueError):
+    """Raised when an upload or job description exceeds the size limit."""
+
+    status_code = 413
+
+
+class ResumeUpload(NamedTuple):
+    """An accepted upload: its spooled file, hash and size."""
+
+    file: BinaryIO
+    filename: Optional[str]
+    sha256: str
+    size: int
+
+    @property
+    def is_pdf(self) -> bool:
+        return bool(self.filename and self.filename.lower().endswith(".pdf"))
+
+    def open(self) -> BinaryIO:
+        """Return the file object rewound to its start."""
+        self.file.seek(0)
+        return self.file
+
+    def read_bytes(self) -> bytes:
+        """Read the whole file, for when it must cross a process boundary."""
+        return self.open().read()
+
+
+async def read_upload(upload: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> ResumeUpload:
+    """
+    Hash an uploaded file chunk by chunk, enforcing the size limit.
+
+    Args:
+        upload: The uploaded file.
+        max_bytes: Largest accepted size in bytes.
+
+    Returns:
+        The accepted upload with its file rewound.
+
+    Raises:
+        UploadRejectedError: If the file is larger than `max_bytes`.
+    """
+    message = f"Resume file exceeds the {max_bytes} byte limit"
+    # Starlette records the size while spooling, so oversized files fail before any read
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadRejectedError(message)
+
+    digest = hashlib.sha256()
+    size = 0
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadRejectedError(message)
+        digest.update(chunk)
+
+    await upload.seek(0)
+    return ResumeUpload(upload.file, upload.filename, digest.hexdigest(), size)
+
+
+def check_job_description_size(job_description: str, max_chars: int = MAX_UPLOAD_BYTES) -> None:
+    """
+    Reject job description text over the upload limit.
+
+    Args:
+        job_description: The job description text.
+        max_chars: Largest accepted length in characters.
+
+    Raises:
+        UploadRejectedError: If the text is longer than `max_chars`.
+    """
+    if len(job_description) > max_chars:
+        raise UploadRejectedError(f"Job description exceeds the {max_chars} character limit")
@@ -0,0 +1,134 @@
+"""
+Approximate Nearest-Neighbour Benchmark
+
+Measures recall@k and latency of LSH search against exact scoring, for the
+two matching paths that can use it:
+
+- careers: CareerSimilarityEngine over a taxonomy of synthetic JDs, scoring
+  every career vs scoring only the careers near_careers finds, as career
+  matching does (in the engine's SIMILARITY_MODE);
+- jobs: JobIndex.search over the same JDs, exact vs LSH on the base segment.
+
+Queries are held-out JDs of the same roles, so each has true neighbours.
+Corpora without cluster structure (--uniform) show where LSH stops paying off:
+when the nearest rows are barely closer than the rest, few of them share a
+bucket with the query.
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_ann [--rows 100000] [--probes 0 2 4 8]
+
+Both LSH indexes use ANN_TABLES and ANN_BITS.
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.services.career_similarity import CareerSimilarityEngine
+from app.services.hashed_features import SIMILARITY_MODE, hash_vector
+from app.services.job_index import JobIndex, JobPosting, prepare_postings, resume_tokens
+from benchmarks.synthetic import job_description_text, role_job_description_text
+
+
+def _report(label: str, recalls: list, latencies: list, candidates: Optional[list], exact_latencies: list) -> None:
+    p50 = np.percentile(latencies, 50) * 1000
+    exact_p50 = np.percentile(exact_latencies, 50) * 1000
+    candidate_count = f"{np.mean(candidates):.0f}" if candidates else "-"
+    print(
+        f"{label:>10}  {np.mean(recalls):>9.1%} {candidate_count:>11} "
+        f"{p50:>8.2f} {np.percentile(latencies, 95) * 1000:>8.2f} {exact_p50 / p50:>7.1f}x"
+    )
+
+
+def _header(title: str, exact_latencies: list) -> None:
+    print(f"\n{title}: exact p50 {np.percentile(exact_latencies, 50) * 1000:.2f} ms")
+    print(f"{'probes':>10}  {'recall@k':>9} {'candidates':>11} {'p50 ms':>8} {'p95 ms':>8} {'speedup':>8}")
+
+
+def bench_careers(texts: list, queries: list, args) -> None:
+    """CareerSimilarityEngine scoring every career vs the careers near_careers finds."""
+    started = time.perf_counter()
+    engine = CareerSimilarityEngine(
+        {f"career-{seed}": {"keywords": text.split()} for seed, text in enumerate(texts)},
+        approximate=True
+    )
+    print(f"\nCareer engine over {len(texts)} careers: fitted with LSH in {time.perf_counter() - started:.2f} s")
+
+    # Career matching reuses the resume's memoized hashed vector
+    vectors = [hash_vector(text) for text in queries]
+    truth, exact_latencies = [], []
+    for text, vector in zip(queries, vectors):
+        started = time.perf_counter()
+        scores = engine.score_vector(text, None, vector)
+        truth.append(set(np.argsort(-scores, kind="stable")[:args.top_k].tolist()))
+        exact_latencies.append(time.perf_counter() - started)
+
+    _header(f"careers (CareerSimilarityEngine, {SIMILARITY_MODE})", exact_latencies)
+    for probes in args.probes:
+        recalls, latencies, candidates = [], [], []
+        for text, vector, expected in zip(queries, vectors, truth):
+            started = time.perf_counter()
+            rows = engine.near_careers(vector, probes)
+            scores = engine.score_vector(text, rows, vector)
+            found = set(rows[np.argsort(-scores, kind="stable")[:args.top_k]].tolist())
+            latencies.append(time.perf_counter() - started)
+            recalls.append(len(found & expected) / len(expected))
+            candidates.append(len(rows))
+        _report(str(probes), recalls, latencies, candidates, exact_latencies)
+
+
+def bench_jobs(texts: list, queries: list, args) -> None:
+    """JobIndex.search exact vs with the base segment's LSH index."""
+    with tempfile.TemporaryDirectory() as root:
+        index = JobIndex(root, approximate=True)
+        for start in range(0, len(texts), 10000):
+            batch = [JobPosting(f"job-{seed}", "", texts[seed]) for seed in range(start, min(start + 10000, len(texts)))]
+            index.add(prepare_postings(batch))
+        started = time.perf_counter()
+        index.save()
+        print(f"\nJob index over {len(texts)} JDs: merge + LSH build + snapshot in {time.perf_counter() - started:.2f} s")
+
+        token_sets = [resume_tokens(text) for text in queries]
+        truth, exact_latencies = [], []
+        for tokens in token_sets:
+            started = time.perf_counter()
+            truth.append({match.job_id for match in index.search(tokens, args.top_k, exact=True)})
+            exact_latencies.append(time.perf_counter() - started)
+
+        _header("jobs (JobIndex.search)", exact_latencies)
+        for probes in args.probes:
+            recalls, latencies = [], []
+            for tokens, expected in zip(token_sets, truth):
+                started = time.perf_counter()
+                found = {match.job_id for match in index.search(tokens, args.top_k, probes=probes)}
+                latencies.append(time.perf_counter() - started)
+                recalls.append(len(found & expected) / len(expected))
+            _report(str(probes), recalls, latencies, None, exact_latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="indexed JDs")
+    parser.add_argument("--roles", type=int, default=5000, help="job roles the JDs are drawn from")
+    parser.add_argument("--queries", type=int, default=50, help="held-out JDs to query with")
+    parser.add_argument("--top-k", type=int, default=10, help="neighbours compared per query")
+    parser.add_argument("--probes", type=int, nargs="+", default=[0, 2, 4, 8], help="probes per table")
+    parser.add_argument("--uniform", action="store_true", help="use JDs without role structure")
+    args = parser.parse_args()
+
+    if args.uniform:
+        texts = [job_description_text(seed) for seed in range(args.rows)]
+        queries = [job_description_text(args.rows + seed) for seed in range(args.queries)]
+    else:
+        texts = [role_job_description_text(seed, args.roles) for seed in range(args.rows)]
+        queries = [role_job_description_text(args.rows + seed, args.roles) for seed in range(args.queries)]
+
+    bench_careers(texts, queries, args)
+    bench_jobs(texts, queries, args)
+
+
+if __name__ == "__main__":
+    main()
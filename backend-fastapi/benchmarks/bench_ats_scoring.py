@@ -0,0 +1,86 @@
+"""
+ATS Scoring Benchmark
+
+Times the text-based ATS components (keywords, content quality, formatting)
+as they were computed before shared resume features, against
+calculate_ats_scores with a cold feature cache and with a warm one, and
+checks that all three produce identical scores.
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_ats_scoring [--docs 50] [--pages 1 5 50] [--repeat 3]
+"""
+
+import argparse
+from typing import Dict
+
+from app.services import resume_features
+from app.services.ats_checker import calculate_ats_scores
+from app.services.career_index import get_career_index
+from app.services.resume_parser import get_parser
+from benchmarks.bench_resume_features import (
+    JOB_DESCRIPTION,
+    _legacy_content_score,
+    _legacy_formatting_score,
+    _legacy_keyword_score,
+    _time,
+)
+from benchmarks.synthetic import resume_text
+
+
+def legacy_scores(text: str) -> tuple:
+    """Text-based ATS components as each scoring function used to scan them."""
+    return (
+        _legacy_keyword_score(text, JOB_DESCRIPTION),
+        _legacy_content_score(text),
+        _legacy_formatting_score(text),
+    )
+
+
+def ats_scores(text: str) -> tuple:
+    """The same components from calculate_ats_scores."""
+    components = calculate_ats_scores(text, {}, JOB_DESCRIPTION)["component_scores"]
+    return (components["keyword_score"], components["content_score"], components["formatting_score"])
+
+
+def cold_ats_scores(text: str) -> tuple:
+    """calculate_ats_scores on a resume it has not seen before."""
+    resume_features._feature_cache.clear()
+    return ats_scores(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50, help="resumes per corpus")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 50], help="pages per resume")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    get_career_index()
+    get_parser()
+    print(f"{'pages':>5}  {'legacy ms/doc':>13} {'cold ms/doc':>11} {'warm ms/doc':>11} {'cold speedup':>12}")
+    for page_count in args.pages:
+        corpus = [resume_text(page_count, seed) for seed in range(args.docs)]
+        mismatches = [text for text in corpus if legacy_scores(text) != cold_ats_scores(text)]
+        if mismatches:
+            raise SystemExit(f"{len(mismatches)} resumes scored differently at {page_count} pages")
+
+        timings: Dict[str, float] = {
+            "legacy": _time(legacy_scores, corpus, args.repeat),
+            "cold": _time(cold_ats_scores, corpus, args.repeat),
+        }
+        # Fill the feature cache so every resume is a hit
+        resume_features._feature_cache.clear()
+        for text in corpus[-resume_features.FEATURE_CACHE_SIZE:]:
+            ats_scores(text)
+        warm_corpus = corpus[-resume_features.FEATURE_CACHE_SIZE:]
+        timings["warm"] = _time(ats_scores, warm_corpus, args.repeat) * len(corpus) / len(warm_corpus)
+
+        per_doc = {name: elapsed / len(corpus) * 1000 for name, elapsed in timings.items()}
+        print(
+            f"{page_count:>5}  {per_doc['legacy']:>13.2f} {per_doc['cold']:>11.2f} "
+            f"{per_doc['warm']:>11.2f} {timings['legacy'] / timings['cold']:>11.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Fast Analysis Mode Benchmark
+
+Measures the latency of the deterministic work behind mode=fast on
+/optimize (ATS scores and career matches, run concurrently) and
+/skill-gap-analysis (career matches), for distinct resumes (cold feature
+cache) and for a repeated one (warm). Resumes are already parsed, as they are
+for a resume handle; no LLM is called.
+
+The work runs in the shared CPU pool; set CPU_POOL_WORKERS to compare worker
+counts (0 runs it inline).
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_fast_mode [--requests 200] [--pages 2]
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.services.career_index import get_career_index
+from app.services.cpu_pool import get_cpu_pool
+from app.services.jd_analysis import get_jd_cache
+from app.services.resume_optimizer import optimize_resume_logic
+from app.services.resume_parser import get_parser
+from app.services.skill_gap_analyzer import analyze_skill_gap
+from benchmarks.bench_resume_features import JOB_DESCRIPTION
+from benchmarks.synthetic import resume_text
+
+
+async def optimize_fast(text: str, sections, job_analysis) -> None:
+    await asyncio.gather(
+        optimize_resume_logic(text, sections, job_analysis, include_llm=False),
+        analyze_skill_gap(text, include_llm=False),
+    )
+
+
+async def skill_gap_fast(text: str, sections, job_analysis) -> None:
+    await analyze_skill_gap(text, include_llm=False)
+
+
+async def measure(route, resumes: list, job_analysis) -> list:
+    latencies = []
+    for text, sections in resumes:
+        started = time.perf_counter()
+        await route(text, sections, job_analysis)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(args) -> None:
+    resume_parser = get_parser()
+    job_analysis = get_jd_cache().register(JOB_DESCRIPTION)
+    distinct = []
+    for seed in range(args.requests):
+        text = resume_text(args.pages, seed)
+        distinct.append((text, resume_parser.parse_sections(text)))
+    repeated = [distinct[0]] * args.requests
+
+    # Start the pool workers before timing
+    await measure(skill_gap_fast, distinct[:get_cpu_pool().workers or 1], job_analysis)
+
+    print(f"CPU pool workers: {get_cpu_pool().workers}")
+    print(f"{'route':>20} {'resumes':>9}  {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+    for name, route in (("/optimize", optimize_fast), ("/skill-gap-analysis", skill_gap_fast)):
+        for label, resumes in (("distinct", distinct), ("repeated", repeated)):
+            latencies = np.array(await measure(route, resumes, job_analysis)) * 1000
+            print(
+                f"{name:>20} {label:>9}  {np.percentile(latencies, 50):>7.1f} "
+                f"{np.percentile(latencies, 95):>7.1f} {np.percentile(latencies, 99):>7.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and resume mix")
+    parser.add_argument("--pages", type=int, default=2, help="pages per resume")
+    args = parser.parse_args()
+
+    get_career_index()
+    asyncio.run(run(args))
+    get_cpu_pool().shutdown()
+
+
+if __name__ == "__main__":
+    main()
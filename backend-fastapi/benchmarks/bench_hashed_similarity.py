@@ -0,0 +1,81 @@
+"""
+Hashed Similarity Benchmark
+
+Compares the per-pair TF-IDF similarity (a vocabulary fitted for every
+resume/career pair) with stateless hashed vectors, and checks how closely
+hashed career scores agree with the fitted career TF-IDF model.
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_hashed_similarity [--docs 50] [--pages 1 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.services import career_similarity
+from app.services.career_index import get_career_index
+from app.services.hashed_features import DIMENSION, cosine_percentages, hash_vector
+from benchmarks.synthetic import resume_text
+
+
+def per_pair_similarity(resume: str, career_text: str) -> float:
+    """The previous calculate_semantic_similarity: a fresh TF-IDF fit per pair."""
+    vectors = TfidfVectorizer(stop_words="english").fit_transform([resume.lower(), career_text.lower()])
+    return round(cosine_similarity(vectors[0:1], vectors[1:2])[0][0] * 100, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50, help="resumes per corpus")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5], help="pages per resume")
+    args = parser.parse_args()
+
+    index = get_career_index()
+    career_texts = [" ".join(cluster["keywords"]).lower() for cluster in index.clusters.values()]
+    engine = index.similarity_engine
+    career_vectors = engine._hashed_matrix
+    print(f"{len(career_texts)} careers, {DIMENSION} hashed columns")
+    print(f"{'pages':>5}  {'per-pair ms/doc':>15} {'hashed ms/doc':>13} {'speedup':>8} {'top-3 overlap':>13}")
+
+    for page_count in args.pages:
+        corpus = [resume_text(page_count, seed) for seed in range(args.docs)]
+
+        started = time.perf_counter()
+        for text in corpus:
+            [per_pair_similarity(text, career_text) for career_text in career_texts]
+        per_pair = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for text in corpus:
+            cosine_percentages(career_vectors, hash_vector(text))
+        hashed = time.perf_counter() - started
+
+        # Agreement of the hashed career ranking with the fitted TF-IDF model
+        overlaps = []
+        for text in corpus:
+            fitted_top = set(np.argsort(-_fitted_scores(engine, text), kind="stable")[:3].tolist())
+            hashed_top = set(np.argsort(-cosine_percentages(career_vectors, hash_vector(text)), kind="stable")[:3].tolist())
+            overlaps.append(len(fitted_top & hashed_top) / 3)
+
+        print(
+            f"{page_count:>5}  {per_pair / len(corpus) * 1000:>15.2f} {hashed / len(corpus) * 1000:>13.2f} "
+            f"{per_pair / hashed:>7.1f}x {np.mean(overlaps):>12.0%}"
+        )
+
+
+def _fitted_scores(engine, text: str) -> np.ndarray:
+    """Career scores from the fitted TF-IDF model, whatever SIMILARITY_MODE is set to."""
+    mode = career_similarity.SIMILARITY_MODE
+    career_similarity.SIMILARITY_MODE = "tfidf"
+    try:
+        return engine.score_vector(text)
+    finally:
+        career_similarity.SIMILARITY_MODE = mode
+
+
+if __name__ == "__main__":
+    main()
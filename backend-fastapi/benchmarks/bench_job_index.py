@@ -0,0 +1,78 @@
+"""
+Job Index Benchmark
+
+Builds a JD corpus index of synthetic job descriptions in a temporary
+directory, then measures bulk ingestion, query latency, incremental
+add/delete and reload from the snapshot. The keyword scores of returned
+matches are checked against calculate_keyword_score.
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_job_index [--jobs 100000] [--queries 50]
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.ats_checker import calculate_keyword_score
+from app.services.job_index import JobIndex, JobPosting, prepare_postings, resume_tokens
+from benchmarks.synthetic import job_description_text, resume_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100000, help="indexed job descriptions")
+    parser.add_argument("--queries", type=int, default=50, help="resumes to query with")
+    parser.add_argument("--top-k", type=int, default=10, help="matches per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        index = JobIndex(root)
+        started = time.perf_counter()
+        for start in range(0, args.jobs, 10000):
+            batch = [
+                JobPosting(f"job-{seed}", "", job_description_text(seed))
+                for seed in range(start, min(start + 10000, args.jobs))
+            ]
+            index.add(prepare_postings(batch))
+        index.save()
+        print(f"ingested {args.jobs} JDs in {time.perf_counter() - started:.1f} s: {index.stats()}")
+
+        queries = [resume_tokens(resume_text(2, seed)) for seed in range(args.queries)]
+        for sort_by in ("similarity", "keyword"):
+            latencies = []
+            for tokens in queries:
+                started = time.perf_counter()
+                index.search(tokens, args.top_k, sort_by)
+                latencies.append(time.perf_counter() - started)
+            print(
+                f"search by {sort_by}: p50 {np.percentile(latencies, 50) * 1000:.1f} ms, "
+                f"p95 {np.percentile(latencies, 95) * 1000:.1f} ms"
+            )
+
+        resume = resume_text(2, 0)
+        for match in index.search(resume_tokens(resume), args.top_k, "keyword"):
+            expected = calculate_keyword_score(resume, index.get_text(match.job_id))
+            if match.keyword_score != expected:
+                raise SystemExit(f"{match.job_id} keyword score {match.keyword_score} != {expected}")
+
+        started = time.perf_counter()
+        index.add(prepare_postings([JobPosting("job-new", "Python Engineer", job_description_text(-1))]))
+        index.delete(["job-0", "job-1"])
+        index.search(queries[0], args.top_k)
+        print(f"add + delete + search: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        index.save()
+        print(f"save (merge + snapshot): {(time.perf_counter() - started) * 1000:.0f} ms")
+        started = time.perf_counter()
+        reloaded = JobIndex(root)
+        print(f"reload from snapshot: {(time.perf_counter() - started) * 1000:.0f} ms, {reloaded.stats()}")
+        if reloaded.search(queries[0], args.top_k) != index.search(queries[0], args.top_k):
+            raise SystemExit("reloaded index returned different matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Resume Ranking Benchmark
+
+Compares scoring a batch of resumes one calculate_ats_scores call at a time
+with the batched, vectorized ranker, and checks that every resume gets the
+same scores from both.
+
+The ranker uses the shared CPU pool; set CPU_POOL_WORKERS to compare worker
+counts (0 runs it inline).
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_rank [--resumes 1000 5000] [--pages 2]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import time
+
+from app.services import resume_features, resume_ranker
+from app.services.ats_checker import calculate_ats_scores
+from app.services.career_index import get_career_index
+from app.services.cpu_pool import get_cpu_pool
+from app.services.resume_parser import get_parser
+from app.services.resume_ranker import RankCandidate, rank_resumes
+from app.services.resume_store import make_handle
+from benchmarks.bench_resume_features import JOB_DESCRIPTION
+from benchmarks.synthetic import resume_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, nargs="+", default=[1000, 5000], help="batch sizes")
+    parser.add_argument("--pages", type=int, default=2, help="pages per resume")
+    args = parser.parse_args()
+
+    get_career_index()
+    resume_parser = get_parser()
+    print(f"CPU pool workers: {get_cpu_pool().workers}")
+    print(f"{'resumes':>7}  {'one by one s':>12} {'batched s':>9} {'speedup':>8}")
+    for batch_size in args.resumes:
+        candidates = []
+        for seed in range(batch_size):
+            text = resume_text(args.pages, seed)
+            filename = f"resume-{seed}.txt"
+            handle = make_handle(hashlib.sha256(text.encode("utf-8")).hexdigest(), filename)
+            candidates.append(RankCandidate(handle, filename, resume_parser.parse_sections(text)))
+
+        started = time.perf_counter()
+        expected = []
+        for candidate in candidates:
+            resume_features._feature_cache.clear()
+            expected.append(calculate_ats_scores(candidate.resume_text, candidate.sections, JOB_DESCRIPTION))
+        one_by_one = time.perf_counter() - started
+
+        resume_ranker._ranking_cache.clear()
+        started = time.perf_counter()
+        ranking = asyncio.run(rank_resumes(candidates, JOB_DESCRIPTION))
+        batched = time.perf_counter() - started
+
+        by_handle = {item.candidate.handle: item for item in ranking}
+        for candidate, scores in zip(candidates, expected):
+            item = by_handle[candidate.handle]
+            if (item.overall_score, item.component_scores) != (scores["overall_score"], scores["component_scores"]):
+                raise SystemExit(f"{candidate.filename} scored differently")
+
+        print(f"{batch_size:>7}  {one_by_one:>12.2f} {batched:>9.2f} {one_by_one / batched:>7.2f}x")
+    get_cpu_pool().shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Resume Features Benchmark
+
+Compares the previous per-function text scans (each scoring function
+re-splitting and re-matching the resume) with one shared ResumeFeatures
+extraction, and checks that both produce identical scores.
+
+Usage (from backend-fastapi/):
+    python -m benchmarks.bench_resume_features [--docs 50] [--pages 1 5 50] [--repeat 3]
+"""
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List
+
+from app.services.ats_checker import (
+    calculate_content_quality_score,
+    calculate_formatting_score,
+    calculate_keyword_score,
+)
+from app.services.career_index import get_career_index
+from app.services.resume_features import ACTION_VERBS, COMMON_ADVERBS, STOP_WORDS, extract_resume_features
+from benchmarks.synthetic import resume_text
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with Python, Django, PostgreSQL, Docker and "
+    "Kubernetes experience to build REST APIs, data pipelines with Spark and Kafka, "
+    "and CI/CD on AWS. Machine learning with Pandas and Scikit-learn is a plus."
+)
+
+
+# Previous implementation, kept here as the baseline
+
+
+def _legacy_tokens(text: str) -> set:
+    tokens = re.findall(r'\b[A-Za-z][A-Za-z0-9+#]*(?:\.[A-Za-z0-9+#]+)*\b', text)
+    special_terms = re.findall(r'\b(?:C\+\+|C#|\.NET|F#)\b', text, re.IGNORECASE)
+    all_tokens = set(token.lower() for token in tokens)
+    all_tokens.update(term.lower() for term in special_terms)
+    return {t for t in all_tokens if len(t) > 1 and t not in STOP_WORDS}
+
+
+def _legacy_keyword_score(text: str, job_description: str) -> int:
+    job_keywords = _legacy_tokens(job_description)
+    match_percentage = len(job_keywords & _legacy_tokens(text)) / len(job_keywords) * 100
+    score = match_percentage * 1.5 if match_percentage <= 50 else 75 + (match_percentage - 50) * 0.5
+    return round(min(100, score))
+
+
+def _legacy_content_score(text: str) -> int:
+    bullet_pattern = r'^[-•*✓►▪→]\s*'
+    bullet_lines = [line.strip() for line in text.splitlines() if line.strip() and re.match(bullet_pattern, line.strip())]
+    action_verb_count = 0
+    for line in bullet_lines:
+        words = re.sub(bullet_pattern, '', line).strip().lower().split()
+        if not words:
+            continue
+        first_word = words[0].rstrip(',.:;')
+        if first_word in ACTION_VERBS:
+            action_verb_count += 1
+        elif first_word in COMMON_ADVERBS and len(words) > 1 and words[1].rstrip(',.:;') in ACTION_VERBS:
+            action_verb_count += 1
+    action_verb_score = min(100, action_verb_count / len(bullet_lines) * 100) if bullet_lines else 0
+    metrics_pattern = r'\b\d+%|\$[\d,]+|\d+\s*(percent|dollars|users|clients|people|customers|sales|revenue|growth|increase|decrease|reduction|projects?|teams?|members?)\b'
+    metrics_matches = re.findall(metrics_pattern, text.lower())
+    metrics_score = min(100, len(metrics_matches) * 15)
+    return round(action_verb_score * 0.6 + metrics_score * 0.4)
+
+
+def _legacy_formatting_score(text: str) -> int:
+    lines = text.splitlines()
+    has_bullets = any(re.match(r'^[-•*✓►▪→]\s+', line.strip()) for line in lines)
+    blank_ratio = sum(1 for line in lines if not line.strip()) / len(lines) if lines else 0
+    date_patterns = [
+        r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b',
+        r'\b\d{2}/\d{2}/\d{4}\b',
+        r'\b\d{4}-\d{2}\b',
+        r'\b\d{4}\s*[-–]\s*(Present|Current|Now|\d{4})\b'
+    ]
+    dates = [date for pattern in date_patterns for date in re.findall(pattern, text, re.IGNORECASE)]
+    score = 30 if has_bullets else 0
+    if 0.05 <= blank_ratio <= 0.3:
+        score += 40
+    elif 0 < blank_ratio < 0.5:
+        score += 20
+    return score + (30 if len(dates) >= 2 else 0)
+
+
+def _legacy_experience_level(text: str) -> str:
+    years = re.findall(r'(\d+)\+?\s*(?:years?|yrs?)', text.lower())
+    if years:
+        max_years = max(int(y) for y in years)
+        return "Senior" if max_years >= 5 else "Mid-Level" if max_years >= 2 else "Junior"
+    text_lower = text.lower()
+    if any(word in text_lower for word in ['senior', 'lead', 'principal', 'architect']):
+        return "Senior"
+    if any(word in text_lower for word in ['junior', 'entry', 'intern', 'graduate']):
+        return "Junior"
+    return "Mid-Level"
+
+
+def legacy_pass(text: str) -> tuple:
+    """Every text feature as the scoring functions used to compute it."""
+    skills = get_career_index().skill_matcher.find_skills(text)
+    return (
+        _legacy_keyword_score(text, JOB_DESCRIPTION),
+        _legacy_content_score(text),
+        _legacy_formatting_score(text),
+        skills,
+        _legacy_experience_level(text),
+    )
+
+
+def features_pass(text: str) -> tuple:
+    """The same outputs from one uncached ResumeFeatures extraction."""
+    features = extract_resume_features(text)
+    return (
+        calculate_keyword_score(features, JOB_DESCRIPTION),
+        calculate_content_quality_score(features),
+        calculate_formatting_score(features),
+        features.skills,
+        features.experience_level,
+    )
+
+
+def _time(run: Callable[[str], tuple], corpus: List[str], repeat: int) -> float:
+    """Best wall time over `repeat` runs of `run` over the corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            run(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50, help="resumes per corpus")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 50], help="pages per resume")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    get_career_index()
+    print(f"{'pages':>5}  {'legacy ms/doc':>13} {'features ms/doc':>15} {'speedup':>8}")
+    for page_count in args.pages:
+        corpus = [resume_text(page_count, seed) for seed in range(args.docs)]
+        mismatches = [text for text in corpus if legacy_pass(text) != features_pass(text)]
+        if mismatches:
+            raise SystemExit(f"{len(mismatches)} resumes scored differently at {page_count} pages")
+
+        timings: Dict[str, float] = {
+            "legacy": _time(legacy_pass, corpus, args.repeat),
+            "features": _time(features_pass, corpus, args.repeat),
+        }
+        print(
+            f"{page_count:>5}  {timings['legacy'] / len(corpus) * 1000:>13.2f} "
+            f"{timings['features'] / len(corpus) * 1000:>15.2f} {timings['legacy'] / timings['features']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
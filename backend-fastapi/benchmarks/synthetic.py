@@ -0,0 +1,185 @@
+"""
+Synthetic Inputs For Benchmarks
+
+Deterministic resume text and minimal text-layer PDFs, so the benchmarks need
+no fixtures and produce comparable numbers between runs.
+"""
+
+import random
+from typing import List
+
+SECTION_LINES = {
+    "Summary": [
+        "Software engineer with 6 years of experience building data platforms",
+        "Focused on reliable backend services and pragmatic machine learning",
+    ],
+    "Experience": [
+        "- Developed REST API services in Python and Django, improving throughput 40%",
+        "- Led migration to Docker and Kubernetes on AWS for 20 clients",
+        "- Successfully reduced infrastructure cost by $120,000 per year",
+        "- Built dashboards in Tableau and Power BI for 300 users",
+        "- Mentored 5 engineers and coordinated releases with product teams",
+        "- Maintained CI/CD pipelines in Jenkins and GitHub Actions",
+        "Senior Engineer, Example Corp Jan 2019 - Present",
+        "Software Engineer, Sample Inc 2015 - 2018",
+    ],
+    "Education": [
+        "B.Sc. Computer Science, State University 2011 - 2015",
+    ],
+    "Skills": [
+        "Python, Java, SQL, Git, Docker, React, Machine Learning, Pandas, NumPy",
+        "Terraform, Linux, PostgreSQL, MongoDB, GraphQL, Agile, Scrum",
+    ],
+    "Projects": [
+        "- Built a recommendation engine with Scikit-learn and Pandas",
+        "- Designed a streaming ETL pipeline with Spark and Kafka",
+    ],
+}
+
+LINES_PER_PAGE = 55
+
+JD_SKILLS = (
+    "Python Java Scala Go Rust TypeScript JavaScript React Angular Django Flask FastAPI Spring SQL "
+    "PostgreSQL MySQL MongoDB Redis Kafka Spark Hadoop Airflow dbt Snowflake Tableau Excel Docker "
+    "Kubernetes Terraform Ansible AWS Azure GCP Linux Git Jenkins GraphQL REST TensorFlow PyTorch "
+    "Pandas NumPy Scikit-learn NLP Figma Agile Scrum Jira Salesforce SAP Kotlin Swift Android iOS"
+).split()
+JD_WORDS = (
+    "build design deliver scalable services customers product data platform pipelines analytics "
+    "collaborate cross functional stakeholders mentor engineers own roadmap quality testing automation "
+    "reliability monitoring security compliance cloud infrastructure performance optimize research "
+    "models dashboards reporting insights growth operations finance healthcare retail logistics "
+    "startup enterprise remote hybrid onsite benefits equity salary senior junior lead principal"
+).split()
+
+
+def resume_lines(pages: int = 1, seed: int = 0) -> List[str]:
+    """
+    Build the lines of a synthetic resume roughly `pages` pages long.
+
+    Args:
+        pages: Approximate page count.
+        seed: Random seed for line selection.
+
+    Returns:
+        List of text lines.
+    """
+    rng = random.Random(seed)
+    lines = ["Jane Doe", "Email: jane@example.com | Phone: 555-0100", ""]
+    while len(lines) < pages * LINES_PER_PAGE:
+        for header, body in SECTION_LINES.items():
+            lines.append(header)
+            lines.extend(rng.sample(body, len(body)))
+            lines.append("")
+    return lines[:pages * LINES_PER_PAGE]
+
+
+def resume_text(pages: int = 1, seed: int = 0) -> str:
+    """Build a synthetic resume as plain text (see `resume_lines`)."""
+    return "\n".join(resume_lines(pages, seed))
+
+
+def make_pdf(page_lines: List[List[str]]) -> bytes:
+    """
+    Write a minimal PDF with one Helvetica text object per page.
+
+    Args:
+        page_lines: Lines of text for each page.
+
+    Returns:
+        The PDF file bytes.
+    """
+    objects: List[bytes] = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", b""]
+    font_id, pages_id = 1, 2
+    kids = []
+
+    for lines in page_lines:
+        operators = ["BT /F1 10 Tf 50 780 Td 12 TL"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            operators.append(f"({escaped}) Tj T*")
+        operators.append("ET")
+        stream = "\n".join(operators).encode("latin-1", "replace")
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content_id, font_id)
+        )
+        kids.append(len(objects))
+
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    catalog_id = len(objects)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for object_id, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (object_id, body)
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(output)
+
+
+def resume_pdf(pages: int = 1, seed: int = 0) -> bytes:
+    """Build a synthetic resume PDF with `pages` pages."""
+    lines = resume_lines(pages, seed)
+    return make_pdf([lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)])
+
+
+def job_description_text(seed: int = 0, words: int = 200) -> str:
+    """
+    Build a synthetic job description of about `words` words.
+
+    Skills and common words give JDs overlapping vocabularies; numbered rare
+    terms give the corpus a long tail, as real JDs have.
+    """
+    rng = random.Random(seed)
+    skills = rng.sample(JD_SKILLS, rng.randint(4, 12))
+    body = []
+    for _ in range(words):
+        roll = rng.random()
+        if roll < 0.15:
+            body.append(rng.choice(skills))
+        elif roll < 0.85:
+            body.append(rng.choice(JD_WORDS))
+        else:
+            body.append(f"term{int(rng.paretovariate(1.2)) % 50000}")
+    return f"{skills[0]} Engineer\nWe are hiring. " + " ".join(body)
+
+
+def role_job_description_text(seed: int = 0, roles: int = 1000, words: int = 200) -> str:
+    """
+    Build a synthetic job description for one of `roles` job roles.
+
+    JDs of the same role (seed % roles) share their skills and most of their
+    wording, giving the corpus the cluster structure real JDs have and that
+    nearest-neighbour search relies on; job_description_text has none.
+    """
+    role = random.Random(f"role-{seed % roles}")
+    skills = role.sample(JD_SKILLS, 8)
+    role_words = role.sample(JD_WORDS, 25)
+    role_terms = [f"term{role.randrange(50000)}" for _ in range(30)]
+    rng = random.Random(seed)
+    body = []
+    for _ in range(words):
+        roll = rng.random()
+        if roll < 0.2:
+            body.append(rng.choice(skills))
+        elif roll < 0.7:
+            body.append(rng.choice(role_words))
+        elif roll < 0.9:
+            body.append(rng.choice(role_terms))
+        else:
+            body.append(f"term{int(rng.paretovariate(1.2)) % 50000}")
+    return f"{skills[0]} Engineer\nWe are hiring. " + " ".join(body)